@@ -0,0 +1,366 @@
+"""Archivio SQLite degli eventi (.cache/eventi.sqlite).
+
+Raccoglie tutte le sorgenti (dati_grezzi, discovered, partite dai feed) in una tabella
+con la provenienza di ogni riga (file o URL, source_type, UID del feed) e gli indici
+che servono al generatore e alle viste: data di inizio, venue, firma debole e forte,
+mese del file sorgente. Il generatore legge i mesi da rigenerare con query indicizzate
+invece di ricostruire tutto in memoria; l'aggregato de-duplicato finale finisce nella
+tabella canonical_events, interrogabile per intervallo di date e venue.
+
+L'ingestione e' idempotente: ogni sorgente e' un insieme di righe chiave (sorgente +
+firma forte + occorrenza) aggiornato con upsert. Le righe identiche non vengono
+toccate, quelle sparite dalla sorgente vengono cancellate. Un file con sha256
+invariato non viene neanche riletto: con dieci anni di storico un run notturno tocca
+solo le righe cambiate.
+
+Le colonne derivate (firme e venue_id) dipendono dal registro VENUES e dal codice di
+normalizzazione, non solo dai dati: la loro impronta (DERIVED_COLUMNS_FINGERPRINT) e'
+salvata nella tabella meta e, quando cambia, open_event_store le ricalcola dal JSON
+di ogni riga prima di qualsiasi altra operazione.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+
+from evento import as_event_records
+from normalizzazione import VENUES
+from sorgenti import read_event_source
+
+EVENT_STORE_FILENAME = "eventi.sqlite"
+EVENT_STORE_SCHEMA_VERSION = 2
+# Moduli che calcolano firme e venue_id: cambiarli invalida le colonne derivate
+DERIVED_COLUMNS_SOURCE_FILES = ("normalizzazione.py", "evento.py")
+
+
+def _derived_columns_fingerprint():
+    digest = hashlib.sha256(json.dumps(VENUES, sort_keys=True).encode('utf-8'))
+    base_dir = Path(__file__).resolve().parent
+    for name in DERIVED_COLUMNS_SOURCE_FILES:
+        digest.update(name.encode('utf-8'))
+        digest.update((base_dir / name).read_bytes())
+    return digest.hexdigest()
+
+
+DERIVED_COLUMNS_FINGERPRINT = _derived_columns_fingerprint()
+
+
+def log(msg):
+    print(f"[{datetime.now().isoformat(timespec='seconds')}] {msg}", flush=True)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sources (
+    source      TEXT PRIMARY KEY,   -- percorso relativo del file o URL del feed
+    kind        TEXT NOT NULL,      -- 'file' | 'feed'
+    month_key   TEXT,               -- YYYY_MM per i file mensili, NULL per i feed
+    sha256      TEXT,
+    ingested_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS events (
+    id           INTEGER PRIMARY KEY,
+    source       TEXT NOT NULL REFERENCES sources(source) ON DELETE CASCADE,
+    position     INTEGER NOT NULL,  -- ordine nella sorgente
+    occurrence   INTEGER NOT NULL,  -- n-esimo evento con la stessa firma nella sorgente
+    source_type  TEXT,
+    feed_uid     TEXT,
+    month_key    TEXT,
+    summary_sig  TEXT NOT NULL,
+    date_sig     TEXT NOT NULL,
+    location_sig TEXT NOT NULL,
+    dtstart      TEXT,              -- 'YYYY-MM-DDTHH:MM:SS' ora locale Europe/Rome
+    dtend        TEXT,
+    venue_id     TEXT,
+    data         TEXT NOT NULL,     -- dict completo dell'evento (JSON, senza perdite)
+    content_hash TEXT NOT NULL,
+    UNIQUE (source, summary_sig, date_sig, location_sig, occurrence)
+);
+CREATE INDEX IF NOT EXISTS events_dtstart ON events (dtstart);
+CREATE INDEX IF NOT EXISTS events_venue ON events (venue_id, dtstart);
+CREATE INDEX IF NOT EXISTS events_weak_sig ON events (summary_sig, date_sig);
+CREATE INDEX IF NOT EXISTS events_strong_sig ON events (summary_sig, date_sig, location_sig);
+CREATE INDEX IF NOT EXISTS events_month ON events (month_key, source, position);
+CREATE TABLE IF NOT EXISTS canonical_events (
+    uid          TEXT PRIMARY KEY,
+    summary_sig  TEXT NOT NULL,
+    date_sig     TEXT NOT NULL,
+    location_sig TEXT NOT NULL,
+    dtstart      TEXT,
+    dtend        TEXT,
+    venue_id     TEXT,
+    source_type  TEXT,
+    data         TEXT NOT NULL,
+    content_hash TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS canonical_dtstart ON canonical_events (dtstart);
+CREATE INDEX IF NOT EXISTS canonical_venue ON canonical_events (venue_id, dtstart);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+_INSERT_EVENT_SQL = (
+    "INSERT INTO events (source, position, occurrence, source_type, feed_uid, month_key, summary_sig, "
+    "date_sig, location_sig, dtstart, dtend, venue_id, data, content_hash) VALUES (:source, :position, "
+    ":occurrence, :source_type, :feed_uid, :month_key, :summary_sig, :date_sig, :location_sig, :dtstart, "
+    ":dtend, :venue_id, :data, :content_hash)")
+
+
+def open_event_store(path):
+    """Connessione all'archivio, creato se assente. Un file di versione diversa o
+    corrotto viene ricreato da zero (e' una cache: le sorgenti restano i file)."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        conn = _connect(path)
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version not in (0, EVENT_STORE_SCHEMA_VERSION):
+            raise sqlite3.DatabaseError(f"versione schema {version}")
+    except sqlite3.DatabaseError as e:
+        log(f"  WARN: archivio {path.name} illeggibile ({e}); lo ricreo dalle sorgenti.")
+        try:
+            conn.close()
+        except Exception:
+            pass
+        path.unlink(missing_ok=True)
+        conn = _connect(path)
+    conn.executescript(_SCHEMA)
+    conn.execute(f"PRAGMA user_version = {EVENT_STORE_SCHEMA_VERSION}")
+    if not derived_columns_current(conn):
+        events, canonical = rebuild_derived_columns(conn)
+        if events or canonical:
+            log(f"  Archivio: normalizzazione o registro venue cambiati, ricalcolate firme e venue "
+                f"di {events} eventi e {canonical} eventi canonici.")
+    return conn
+
+
+def derived_columns_current(conn):
+    """True se firme e venue_id dell'archivio sono calcolati con la normalizzazione e il
+    registro VENUES attuali (False anche per un archivio senza tabella meta)."""
+    try:
+        row = conn.execute("SELECT value FROM meta WHERE key = 'derived_columns'").fetchone()
+    except sqlite3.OperationalError:
+        return False
+    return row is not None and row[0] == DERIVED_COLUMNS_FINGERPRINT
+
+
+def rebuild_derived_columns(conn):
+    """Ricalcola firme, occorrenze e venue_id di tutte le righe dal loro JSON e salva
+    l'impronta attuale. Ritorna (eventi, eventi canonici) ricalcolati."""
+    with conn:
+        sources = [row['source'] for row in conn.execute("SELECT source FROM sources")]
+        events = 0
+        for source in sources:
+            old_rows = conn.execute(
+                "SELECT position, month_key, data FROM events WHERE source = ? ORDER BY position", (source,)).fetchall()
+            conn.execute("DELETE FROM events WHERE source = ?", (source,))
+            seen = {}
+            rows = []
+            for old, rec in zip(old_rows, _records_from_rows(old_rows)):
+                occurrence = seen[rec.strong_signature] = seen.get(rec.strong_signature, -1) + 1
+                rows.append({**_event_row(rec, old['position'], occurrence), 'source': source, 'month_key': old['month_key']})
+            conn.executemany(_INSERT_EVENT_SQL, rows)
+            events += len(rows)
+        canonical = []
+        old_rows = conn.execute("SELECT uid, data FROM canonical_events").fetchall()
+        for old, rec in zip(old_rows, _records_from_rows(old_rows)):
+            canonical.append({**_event_row(rec, 0, 0), 'uid': old['uid']})
+        conn.executemany(
+            "UPDATE canonical_events SET summary_sig = :summary_sig, date_sig = :date_sig, "
+            "location_sig = :location_sig, venue_id = :venue_id WHERE uid = :uid", canonical)
+        conn.execute(
+            "INSERT INTO meta (key, value) VALUES ('derived_columns', ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value", (DERIVED_COLUMNS_FINGERPRINT,))
+    return events, len(canonical)
+
+
+def _connect(path):
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA foreign_keys = ON")
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    return conn
+
+
+def _event_row(rec, position, occurrence):
+    data = json.dumps(rec.to_dict(), ensure_ascii=False)
+    summary_sig, date_sig, location_sig = rec.strong_signature
+    return {
+        'position': position, 'occurrence': occurrence,
+        'source_type': rec.get('source_type'), 'feed_uid': rec.get('original_uid_from_feed'),
+        'summary_sig': summary_sig, 'date_sig': date_sig, 'location_sig': location_sig,
+        'dtstart': rec.get('dtstart_str'), 'dtend': rec.get('dtend_str'), 'venue_id': rec.venue_id,
+        'data': data, 'content_hash': hashlib.sha256(data.encode('utf-8')).hexdigest(),
+    }
+
+
+def ingest_source(conn, source, kind, events, month_key=None, sha256=None):
+    """Sostituisce le righe di una sorgente con `events` (dict o EventRecord).
+    Ritorna (inserite, aggiornate, cancellate): le righe invariate non contano."""
+    records = as_event_records(events)
+    now = datetime.now().isoformat(timespec='seconds')
+    with conn:
+        conn.execute(
+            "INSERT INTO sources (source, kind, month_key, sha256, ingested_at) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT(source) DO UPDATE SET kind = excluded.kind, month_key = excluded.month_key, "
+            "sha256 = excluded.sha256, ingested_at = excluded.ingested_at",
+            (source, kind, month_key, sha256, now))
+        existing = {
+            (row['summary_sig'], row['date_sig'], row['location_sig'], row['occurrence']): (row['content_hash'], row['position'])
+            for row in conn.execute(
+                "SELECT summary_sig, date_sig, location_sig, occurrence, content_hash, position "
+                "FROM events WHERE source = ?", (source,))
+        }
+        seen = {}
+        inserted = updated = 0
+        rows = []
+        for position, rec in enumerate(records):
+            occurrence = seen[rec.strong_signature] = seen.get(rec.strong_signature, -1) + 1
+            row = _event_row(rec, position, occurrence)
+            key = (row['summary_sig'], row['date_sig'], row['location_sig'], occurrence)
+            previous = existing.pop(key, None)
+            if previous == (row['content_hash'], position):
+                continue
+            if previous is None:
+                inserted += 1
+            else:
+                updated += 1
+            rows.append({**row, 'source': source, 'month_key': month_key})
+        conn.executemany(
+            _INSERT_EVENT_SQL + " ON CONFLICT(source, summary_sig, date_sig, location_sig, occurrence) DO UPDATE SET "
+            "position = excluded.position, source_type = excluded.source_type, feed_uid = excluded.feed_uid, "
+            "month_key = excluded.month_key, dtstart = excluded.dtstart, dtend = excluded.dtend, "
+            "venue_id = excluded.venue_id, data = excluded.data, content_hash = excluded.content_hash",
+            rows)
+        conn.executemany(
+            "DELETE FROM events WHERE source = ? AND summary_sig = ? AND date_sig = ? AND location_sig = ? AND occurrence = ?",
+            [(source, *key) for key in existing])
+    return inserted, updated, len(existing)
+
+
+def sync_file_sources(conn, files_by_month, base_dir, default_source_types):
+    """Allinea l'archivio ai file sorgente {mese: [path, ...]}. I file con sha256 invariato
+    sono saltati, quelli spariti rimossi con le loro righe. `default_source_types` mappa
+    il suffisso del file al source_type da usare quando l'evento non lo dichiara
+    (o lo forza, per i .json di discovered/). Ritorna (inserite, aggiornate, cancellate)."""
+    known = {row['source']: row['sha256'] for row in conn.execute("SELECT source, sha256 FROM sources WHERE kind = 'file'")}
+    totals = [0, 0, 0]
+    for month_key, paths in files_by_month.items():
+        for path in paths:
+            source = Path(path).relative_to(base_dir).as_posix()
+            data = Path(path).read_bytes()
+            digest = hashlib.sha256(data).hexdigest()
+            if known.pop(source, None) == digest:
+                continue
+            try:
+                events = [dict(ev) for ev in read_event_source(path)]
+            except Exception as e:
+                log(f"  WARN: impossibile leggere {Path(path).name}: {e}")
+                events, digest = [], None  # riprovato al prossimo run
+            source_type, forced = default_source_types[Path(path).suffix]
+            for ev in events:
+                if forced or 'source_type' not in ev:
+                    ev['source_type'] = source_type
+            for i, n in enumerate(ingest_source(conn, source, 'file', events, month_key=month_key, sha256=digest)):
+                totals[i] += n
+    for source in known:
+        totals[2] += remove_source(conn, source)
+    return tuple(totals)
+
+
+def prune_feed_sources(conn, feed_urls):
+    """Rimuove i feed (kind='feed') il cui URL non e' piu' tra `feed_urls`, con le loro
+    righe, come sync_file_sources fa per i file spariti. Ritorna le righe cancellate."""
+    feed_urls = set(feed_urls)
+    stale = [row['source'] for row in conn.execute("SELECT source FROM sources WHERE kind = 'feed'")
+             if row['source'] not in feed_urls]
+    return sum(remove_source(conn, source) for source in stale)
+
+
+def remove_source(conn, source):
+    with conn:
+        deleted = conn.execute("DELETE FROM events WHERE source = ?", (source,)).rowcount
+        conn.execute("DELETE FROM sources WHERE source = ?", (source,))
+    return deleted
+
+
+def _records_from_rows(rows):
+    """Record dalle righe (colonna data), con le firme calcolate in blocco."""
+    return as_event_records([json.loads(row['data']) for row in rows])
+
+
+def iter_month_events(conn, month_key):
+    """Eventi dei file sorgente di un mese, nell'ordine dei file e delle righe (indice events_month)."""
+    return _records_from_rows(conn.execute(
+        "SELECT data FROM events WHERE month_key = ? ORDER BY source, position", (month_key,)))
+
+
+def iter_source_events(conn, source):
+    return _records_from_rows(conn.execute(
+        "SELECT data FROM events WHERE source = ? ORDER BY position", (source,)))
+
+
+def _range_query(table, start, end, venue_id, extra_where=()):
+    where, params = list(extra_where), []
+    if start is not None:
+        where.append("dtstart >= ?")
+        params.append(start)
+    if end is not None:
+        where.append("dtstart < ?")
+        params.append(end)
+    if venue_id is not None:
+        where.append("venue_id = ?")
+        params.append(venue_id)
+    sql = f"SELECT data FROM {table}"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    return sql + " ORDER BY dtstart", params
+
+
+def iter_events(conn, start=None, end=None, venue_id=None):
+    """Eventi grezzi (tutte le sorgenti) con dtstart in [start, end) e/o di una venue.
+    start/end sono stringhe 'YYYY-MM-DD[THH:MM:SS]' in ora locale."""
+    sql, params = _range_query("events", start, end, venue_id)
+    return _records_from_rows(conn.execute(sql, params))
+
+
+def replace_canonical_events(conn, records, uid_for):
+    """Salva l'aggregato de-duplicato finale, chiave UID. Idempotente come ingest_source.
+    Ritorna (inserite, aggiornate, cancellate)."""
+    with conn:
+        existing = {row['uid']: row['content_hash'] for row in conn.execute("SELECT uid, content_hash FROM canonical_events")}
+        rows = []
+        inserted = updated = 0
+        for rec in records:
+            uid = uid_for(rec)
+            row = _event_row(rec, 0, 0)
+            previous = existing.pop(uid, None)
+            if previous == row['content_hash']:
+                continue
+            if previous is None:
+                inserted += 1
+            else:
+                updated += 1
+            rows.append({**row, 'uid': uid})
+        conn.executemany(
+            "INSERT INTO canonical_events (uid, summary_sig, date_sig, location_sig, dtstart, dtend, venue_id, "
+            "source_type, data, content_hash) VALUES (:uid, :summary_sig, :date_sig, :location_sig, :dtstart, "
+            ":dtend, :venue_id, :source_type, :data, :content_hash) "
+            "ON CONFLICT(uid) DO UPDATE SET summary_sig = excluded.summary_sig, date_sig = excluded.date_sig, "
+            "location_sig = excluded.location_sig, dtstart = excluded.dtstart, dtend = excluded.dtend, "
+            "venue_id = excluded.venue_id, source_type = excluded.source_type, data = excluded.data, "
+            "content_hash = excluded.content_hash",
+            rows)
+        conn.executemany("DELETE FROM canonical_events WHERE uid = ?", [(uid,) for uid in existing])
+    return inserted, updated, len(existing)
+
+
+def iter_canonical_events(conn, start=None, end=None, venue_id=None):
+    """Eventi dell'aggregato finale con dtstart in [start, end) e/o di una venue, per dtstart."""
+    sql, params = _range_query("canonical_events", start, end, venue_id)
+    return _records_from_rows(conn.execute(sql, params))
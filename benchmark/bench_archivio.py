@@ -0,0 +1,109 @@
+"""Archivio SQLite (archivio.py) su dieci anni di storico sintetico.
+
+Scrive N eventi in file mensili discovered/eventi_YYYY_MM.json in una cartella
+temporanea e misura:
+1. ingestione iniziale di tutti i file;
+2. run notturno senza modifiche (file con sha256 invariato: nessuna riga toccata);
+3. run con un solo evento modificato in un file (una riga aggiornata);
+4. query indicizzate: un mese, un intervallo di date, una venue;
+5. riapertura dopo un cambio di normalizzazione/registro venue (simulato azzerando
+   venue_id e l'impronta): colonne derivate ricalcolate, stesse risposte alle query;
+6. un feed tolto da CALENDAR_URLS: le sue righe vengono rimosse, quelle degli altri no.
+
+Esecuzione: python benchmark/bench_archivio.py [--events 120000]
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from archivio import (  # noqa: E402
+    ingest_source,
+    iter_events,
+    iter_month_events,
+    iter_source_events,
+    open_event_store,
+    prune_feed_sources,
+    sync_file_sources,
+)
+from bench_evento import make_events_json, timed  # noqa: E402
+from genera_calendari_mensili import SOURCE_TYPE_BY_SUFFIX  # noqa: E402
+from normalizzazione import resolve_venue  # noqa: E402
+
+
+def write_month_files(base_dir, events):
+    files_by_month = {}
+    by_month = {}
+    for ev in events:
+        by_month.setdefault(ev['dtstart_str'][:7].replace('-', '_'), []).append(ev)
+    for month_key, month_events in sorted(by_month.items()):
+        path = base_dir / "discovered" / f"eventi_{month_key}.json"
+        path.write_text(json.dumps({"events": month_events}, ensure_ascii=False), encoding="utf-8")
+        files_by_month[month_key] = [path]
+    return files_by_month
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--events', type=int, default=120000)
+    args = parser.parse_args()
+    events = json.loads(make_events_json(args.events))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        base_dir = Path(tmp)
+        (base_dir / "discovered").mkdir()
+        files_by_month = write_month_files(base_dir, events)
+        store = open_event_store(base_dir / "eventi.sqlite")
+        print(f"{args.events} eventi in {len(files_by_month)} file mensili")
+
+        counts, t = timed(sync_file_sources, store, files_by_month, base_dir, SOURCE_TYPE_BY_SUFFIX)
+        print(f"  1. ingestione iniziale:     {t:7.2f} s  righe +{counts[0]} ~{counts[1]} -{counts[2]}")
+
+        counts, t = timed(sync_file_sources, store, files_by_month, base_dir, SOURCE_TYPE_BY_SUFFIX)
+        print(f"  2. run senza modifiche:     {t:7.2f} s  righe +{counts[0]} ~{counts[1]} -{counts[2]}")
+
+        month_key, (path,) = sorted(files_by_month.items())[len(files_by_month) // 2]
+        doc = json.loads(path.read_text(encoding="utf-8"))
+        doc["events"][0]["description"] += " (aggiornato)"
+        path.write_text(json.dumps(doc, ensure_ascii=False), encoding="utf-8")
+        counts, t = timed(sync_file_sources, store, files_by_month, base_dir, SOURCE_TYPE_BY_SUFFIX)
+        print(f"  3. un evento modificato:    {t:7.2f} s  righe +{counts[0]} ~{counts[1]} -{counts[2]}")
+        assert counts == (0, 1, 0), counts
+
+        month, t = timed(lambda: list(iter_month_events(store, month_key)))
+        print(f"  4. query mese {month_key}:      {t * 1000:7.1f} ms ({len(month)} eventi)")
+        year = month_key[:4]
+        window, t = timed(lambda: list(iter_events(store, f"{year}-03-01", f"{year}-03-08")))
+        print(f"     query 7 giorni:          {t * 1000:7.1f} ms ({len(window)} eventi)")
+        venue_id = resolve_venue("Ippodromo SNAI La Maura")
+        venue, t = timed(lambda: list(iter_events(store, f"{year}-01-01", f"{int(year) + 1}-01-01", venue_id)))
+        print(f"     query venue+anno:        {t * 1000:7.1f} ms ({len(venue)} eventi)")
+
+        with store:
+            store.execute("UPDATE events SET venue_id = NULL")
+            store.execute("UPDATE meta SET value = 'normalizzazione precedente'")
+        store.close()
+        store, t = timed(open_event_store, base_dir / "eventi.sqlite")
+        print(f"  5. riapertura con ricalcolo: {t:6.2f} s")
+        rebuilt = list(iter_events(store, f"{year}-01-01", f"{int(year) + 1}-01-01", venue_id))
+        assert [r.to_dict() for r in rebuilt] == [r.to_dict() for r in venue], (len(rebuilt), len(venue))
+        counts = sync_file_sources(store, files_by_month, base_dir, SOURCE_TYPE_BY_SUFFIX)
+        assert counts == (0, 0, 0), counts
+
+        feeds = {"https://feed.example/inter.ics": events[:300], "https://feed.example/milan.ics": events[300:600]}
+        for url, feed_events in feeds.items():
+            ingest_source(store, url, 'feed', [{**ev, 'source_type': 'ics_feed'} for ev in feed_events])
+        deleted, t = timed(prune_feed_sources, store, ["https://feed.example/inter.ics"])
+        print(f"  6. feed tolto dagli URL:    {t * 1000:7.1f} ms  righe -{deleted}")
+        assert deleted == 300, deleted
+        assert len(list(iter_source_events(store, "https://feed.example/inter.ics"))) == 300
+        assert sync_file_sources(store, files_by_month, base_dir, SOURCE_TYPE_BY_SUFFIX) == (0, 0, 0)
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Estrazione dai dati strutturati (dati_strutturati.py) sulle pagine salvate in
+benchmark/fixtures/, senza rete: verifica gli eventi attesi per ogni pagina (JSON-LD,
+microdata, calendario .ics linkato, nessun dato -> modello) e misura il costo per
+pagina rispetto alla pulizia del testo per il prompt (page_text), che la via
+strutturata evita insieme alla chiamata al modello.
+
+Esecuzione: python benchmark/bench_dati_strutturati.py [--repeat 200]
+"""
+
+import argparse
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from dati_strutturati import events_from_ical, parse_structured_data  # noqa: E402
+from discover_eventi import page_text  # noqa: E402
+from evento import TARGET_TIMEZONE_OBJ  # noqa: E402
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+BASE_URL = "https://ippodromo.example/corse/"
+
+# pagina -> (summary, dtstart_str) attesi, o il link .ics atteso
+EXPECTED = {
+    "biglietteria_jsonld.html": [
+        ("Vasco Rossi - Vasco Live 2027", "2027-06-04T21:00:00"),
+        ("Coldplay & Friends", "2027-06-19T20:30:00"),  # 18:30Z -> ora di Roma
+        ("Milano Summer Festival", "2027-07-10T21:00:00"),  # solo data
+        ("Serata di apertura", "2027-07-10T20:00:00"),  # subEvent
+        ("Musical al Teatro Arcimboldi", "2027-05-21T20:45:00"),  # fuori scope: la scarta filter_and_dedup
+    ],
+    "venue_microdata.html": [
+        ("Festival Rock in Maura", "2027-05-15T19:00:00"),
+        ("Mercatino & vintage", "2027-05-23T21:00:00"),
+    ],
+    "ippodromo_ical.html": "https://ippodromo.example/calendario/corse.ics",
+    "blog_senza_dati.html": [],
+}
+ICAL_OCCURRENCES = 12  # 12 domeniche - 1 EXDATE + Gran Premio; la riunione annullata no
+
+
+def timed(fn, repeat):
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - t0) / repeat, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    for name, expected in EXPECTED.items():
+        page_html = (FIXTURES / name).read_text(encoding="utf-8")
+        t_structured, data = timed(lambda: parse_structured_data(page_html, BASE_URL), args.repeat)
+        t_text, _text = timed(lambda: page_text(page_html), args.repeat)
+        if isinstance(expected, str):
+            assert data.events == [] and data.ical_urls == [expected], data
+            window = (TARGET_TIMEZONE_OBJ.localize(datetime(2027, 1, 1)),
+                      TARGET_TIMEZONE_OBJ.localize(datetime(2028, 1, 1)))
+            events = events_from_ical((FIXTURES / "corse.ics").read_text(encoding="utf-8"), expected, *window)
+            assert len(events) == ICAL_OCCURRENCES, len(events)
+            outcome = f"link iCal -> {len(events)} eventi"
+        else:
+            got = [(ev["summary"], ev["dtstart_str"]) for ev in data.events]
+            assert got == expected, got
+            outcome = f"{len(got)} eventi" if got else "nessun dato: va al modello"
+        print(f"  {name:<26} {outcome:<28} strutturati {t_structured * 1e6:7.0f} us | "
+              f"testo per il prompt {t_text * 1e6:7.0f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""De-duplicazione: motore a ordinamento e raggruppamento (deduplicate_events) contro
+l'implementazione storica a passata singola (legacy_dedup in bench_evento.py).
+
+1. Casi di fusione (FIXTURES): duplicati forti e deboli tra manuale, discovered e feed,
+   con descrizioni e orari diversi, nell'ordine di arrivo del generatore (manuali, poi
+   discovered, poi feed). I due motori devono dare lo stesso risultato, che deve essere
+   quello atteso (inizio piu' presto, fine piu' tardi, descrizioni concatenate, URL mappa
+   dal discovered). Il cambio di comportamento documentato (feed con location vuota ora
+   assorbito, prima restava un evento a se') e' verificato a parte contro l'atteso.
+2. Dati reali: per ogni mese di dati_grezzi/ + discovered/ e per l'aggregato (mesi +
+   partite dei feed dagli snapshot in .cache/feed, se presenti) confronta gli eventi
+   prodotti dai due motori e stampa le differenze.
+3. Indipendenza dall'ordine: rimescola l'input N volte, l'output deve restare identico
+   (lo storico puo' cambiare quando ci sono collisioni deboli).
+4. Tempi su eventi sintetici.
+
+Esecuzione: python benchmark/bench_dedup.py [--shuffles 20] [--events 100000]
+"""
+
+import argparse
+import contextlib
+import copy
+import io
+import json
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import genera_calendari_mensili as gcm  # noqa: E402
+from bench_evento import legacy_dedup, make_events_json, timed  # noqa: E402
+from evento import as_event_records, records_to_dicts  # noqa: E402
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+
+STADIO = "Piazzale Angelo Moratti, 20151 Milano MI, Italy"
+MAURA = "Via Lampugnano 95, 20151 Milano MI, Italy"
+MAPS_STADIO = "https://maps.google.com/?q=Stadio+San+Siro"
+
+
+def ev(summary, start, end, location, source_type, description="", address="", maps=""):
+    event = {'summary': summary, 'dtstart_str': start, 'dtend_str': end, 'location_name': location,
+             'location_address': address, 'description': description, 'source_type': source_type}
+    if maps:
+        event['google_maps_url_str'] = maps
+    return event
+
+
+# (nome, eventi in ordine di arrivo, atteso: [(summary, dtstart, dtend, description, maps url)])
+FIXTURES = [
+    ("forte manuale+discovered", [
+        ev("Vasco Rossi - Live 2027", "2027-06-04T21:00:00", "2027-06-04T23:00:00", "Stadio San Siro",
+           "manual_from_file", "Apertura cancelli 18:00", STADIO),
+        ev("VASCO ROSSI - Live 2027", "2027-06-04T20:30:00", "2027-06-04T23:59:00", "Stadio Giuseppe Meazza",
+           "discovered", "Biglietti su TicketOne", STADIO, MAPS_STADIO),
+    ], [("Vasco Rossi - Live 2027", "2027-06-04T20:30:00", "2027-06-04T23:59:00",
+         "Apertura cancelli 18:00\n---\nBiglietti su TicketOne", MAPS_STADIO)]),
+    ("forte manuale+discovered+feed", [
+        ev("Inter vs Milan", "2027-03-14T20:45:00", "2027-03-14T22:30:00", "Stadio San Siro",
+           "manual_from_file", "Derby", STADIO, MAPS_STADIO),
+        ev("Inter - Milan", "2027-03-14T20:45:00", "", "San Siro", "discovered", "derby"),
+        ev("INTER - MILAN [Serie A]", "2027-03-14T20:30:00", "2027-03-14T22:45:00", "Stadio Giuseppe Meazza",
+           "ics_feed", "Serie A, giornata 28"),
+    ], [("Inter vs Milan", "2027-03-14T20:30:00", "2027-03-14T22:45:00",
+         "Derby\n---\nSerie A, giornata 28", MAPS_STADIO)]),
+    ("debole: feed senza location", [
+        ev("Inter vs Juventus", "2027-04-04T18:00:00", "2027-04-04T20:00:00", "Stadio San Siro",
+           "manual_from_file", "Big match", STADIO),
+        ev("Inter - Juventus", "2027-04-04T17:45:00", "2027-04-04T20:15:00", "?", "ics_feed", "Serie A"),
+    ], [("Inter vs Juventus", "2027-04-04T17:45:00", "2027-04-04T20:15:00", "Big match", "")]),
+    ("debole: discovered in due venue", [
+        ev("Mercatino vintage", "2027-05-23T10:00:00", "2027-05-23T18:00:00", "Ippodromo La Maura",
+           "manual_from_file", "", MAURA),
+        ev("Mercatino vintage", "2027-05-23T09:00:00", "2027-05-23T19:00:00", "Stadio San Siro",
+           "discovered", "Bancarelle", STADIO, MAPS_STADIO),
+    ], [("Mercatino vintage", "2027-05-23T09:00:00", "2027-05-23T19:00:00", "Bancarelle", MAPS_STADIO),
+        ("Mercatino vintage", "2027-05-23T10:00:00", "2027-05-23T18:00:00", "", "")]),
+]
+# Cambio di comportamento: il feed con location vuota ora e' assorbito dal manuale
+EMPTY_LOCATION_FIXTURE = ("feed con location vuota", [
+    ev("Milan vs Napoli", "2027-02-07T20:45:00", "2027-02-07T22:30:00", "Stadio San Siro",
+       "manual_from_file", "", STADIO),
+    ev("Milan - Napoli", "2027-02-07T20:45:00", "2027-02-07T22:45:00", "", "ics_feed"),
+], [("Milan vs Napoli", "2027-02-07T20:45:00", "2027-02-07T22:45:00", "", "")])
+
+
+def canonical(event_dicts):
+    return sorted(json.dumps(ev, sort_keys=True, ensure_ascii=False) for ev in event_dicts)
+
+
+def summarized(event_dicts):
+    return sorted((ev['summary'], ev['dtstart_str'], ev['dtend_str'], ev['description'],
+                   ev.get('google_maps_url_str', '')) for ev in event_dicts)
+
+
+def check_fixtures():
+    for name, events, expected in FIXTURES:
+        legacy_out, _ = timed(legacy_dedup, copy.deepcopy(events))
+        new_out = records_to_dicts(timed(gcm.deduplicate_events, events)[0])
+        assert canonical(new_out) == canonical(legacy_out), (name, new_out, legacy_out)
+        assert summarized(new_out) == sorted(expected), (name, summarized(new_out))
+        print(f"  {name:<32} {len(events)} -> {len(new_out)}  identici allo storico")
+    name, events, expected = EMPTY_LOCATION_FIXTURE
+    legacy_out, _ = timed(legacy_dedup, copy.deepcopy(events))
+    new_out = records_to_dicts(timed(gcm.deduplicate_events, events)[0])
+    assert len(legacy_out) == 2, legacy_out
+    assert summarized(new_out) == expected, summarized(new_out)
+    print(f"  {name:<32} {len(events)} -> {len(new_out)}  (storico: {len(legacy_out)}, cambio documentato)")
+
+
+def load_real_inputs():
+    """{etichetta: lista di dict} nell'ordine di caricamento del generatore."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        events_by_month = gcm.load_events_by_month(
+            REPO_DIR / gcm.DATA_SOURCE_FOLDER_NAME, REPO_DIR / gcm.DISCOVERED_FOLDER_NAME)
+    inputs = {month: records_to_dicts(events) for month, events in sorted(events_by_month.items())}
+    feed_events = []
+    for meta_path in sorted((REPO_DIR / gcm.CACHE_FOLDER_NAME / "feed").glob("*.json")):
+        feed_events.extend(json.loads(meta_path.read_text(encoding='utf-8')).get('home_events') or [])
+    aggregate = []
+    for month, events in inputs.items():
+        deduped, _ = timed(legacy_dedup, copy.deepcopy(events))
+        aggregate.extend(deduped)
+    inputs[f"aggregato (+{len(feed_events)} dai feed)"] = aggregate + feed_events
+    return inputs
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--shuffles', type=int, default=20)
+    parser.add_argument('--events', type=int, default=100000)
+    args = parser.parse_args()
+    rnd = random.Random(1)
+
+    print("1. Casi di fusione: storico vs sort-and-group")
+    check_fixtures()
+
+    print("2. Dati reali: storico vs sort-and-group")
+    for label, events in load_real_inputs().items():
+        legacy_out, _ = timed(legacy_dedup, copy.deepcopy(events))
+        new_out, _ = timed(gcm.deduplicate_events, events)
+        a, b = canonical(legacy_out), canonical(records_to_dicts(new_out))
+        status = "identici" if a == b else "DIVERSI"
+        print(f"  {label:<28} {len(events):>5} -> {len(legacy_out):>4} / {len(new_out):>4}  {status}")
+        for line in sorted(set(a) ^ set(b)):
+            print(f"      {'-' if line in a else '+'} {line}")
+
+    print(f"3. Indipendenza dall'ordine ({args.shuffles} permutazioni dell'aggregato)")
+    events = list(load_real_inputs().values())[-1]
+    reference_new = records_to_dicts(timed(gcm.deduplicate_events, events)[0])
+    legacy_variants = set()
+    for _ in range(args.shuffles):
+        shuffled = copy.deepcopy(events)
+        rnd.shuffle(shuffled)
+        assert records_to_dicts(timed(gcm.deduplicate_events, shuffled)[0]) == reference_new
+        legacy_variants.add(tuple(canonical(timed(legacy_dedup, shuffled)[0])))
+    print(f"  sort-and-group: 1 risultato; storico: {len(legacy_variants)} risultati distinti")
+
+    print(f"4. Tempi su {args.events} eventi sintetici")
+    payload = make_events_json(args.events)
+    dicts = json.loads(payload)
+    records = as_event_records(json.loads(payload))
+    _, t_legacy = timed(legacy_dedup, dicts)
+    _, t_new = timed(gcm.deduplicate_events, records)
+    print(f"  storico (dict):     {t_legacy:6.2f} s")
+    print(f"  sort-and-group:     {t_new:6.2f} s")
+
+
+if __name__ == "__main__":
+    main()
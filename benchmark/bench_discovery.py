@@ -0,0 +1,195 @@
+"""Pipeline di discovery (discover_eventi.discover_sources) contro server locali: uno
+serve N pagine HTML sintetiche, l'altro imita l'endpoint chat/completions di GitHub
+Models con una latenza artificiale. Confronta l'elaborazione sequenziale (1 worker) con
+quella concorrente, verifica che il merge dia esattamente gli stessi eventi e che i
+limiti siano rispettati (richieste al modello entro il token bucket e mai piu' di
+GH_MODELS_MAX_CONCURRENT in parallelo, pagine al massimo DISCOVERY_MAX_PER_HOST).
+Poi due run con la cache LLM in una cartella temporanea: il secondo non deve chiamare
+il modello e deve dare lo stesso merge. Infine un run con budget ridotto: anche i worker
+ancora in corso allo scadere devono chiudersi entro il budget (richieste con timeout
+ricavati dal tempo rimasto), altrimenti l'interprete li aspetterebbe all'uscita.
+
+Esecuzione: python benchmark/bench_discovery.py [--sources 24] [--latency 0.5] [--rpm 240]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ["GH_MODELS_ENDPOINT"] = "http://127.0.0.1:0/"  # sostituito sotto con la porta vera
+
+import discover_eventi as de  # noqa: E402
+
+
+class Probe:
+    """Richieste in corso e orari di arrivo, per controllare i limiti dal lato server."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.arrivals = []
+
+    def __enter__(self):
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            self.arrivals.append(time.monotonic())
+
+    def __exit__(self, *exc):
+        with self.lock:
+            self.in_flight -= 1
+
+    def reset(self):
+        with self.lock:
+            self.max_in_flight = 0
+            self.arrivals = []
+
+
+def fake_events(page):
+    """Eventi che il "modello" estrae dalla pagina: due propri e uno condiviso da tutte le
+    pagine (il merge deve attribuirlo sempre alla prima fonte)."""
+    day = de.NOW.date() + timedelta(days=1 + page % 30)
+    shared_day = de.NOW.date() + timedelta(days=10)
+    return [
+        {"summary": f"Artista {page} - Tour", "dtstart_str": f"{day}T21:00:00",
+         "location_name": "Stadio San Siro", "confidence": "high"},
+        {"summary": f"Band {page} Live", "dtstart_str": f"{day}T18:30:00",
+         "location_name": "Ippodromo La Maura", "confidence": "medium"},
+        {"summary": "Festival Condiviso", "dtstart_str": f"{shared_day}T20:00:00",
+         "location_name": "Stadio San Siro", "confidence": "high"},
+    ]
+
+
+def make_servers(latency):
+    pages_probe, model_probe = Probe(), Probe()
+
+    class PageHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            with pages_probe:
+                time.sleep(latency / 5)
+                body = (f"<html><body><h1>Eventi pagina {self.path}</h1>"
+                        f"<p>Concerti e spettacoli a San Siro.</p></body></html>").encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    class ModelHandler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            with model_probe:
+                request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                page = int(re.search(r"/page/(\d+)", request["messages"][1]["content"]).group(1))
+                time.sleep(latency)
+                content = json.dumps({"events": fake_events(page)})
+                body = json.dumps({"choices": [{"message": {"content": content}}]}).encode()
+                try:
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # il client ha chiuso allo scadere del budget
+
+        def log_message(self, *args):
+            pass
+
+    servers = [ThreadingHTTPServer(("127.0.0.1", 0), handler) for handler in (PageHandler, ModelHandler)]
+    for server in servers:
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+    return servers, pages_probe, model_probe
+
+
+def run(sources, max_workers, budget_s, llm_cache=None):
+    session = de.make_http_session()
+    with contextlib.redirect_stdout(io.StringIO()):
+        t0 = time.perf_counter()
+        results = de.discover_sources(session, sources, "token-finto", max_workers=max_workers,
+                                      budget_s=budget_s, llm_cache=llm_cache)
+        elapsed = time.perf_counter() - t0
+        merged = de.merge_source_results(sources, results, set(), set())
+    return elapsed, results, merged
+
+
+def check_rate(arrivals, rate, burst):
+    """Ogni finestra [t_i, t_j] contiene al massimo burst + rate * (t_j - t_i) richieste
+    (piu' una di tolleranza per il jitter tra client e server)."""
+    arrivals = sorted(arrivals)
+    return all(j - i + 1 <= burst + rate * (arrivals[j] - arrivals[i]) + 1
+               for i in range(len(arrivals)) for j in range(i, len(arrivals)))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sources', type=int, default=24)
+    parser.add_argument('--latency', type=float, default=0.5, help="secondi per risposta del modello")
+    parser.add_argument('--rpm', type=int, default=240, help="rate limit del modello per il benchmark")
+    parser.add_argument('--workers', type=int, default=de.DISCOVERY_MAX_WORKERS)
+    args = parser.parse_args()
+
+    (pages, model), pages_probe, model_probe = make_servers(args.latency)
+    de.GH_MODELS_ENDPOINT = f"http://127.0.0.1:{model.server_address[1]}/chat/completions"
+    de.GH_MODELS_REQUESTS_PER_MINUTE = args.rpm
+    page_host = f"http://127.0.0.1:{pages.server_address[1]}"
+    sources = [{"name": f"pagina-{i}", "url": f"{page_host}/page/{i}", "type": "llm_html"}
+               for i in range(args.sources)]
+    rate, burst = args.rpm / 60, de.GH_MODELS_BURST
+
+    baseline = None
+    for workers in (1, args.workers):
+        pages_probe.reset()
+        model_probe.reset()
+        elapsed, results, merged = run(sources, workers, budget_s=3600)
+        skipped = sum(1 for r in results if r is None)
+        assert skipped == 0, f"{skipped} fonti saltate"
+        if baseline is None:
+            baseline = merged
+        assert merged == baseline, "il merge concorrente differisce da quello sequenziale"
+        assert pages_probe.max_in_flight <= de.DISCOVERY_MAX_PER_HOST
+        assert model_probe.max_in_flight <= de.GH_MODELS_MAX_CONCURRENT
+        assert check_rate(model_probe.arrivals, rate, burst), "rate limit del modello superato"
+        print(f"  {workers} worker: {len(sources)} fonti in {elapsed:.2f} s, "
+              f"{len(merged[0])} eventi nuovi, max {model_probe.max_in_flight} richieste al modello "
+              f"in parallelo, rate e merge OK")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for label in ("cache vuota", "cache piena"):
+            model_probe.reset()
+            llm_cache = de.LLMCache(Path(tmp))
+            elapsed, _results, merged = run(sources, args.workers, budget_s=3600, llm_cache=llm_cache)
+            assert merged == baseline, "il merge con la cache differisce da quello senza"
+            print(f"  {label}: {elapsed:.2f} s, {llm_cache.hits} hit, {llm_cache.misses} miss, "
+                  f"{len(model_probe.arrivals)} chiamate al modello")
+        assert not model_probe.arrivals, "con la cache piena il modello non va chiamato"
+
+    budget = args.latency * 3
+    t0 = time.perf_counter()
+    elapsed, results, _merged = run(sources, args.workers, budget_s=budget)
+    for thread in threading.enumerate():
+        if thread is not threading.current_thread() and not thread.daemon:
+            thread.join()
+    drained = time.perf_counter() - t0
+    assert drained <= budget + 0.25, f"worker ancora attivi {drained - budget:.2f} s dopo il budget"
+    done = sum(1 for r in results if r is not None)
+    print(f"  budget {budget:.1f} s: {done}/{len(sources)} fonti concluse, run chiuso in {elapsed:.2f} s, "
+          f"ultimo worker chiuso dopo {drained:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""Memoria per evento e tempo di de-duplicazione: dict con date stringa (storico, date
+riparsate a ogni confronto) contro EventRecord (evento.py: __slots__, date e firme
+calcolate una volta al caricamento).
+
+Esecuzione: python benchmark/bench_evento.py [--events 100000]
+"""
+
+import argparse
+import contextlib
+import gc
+import io
+import json
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import genera_calendari_mensili as gcm  # noqa: E402
+from evento import as_event_records, make_timezone_aware, parse_datetime_str  # noqa: E402
+from normalizzazione import create_event_signatures_batch, normalize_location_for_signature  # noqa: E402
+
+
+# --- De-duplicazione storica su dict (copia fedele, per confronto) ---
+def legacy_dedup(event_list_of_dicts):
+    processed = {}
+    weak_to_strong = {}
+    for cur, (weak, strong) in zip(event_list_of_dicts, create_event_signatures_batch(event_list_of_dicts)):
+        dt_start_cur = make_timezone_aware(parse_datetime_str(cur.get('dtstart_str')))
+        if not dt_start_cur: continue
+        if weak in weak_to_strong:
+            ex_strong = weak_to_strong[weak]
+            ex = processed[ex_strong]
+            print(f"    INFO: Trovata corrispondenza debole (Summary+Data) tra NUOVO '{cur.get('summary')}' e ESISTENTE '{ex.get('summary')}'")
+            cur_loc = normalize_location_for_signature(cur.get('location_name', ''))
+            ex_loc = normalize_location_for_signature(ex.get('location_name', ''))
+            if cur.get('source_type') == 'ics_feed' and ex.get('source_type') != 'ics_feed' and \
+               cur_loc == 'unknown_location' and ex_loc != 'unknown_location':
+                dt_end_cur = make_timezone_aware(parse_datetime_str(cur.get('dtend_str')))
+                dt_end_ex = make_timezone_aware(parse_datetime_str(ex.get('dtend_str')))
+                if dt_start_cur < make_timezone_aware(parse_datetime_str(ex.get('dtstart_str'))):
+                    ex['dtstart_str'] = cur['dtstart_str']
+                if dt_end_cur and (not dt_end_ex or dt_end_cur > dt_end_ex):
+                    ex['dtend_str'] = cur['dtend_str']
+                continue
+            if strong == ex_strong:
+                dt_end_cur = make_timezone_aware(parse_datetime_str(cur.get('dtend_str')))
+                dt_start_ex = make_timezone_aware(parse_datetime_str(ex.get('dtstart_str')))
+                dt_end_ex = make_timezone_aware(parse_datetime_str(ex.get('dtend_str')))
+                if dt_start_cur < dt_start_ex:
+                    ex['dtstart_str'] = cur['dtstart_str']
+                if dt_end_cur and (not dt_end_ex or dt_end_cur > dt_end_ex):
+                    ex['dtend_str'] = cur['dtend_str']
+                ex_desc = str(ex.get('description', '')).strip()
+                new_desc = str(cur.get('description', '')).strip()
+                if new_desc and new_desc.lower() != ex_desc.lower():
+                    ex['description'] = f"{ex_desc}\n---\n{new_desc}" if ex_desc else new_desc
+                if cur.get('source_type') != 'ics_feed' and cur.get('google_maps_url_str') and not ex.get('google_maps_url_str'):
+                    ex['google_maps_url_str'] = cur.get('google_maps_url_str')
+                    ex['location_address'] = cur.get('location_address', ex.get('location_address', ''))
+                continue
+            processed[strong] = cur.copy()
+            weak_to_strong[weak] = strong
+        else:
+            processed[strong] = cur.copy()
+            weak_to_strong[weak] = strong
+    return list(processed.values())
+
+
+VENUES = [
+    ("Stadio San Siro", "Piazzale Angelo Moratti, 20151 Milano MI, Italy"),
+    ("Ippodromo SNAI San Siro", "Piazzale dello Sport 16, 20151 Milano MI, Italy"),
+    ("Ippodromo SNAI La Maura", "Via Lampugnano 95, 20151 Milano MI, Italy"),
+]
+
+
+def make_events_json(n, seed=42):
+    """Eventi come arrivano da discovered/*.json (stringhe non condivise tra eventi),
+    con ~25% di duplicati deboli/forti tra fonti diverse."""
+    rnd = random.Random(seed)
+    base = datetime(2025, 1, 1, 18, 0)
+    events = []
+    for i in range(n):
+        k = rnd.randrange(int(n * 0.75) or 1)
+        start = base + timedelta(days=k % 3650, hours=k % 5)
+        loc, addr = VENUES[k % len(VENUES)]
+        events.append({
+            'summary': f"Artista {k} Live",
+            'dtstart_str': start.strftime('%Y-%m-%dT%H:%M:%S'),
+            'dtend_str': (start + timedelta(hours=rnd.randint(2, 4))).strftime('%Y-%m-%dT%H:%M:%S'),
+            'location_name': loc,
+            'location_address': addr,
+            'description': rnd.choice(["", "Concerto", f"Tour {k % 50}"]),
+            'google_maps_url_str': f"https://maps.google.com/?q={loc.replace(' ', '+')}",
+            'source_type': rnd.choice(['manual_from_file', 'discovered', 'ics_feed']),
+        })
+    return json.dumps(events)
+
+
+def measure_memory(build):
+    gc.collect()
+    tracemalloc.start()
+    obj = build()
+    gc.collect()
+    current, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return obj, current
+
+
+def timed(fn, *args):
+    t0 = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        out = fn(*args)
+    return out, time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--events', type=int, default=100000)
+    args = parser.parse_args()
+    payload = make_events_json(args.events)
+
+    dicts, mem_dicts = measure_memory(lambda: json.loads(payload))
+    records, mem_records = measure_memory(lambda: as_event_records(json.loads(payload)))
+    print(f"{args.events} eventi")
+    print(f"  memoria dict:         {mem_dicts / args.events:7.0f} B/evento")
+    print(f"  memoria EventRecord:  {mem_records / args.events:7.0f} B/evento (date, firme e venue incluse)")
+
+    legacy_out, t_legacy = timed(legacy_dedup, dicts)
+    _, t_build = timed(as_event_records, json.loads(payload))
+    records_out, t_records = timed(gcm.deduplicate_events, records)
+    print(f"  dedup storica (dict):          {t_legacy:6.2f} s")
+    print(f"  dedup EventRecord:             {t_records:6.2f} s (+ {t_build:.2f} s di costruzione dei record)")
+    assert len(legacy_out) == len(records_out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Benchmark del parsing dei feed partite: percorso storico (Calendar.from_ical su tutto
+il feed + walk) contro lo scanner streaming con pre-filtro (parse_feed_home_events).
+
+Esecuzione: python benchmark/bench_feed_parsing.py [--seasons 20] [--repeat 3]
+"""
+
+import argparse
+import contextlib
+import io
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from icalendar import Calendar  # noqa: E402
+
+import genera_calendari_mensili as gcm  # noqa: E402
+
+OPPONENTS = ["Lecce", "Atalanta", "Torino", "Genoa", "Bologna", "Roma", "Lazio", "Napoli",
+             "Juventus", "Fiorentina", "Cagliari", "Udinese", "Empoli", "Verona", "Parma", "Como"]
+
+
+def make_feed(club, seasons, last_season_start_year):
+    """Feed in stile ics.fixtur.es: una partita ogni ~4 giorni, casa/trasferta alternate."""
+    lines = ["BEGIN:VCALENDAR", "VERSION:2.0", "PRODID:-//fixtur.es//EN", f"X-WR-CALNAME:{club}"]
+    start = datetime(last_season_start_year - seasons + 1, 8, 15, 18, 45)
+    end = datetime(last_season_start_year + 1, 6, 1)
+    n = 0
+    dt = start
+    while dt < end:
+        opponent = OPPONENTS[n % len(OPPONENTS)]
+        summary = f"{club} - {opponent} (2-1)" if n % 2 == 0 else f"{opponent} - {club} (0-0)"
+        description = ("Calendar not up to date? Check https://fixtur.es/up-to-date?path=club\\n\\n"
+                       "Support Fixtur.es via Buy Me a Coffee https://buymeacoffee.com/fixtures")
+        lines += [
+            "BEGIN:VEVENT",
+            f"UID:{n}@fixtur.es",
+            "DTSTAMP:20260101T000000Z",
+            dt.strftime("DTSTART:%Y%m%dT%H%M%SZ"),
+            (dt + timedelta(minutes=105)).strftime("DTEND:%Y%m%dT%H%M%SZ"),
+            f"SUMMARY:{summary}",
+            # riga lunga ripiegata come nei feed reali
+            f"DESCRIPTION:{description[:60]}",
+            f" {description[60:]}",
+            "END:VEVENT",
+        ]
+        dt += timedelta(days=4)
+        n += 1
+    lines.append("END:VCALENDAR")
+    return "\r\n".join(lines) + "\r\n", n
+
+
+def legacy_path(text, club, cutoff):
+    calendar = Calendar.from_ical(text)
+    return gcm.extract_home_match_events(calendar.walk('VEVENT'), club, cutoff)
+
+
+def streaming_path(text, club, cutoff):
+    return gcm.parse_feed_home_events(text, club, cutoff)
+
+
+def measure(fn, *args, repeat):
+    best = float('inf')
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            result = fn(*args)
+            best = min(best, time.perf_counter() - t0)
+        tracemalloc.start()
+        fn(*args)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return result, best, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seasons", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    club = "Inter"
+    now = datetime.now(gcm.TARGET_TIMEZONE_OBJ)
+    season_start = now.year if now.month >= 7 else now.year - 1
+    cutoff = gcm.TARGET_TIMEZONE_OBJ.localize(datetime(season_start - 1, 7, 1))
+    text, n_events = make_feed(club, args.seasons, season_start)
+    print(f"Feed sintetico: {args.seasons} stagioni, {n_events} VEVENT, {len(text) / 1024:.0f} KiB")
+
+    legacy_events, legacy_s, legacy_peak = measure(legacy_path, text, club, cutoff, repeat=args.repeat)
+    stream_events, stream_s, stream_peak = measure(streaming_path, text, club, cutoff, repeat=args.repeat)
+    assert legacy_events == stream_events, "I due percorsi producono eventi diversi!"
+
+    print(f"{'percorso':<12} {'tempo':>10} {'picco mem':>12}")
+    print(f"{'storico':<12} {legacy_s * 1000:>8.1f}ms {legacy_peak / 1024:>9.0f}KiB")
+    print(f"{'streaming':<12} {stream_s * 1000:>8.1f}ms {stream_peak / 1024:>9.0f}KiB")
+    print(f"Speedup {legacy_s / stream_s:.1f}x, memoria {legacy_peak / stream_peak:.1f}x, "
+          f"{len(stream_events)} partite casalinghe identiche.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Conteggio VEVENT + UID di un ICS generato: parse completo con icalendar (storico)
+contro scansione mmap dei byte (scan_ics_file) e indice sidecar (read_ics_index).
+Verifica anche che un ICS modificato a parita' di dimensione non usi il sidecar vecchio.
+
+Esecuzione: python benchmark/bench_ics_index.py [--events 20000]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from icalendar import Calendar
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import genera_calendari_mensili as gcm  # noqa: E402
+
+
+def make_events(n):
+    base = datetime(2025, 1, 1, 20, 45)
+    return [{
+        'summary': f"Evento {i} - Ospite {i % 97}",
+        'dtstart_str': (base + timedelta(hours=7 * i)).strftime('%Y-%m-%dT%H:%M:%S'),
+        'dtend_str': (base + timedelta(hours=7 * i + 2)).strftime('%Y-%m-%dT%H:%M:%S'),
+        'location_name': "Stadio San Siro",
+        'location_address': "Piazzale Angelo Moratti, 20151 Milano MI, Italy",
+        'description': "Descrizione abbastanza lunga da richiedere il folding della riga " * 2,
+    } for i in range(n)]
+
+
+def timed(fn):
+    t0 = time.perf_counter()
+    out = fn()
+    return out, (time.perf_counter() - t0) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--events', type=int, default=20000)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "eventi_bench.ics"
+        gcm.write_ics_file(gcm.serializable_events(make_events(args.events)), "Bench", path)
+        print(f"{args.events} eventi, {path.stat().st_size / 1e6:.1f} MB")
+
+        def full_parse():
+            cal = Calendar.from_ical(path.read_bytes())
+            return [str(e.get('UID')) for e in cal.walk('VEVENT')]
+
+        ref, t_parse = timed(full_parse)
+        scan, t_scan = timed(lambda: gcm.scan_ics_file(path))
+        index, t_index = timed(lambda: gcm.read_ics_index(path))
+        assert scan['uids'] == ref == index['uids']
+        print(f"  icalendar (parse completo): {t_parse:9.1f} ms")
+        print(f"  scansione mmap:             {t_scan:9.1f} ms")
+        print(f"  indice sidecar:             {t_index:9.1f} ms")
+
+        data = path.read_bytes()
+        first_uid = ref[0].encode('utf-8')
+        path.write_bytes(data.replace(first_uid, first_uid[::-1], 1))  # stessa dimensione
+        stale, t_stale = timed(lambda: gcm.read_ics_index(path))
+        assert stale['uids'][0] == ref[0][::-1] and stale['uids'][1:] == ref[1:]
+        print(f"  ICS modificato, stessa dim:{t_stale:9.1f} ms  indice ricostruito dalla scansione")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Indice per intervalli (intervalli.py) contro una scansione lineare dell'aggregato:
+costruzione e latenza media/p99 di query puntuali, su intervallo e "prossimi N" su un
+archivio sintetico di piu' stagioni. Verifica che i risultati coincidano.
+
+Esecuzione: python benchmark/bench_intervalli.py [--events 200000] [--queries 2000]
+"""
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from datetime import timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bench_evento import make_events_json  # noqa: E402
+from evento import as_event_records  # noqa: E402
+from intervalli import IntervalIndex, _timestamp, event_bounds  # noqa: E402
+
+
+def linear_overlapping(bounds, start, end):
+    return [rec for rec, (s, e) in bounds if e > start and (s < end or (start == end and s <= end))]
+
+
+def linear_next(bounds, start, n):
+    return [rec for rec, (s, _e) in bounds if s >= start][:n]
+
+
+def timed(fn, queries):
+    latencies, results = [], []
+    for q in queries:
+        t0 = time.perf_counter()
+        results.append(fn(*q))
+        latencies.append(time.perf_counter() - t0)
+    return latencies, results
+
+
+def fmt(latencies):
+    return (f"media {statistics.fmean(latencies) * 1e6:8.1f} us  "
+            f"p99 {statistics.quantiles(latencies, n=100)[98] * 1e6:8.1f} us")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--events', type=int, default=200000)
+    parser.add_argument('--queries', type=int, default=2000)
+    args = parser.parse_args()
+    rng = random.Random(42)
+
+    records = as_event_records(json.loads(make_events_json(args.events)))
+    t0 = time.perf_counter()
+    index = IntervalIndex(records)
+    build_s = time.perf_counter() - t0
+    first, last = index.records[0].dtstart, index.records[-1].dtstart
+    print(f"{len(index)} eventi dal {first:%Y-%m-%d} al {last:%Y-%m-%d}, indice costruito in {build_s:.2f} s")
+
+    span_min = int((last - first).total_seconds() // 60)
+    points = [(first + timedelta(minutes=rng.randrange(span_min))).replace(tzinfo=None)
+              for _ in range(args.queries)]
+    ranges = [(p, p + timedelta(hours=6)) for p in points]
+    bounds = [(rec, event_bounds(rec)) for rec in index.records]
+
+    for label, fn, queries, linear in (
+        ("at", index.at, [(p,) for p in points],
+         lambda p: linear_overlapping(bounds, _timestamp(p), _timestamp(p))),
+        ("range 6h", index.overlapping, ranges,
+         lambda a, b: linear_overlapping(bounds, _timestamp(a), _timestamp(b))),
+        ("next 10", lambda p: index.next(p, 10), [(p,) for p in points],
+         lambda p: linear_next(bounds, _timestamp(p), 10)),
+    ):
+        lat, results = timed(fn, queries)
+        sample = queries[:max(1, len(queries) // 20)]  # la scansione e' lenta: un campione
+        lat_linear, expected = timed(linear, sample)
+        assert results[:len(sample)] == expected
+        print(f"  {label:<9} indice {fmt(lat)} | scansione {fmt(lat_linear)}")
+
+
+if __name__ == "__main__":
+    main()
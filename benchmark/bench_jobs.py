@@ -0,0 +1,58 @@
+"""Fase 1c in parallelo: render_months con --jobs 1, 2, 4, ... su un archivio sintetico
+di molti mesi. Verifica che gli ICS e gli eventi de-duplicati siano identici a quelli
+con un solo processo e stampa tempi e speedup (vicino a lineare fino al numero di core,
+se i mesi sono abbastanza da tenerli occupati).
+
+Esecuzione: python benchmark/bench_jobs.py [--events 120000] [--jobs 1,2,4,8]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import genera_calendari_mensili as gcm  # noqa: E402
+from bench_evento import make_events_json  # noqa: E402
+from evento import as_event_records, records_to_dicts  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--events', type=int, default=120000)
+    parser.add_argument('--jobs', default=f"1,2,4,{os.cpu_count() or 1}")
+    args = parser.parse_args()
+
+    by_month = {}
+    for ev in json.loads(make_events_json(args.events)):
+        by_month.setdefault(ev['dtstart_str'][:7].replace('-', '_'), []).append(ev)
+    months = [(month_key, as_event_records(events)) for month_key, events in sorted(by_month.items())]
+    print(f"{args.events} eventi in {len(months)} mesi, {os.cpu_count()} core")
+
+    reference = None
+    baseline_s = None
+    for jobs in sorted({int(j) for j in args.jobs.split(',')}):
+        with tempfile.TemporaryDirectory() as tmp:
+            output_dir = Path(tmp)
+            t0 = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                rendered = gcm.render_months(months, output_dir, jobs=jobs)
+            elapsed = time.perf_counter() - t0
+            outputs = {path.name: path.read_bytes() for path in sorted(output_dir.iterdir())}
+            events = {month_key: records_to_dicts(processed) for month_key, (processed, _ok) in rendered.items()}
+        if reference is None:
+            reference, baseline_s = (outputs, events), elapsed
+        status = "identici" if (outputs, events) == reference else "DIVERSI"
+        print(f"  --jobs {jobs:<3} {elapsed:7.2f} s  speedup {baseline_s / elapsed:4.1f}x  "
+              f"{len(outputs)} file, output {status}")
+        assert status == "identici"
+
+
+if __name__ == "__main__":
+    main()
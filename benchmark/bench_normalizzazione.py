@@ -0,0 +1,168 @@
+"""Microbenchmark della normalizzazione per le firme di dedup: costo per evento
+dell'implementazione storica (re.sub con pattern stringa a ogni chiamata) contro
+normalizzazione.py (regex precompilate + cache LRU + API batch).
+
+Prima dei tempi verifica che location e venue restino quelle storiche sulle location
+vere: dati_grezzi/, calendari_custom/ e testi visti nei feed e nelle pagine delle fonti.
+
+Esecuzione: python benchmark/bench_normalizzazione.py [--events 50000]
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import normalizzazione as nz  # noqa: E402
+
+
+# --- Implementazione storica (copia fedele, per confronto) ---
+def legacy_normalize_summary(summary):
+    if not summary: return ""
+    s = str(summary).lower().strip()
+    s = re.sub(r'\s*\[(cl|el|cop|serie a|campionato)\]\s*$', '', s, flags=re.IGNORECASE)
+    s = re.sub(r'\b(live|world tour|concerto|evento|show|i-days milano|stadi \d{4}|partita)\b', '', s, flags=re.IGNORECASE)
+    s = re.sub(r'\(data \d+(?: - ipotizzata)?\)', '', s, flags=re.IGNORECASE)
+    s = re.sub(r'[^\w\s-]', '', s)
+    s = re.sub(r'\s+', ' ', s).strip()
+    s = re.sub(r'\s*\(\d+-\d+\)\s*$', '', s).strip()
+    parts = sorted([p.strip() for p in re.split(r'\s+vs\s+|\s+-\s+', s) if p.strip()])
+    return " vs ".join(parts)
+
+
+LEGACY_LOCATION_ALIASES = {
+    "ippodromo snai la maura": ["ippodromo la maura", "la maura", "via lampugnano 95"],
+    "ippodromo snai san siro": ["ippodromo san siro", "piazzale dello sport 16", "piazzale dello sport"],
+    "stadio san siro": ["stadio giuseppe meazza", "san siro", "piazzale angelo moratti"]
+}
+
+
+def legacy_normalize_location(location_name):
+    if not location_name: return ""
+    loc_lower = str(location_name).lower().strip()
+    for canonical, aliases in LEGACY_LOCATION_ALIASES.items():
+        if canonical in loc_lower: return canonical
+        for alias in aliases:
+            if alias in loc_lower: return canonical
+    loc_lower = re.sub(r'[^\w\s,-]', '', loc_lower)  # nell'originale '[^\w\s-,]', che re rifiuta
+    loc_lower = re.sub(r'\s+', ' ', loc_lower).strip()
+    return loc_lower if loc_lower else "unknown_location"
+
+
+def legacy_signatures(ev):
+    s = legacy_normalize_summary(ev.get('summary'))
+    try:
+        d = datetime.strptime(ev.get('dtstart_str'), '%Y-%m-%dT%H:%M:%S').date().isoformat()
+    except (TypeError, ValueError):
+        d = ""
+    loc = legacy_normalize_location(ev.get('location_name', ev.get('location', '')))
+    return (s, d), (s, d, loc)
+
+
+# Location viste nei feed ICS delle squadre, nelle pagine delle fonti della discovery e
+# nei testi liberi delle biglietterie (oltre a quelle dei file in dati_grezzi/).
+REAL_LOCATIONS = [
+    "Ippodromo del Trotto La Maura", "Ippodromo SNAI La Maura", "Ippodromo La Maura, Milano",
+    "La Maura - Lampugnano", "Via Lampugnano 95, 20151 Milano MI, Italy", "Lampugnano, Milano",
+    "Ippodromo SNAI San Siro", "Ippodromo Snai San Siro - Milano", "Ippodromo San Siro (galoppo)",
+    "Ippodromo del Galoppo", "Ippodromo", "Piazzale dello Sport 16, 20151 Milano MI, Italy",
+    "Stadio San Siro (Giuseppe Meazza)", "Stadio Giuseppe Meazza", "Stadio Meazza", "San Siro",
+    "San  Siro", "Stadio San Siro, Milano", "Piazzale Angelo Moratti, 20151 Milano MI, Italy",
+    "Stadio Giuseppe Meazza - Ippodromo La Maura (parcheggi)", "Meazza / Lampugnano",
+    "Unipol Forum, Via G. Di Vittorio 6, Assago (MI)", "Alcatraz, Via Valtellina 25, Milano",
+    "Allianz Stadium", "Stadio Olimpico", "Parco di Trenno", "", "   ", "Milano",
+]
+
+
+def real_locations():
+    from sorgenti import list_event_source_files, load_event_sources
+    root = Path(__file__).resolve().parent.parent
+    locations = set(REAL_LOCATIONS)
+    for events in load_event_sources(list_event_source_files(root / "dati_grezzi")).values():
+        locations.update(ev.get('location_name', '') for ev in events or [])
+    for path in sorted((root / "calendari_custom").glob("*.ics")):
+        locations.update(line[len("LOCATION:"):].strip() for line in path.read_text(encoding="utf-8").splitlines()
+                         if line.startswith("LOCATION:"))
+    return sorted(locations)
+
+
+def check_real_locations():
+    """Firme (e quindi UID) e venue uguali a quelle dell'implementazione storica."""
+    locations = real_locations()
+    for loc in locations:
+        legacy = legacy_normalize_location(loc)
+        assert nz.normalize_location_for_signature(loc) == legacy, (loc, legacy)
+        assert nz.resolve_venue(loc) == nz.CANONICAL_TO_VENUE_ID.get(legacy), loc
+    return len(locations)
+
+
+def make_events(n, seed=42):
+    """Eventi realistici: tante partite/concerti ripetuti (stesso club, stesse location)."""
+    rnd = random.Random(seed)
+    clubs = ["Inter", "AC Milan"]
+    opponents = ["Lecce", "Atalanta", "Torino", "Genoa", "Bologna", "Roma", "Lazio", "Napoli"]
+    artists = ["Vasco Rossi - Live 2025", "Coldplay - Music Of The Spheres World Tour",
+               "Pinguini Tattici Nucleari - Hello World Tour Stadi 2025", "Dua Lipa - I-Days Milano"]
+    locations = ["Stadio San Siro (Giuseppe Meazza)", "Ippodromo SNAI La Maura", "Ippodromo SNAI San Siro", ""]
+    events = []
+    for i in range(n):
+        if rnd.random() < 0.6:
+            summary = f"{rnd.choice(clubs)} - {rnd.choice(opponents)} ({rnd.randint(0, 4)}-{rnd.randint(0, 4)})"
+        else:
+            summary = rnd.choice(artists)
+        events.append({
+            'summary': summary,
+            'dtstart_str': f"20{rnd.randint(20, 30)}-{rnd.randint(1, 12):02}-{rnd.randint(1, 28):02}T21:00:00",
+            'location_name': rnd.choice(locations),
+        })
+    return events
+
+
+def per_event_us(fn, events):
+    t0 = time.perf_counter()
+    fn(events)
+    return (time.perf_counter() - t0) / len(events) * 1e6
+
+
+def clear_caches():
+    nz._normalize_summary.cache_clear()
+    nz._normalize_location.cache_clear()
+    nz.event_date_for_signature.cache_clear()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=50000)
+    args = parser.parse_args()
+    events = make_events(args.events)
+
+    assert [legacy_signatures(e) for e in events[:2000]] == nz.create_event_signatures_batch(events[:2000])
+    print(f"{check_real_locations()} location vere: normalizzazione e venue uguali allo storico")
+
+    cases = [
+        ("summary storico", lambda evs: [legacy_normalize_summary(e['summary']) for e in evs]),
+        ("summary nuovo", lambda evs: [nz.normalize_summary_for_signature(e['summary']) for e in evs]),
+        ("location storico", lambda evs: [legacy_normalize_location(e['location_name']) for e in evs]),
+        ("location nuovo", lambda evs: [nz.normalize_location_for_signature(e['location_name']) for e in evs]),
+        ("firme storico", lambda evs: [legacy_signatures(e) for e in evs]),
+        ("firme nuovo", lambda evs: [nz.create_event_signatures(e) for e in evs]),
+        ("firme batch", nz.create_event_signatures_batch),
+    ]
+    print(f"{args.events} eventi; costo medio per evento (µs)")
+    print(f"{'caso':<20} {'cache fredda':>13} {'cache calda':>12}")
+    for name, fn in cases:
+        clear_caches()
+        cold = per_event_us(fn, events)
+        warm = per_event_us(fn, events)
+        print(f"{name:<20} {cold:>13.2f} {warm:>12.2f}")
+    info = nz.normalize_cache_info()
+    print(f"Cache summary: {info['summary']['hits']} hit / {info['summary']['misses']} miss")
+
+
+if __name__ == "__main__":
+    main()
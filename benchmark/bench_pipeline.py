@@ -0,0 +1,313 @@
+"""Suite di benchmark dell'intera pipeline su dati sintetici, con risultati in JSON.
+
+Per ogni taglia genera in una cartella temporanea N eventi nelle forme reali:
+dati_grezzi/eventi_YYYY_MM.toml, discovered/eventi_YYYY_MM.json e feed ICS in stile
+ics.fixtur.es (UTC, DESCRIPTION ripiegata, niente LOCATION), con numero di feed e di
+venue e tasso di duplicati configurabili. Poi misura ogni fase da sola:
+
+  caricamento     load_event_sources + EventRecord (TOML/JSON -> record)
+  normalizzazione normalize_summary_for_signature (cache LRU svuotate)
+  firme           create_event_signatures (cache LRU svuotate)
+  dedup           deduplicate_events (ex apply_deduplication_and_merge)
+  icalendar       create_calendar_from_event_dicts + to_ical (riferimento, lento)
+  serializzazione serializable_events + write_ics_stream (percorso di produzione)
+  feed            parse_feed_home_events su tutti i feed
+
+Per fase: tempo (migliore di --repeat), eventi/s e picco di memoria (tracemalloc, in
+una passata separata per non falsare i tempi). Il JSON va su stdout o in --output, la
+tabella leggibile su stderr.
+
+Esecuzione: python benchmark/bench_pipeline.py [--sizes 1000,10000,100000,1000000]
+            [--feeds 2] [--venues 3] [--dup-rate 0.25] [--output risultati.json]
+"""
+
+import argparse
+import contextlib
+import gc
+import io
+import json
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import genera_calendari_mensili as gcm  # noqa: E402
+from evento import as_event_records  # noqa: E402
+from normalizzazione import (  # noqa: E402
+    VENUES,
+    create_event_signatures,
+    normalize_cache_clear,
+    normalize_summary_for_signature,
+)
+from sorgenti import _toml_value, load_event_sources  # noqa: E402
+
+FEED_SHARE = 0.2  # quota degli eventi che arriva dai feed (VEVENT, casa + trasferta)
+HISTORY_DAYS = 3650
+BASE_DATE = datetime(2025, 1, 1, 18, 0)
+ARTISTS = ["Vasco Rossi", "Ligabue", "Coldplay", "Cesare Cremonini", "Ultimo", "Max Pezzali",
+           "Metallica", "Imagine Dragons", "Marco Mengoni", "Tiziano Ferro", "Annalisa", "Articolo 31"]
+OPPONENTS = ["Lecce", "Atalanta", "Torino", "Genoa", "Bologna", "Roma", "Lazio", "Napoli",
+             "Juventus", "Fiorentina", "Cagliari", "Udinese", "Empoli", "Verona", "Parma", "Como"]
+FEED_DESCRIPTION = ("Calendar not up to date? Check https://fixtur.es/up-to-date?path=club\\n\\n"
+                    "Support Fixtur.es via Buy Me a Coffee https://buymeacoffee.com/fixtures")
+
+
+# --- Generatore sintetico ---
+def make_venues(count):
+    real = [(v["name"], v["address"]) for v in VENUES.values()]
+    return (real + [(f"Arena Sintetica {i}", f"Via Esempio {i}, 20100 Milano MI, Italy")
+                    for i in range(len(real), count)])[:max(count, 1)]
+
+
+def make_clubs(count):
+    return (["Inter", "AC Milan"] + [f"Club {i}" for i in range(2, count)])[:count]
+
+
+def make_file_events(n, venues, dup_rate, rnd, home_matches):
+    """Eventi di dati_grezzi e discovered. Una quota dup_rate ripete un evento precedente
+    (altra fonte, titolo o orari leggermente diversi) o una partita casalinga dei feed."""
+    events = []
+    for i in range(n):
+        if events and rnd.random() < dup_rate:
+            if home_matches and rnd.random() < 0.3:
+                club, opponent, start = rnd.choice(home_matches)
+                ev = {'summary': f"{club} - {opponent}", 'location_name': VENUES["stadio-san-siro"]["name"],
+                      'location_address': VENUES["stadio-san-siro"]["address"],
+                      'dtstart_str': start.strftime('%Y-%m-%dT%H:%M:%S'),
+                      'dtend_str': (start + timedelta(hours=2)).strftime('%Y-%m-%dT%H:%M:%S')}
+            else:
+                ev = dict(rnd.choice(events))
+                ev['summary'] = rnd.choice([ev['summary'].upper(), f"{ev['summary']} LIVE", ev['summary']])
+                start = datetime.fromisoformat(ev['dtstart_str']) - timedelta(minutes=rnd.choice([0, 30]))
+                ev['dtstart_str'] = start.strftime('%Y-%m-%dT%H:%M:%S')
+            ev['description'] = rnd.choice(["", "Concerto", "Traffico previsto dal pomeriggio."])
+        else:
+            name, address = venues[i % len(venues)]
+            start = BASE_DATE + timedelta(days=rnd.randrange(HISTORY_DAYS), hours=rnd.randrange(4))
+            ev = {
+                'summary': f"{ARTISTS[i % len(ARTISTS)]} - Tour {i}",
+                'dtstart_str': start.strftime('%Y-%m-%dT%H:%M:%S'),
+                'dtend_str': (start + timedelta(hours=rnd.randint(2, 4))).strftime('%Y-%m-%dT%H:%M:%S'),
+                'location_name': name,
+                'location_address': address,
+                'description': rnd.choice(["", "Concerto", f"Data {i % 3 + 1}"]),
+                'google_maps_url_str': f"https://maps.google.com/?q={name.replace(' ', '+')}",
+            }
+        ev['_discovered'] = rnd.random() < 0.5
+        events.append(ev)
+    return events
+
+
+def make_feed(club, count, rnd):
+    """Feed ics.fixtur.es: `count` partite in HISTORY_DAYS giorni, casa/trasferta alternate.
+    Ritorna (testo ICS, [(club, avversario, inizio locale) delle partite in casa])."""
+    lines = ["BEGIN:VCALENDAR", "VERSION:2.0", "PRODID:-//fixtur.es//EN", f"X-WR-CALNAME:{club}"]
+    step = timedelta(days=HISTORY_DAYS) / max(count, 1)
+    home = []
+    for n in range(count):
+        start = (BASE_DATE + step * n).replace(second=0, microsecond=0)
+        opponent = rnd.choice(OPPONENTS)
+        summary = f"{club} - {opponent} (2-1)" if n % 2 == 0 else f"{opponent} - {club} (0-0)"
+        start_utc = gcm.TARGET_TIMEZONE_OBJ.localize(start).astimezone(gcm.pytz.UTC)
+        if n % 2 == 0:
+            home.append((club, opponent, start))
+        lines += [
+            "BEGIN:VEVENT",
+            f"UID:{club.replace(' ', '')}-{n}@fixtur.es",
+            "DTSTAMP:20260101T000000Z",
+            start_utc.strftime("DTSTART:%Y%m%dT%H%M%SZ"),
+            (start_utc + timedelta(minutes=105)).strftime("DTEND:%Y%m%dT%H%M%SZ"),
+            f"SUMMARY:{summary}",
+            f"DESCRIPTION:{FEED_DESCRIPTION[:60]}",
+            f" {FEED_DESCRIPTION[60:]}",
+            "END:VEVENT",
+        ]
+    lines.append("END:VCALENDAR")
+    return "\r\n".join(lines) + "\r\n", home
+
+
+def write_dataset(base_dir, events):
+    """Scrive gli eventi nei file mensili; ritorna i path nell'ordine del generatore."""
+    by_file = {}
+    for ev in events:
+        folder = "discovered" if ev['_discovered'] else "dati_grezzi"
+        month_key = ev['dtstart_str'][:7].replace('-', '_')
+        clean = {k: v for k, v in ev.items() if k != '_discovered'}
+        by_file.setdefault((folder, month_key), []).append(clean)
+    paths = []
+    for (folder, month_key), file_events in sorted(by_file.items()):
+        (base_dir / folder).mkdir(exist_ok=True)
+        if folder == "discovered":
+            path = base_dir / folder / f"eventi_{month_key}.json"
+            path.write_text(json.dumps({"events": file_events}, ensure_ascii=False), encoding="utf-8")
+        else:
+            path = base_dir / folder / f"eventi_{month_key}.toml"
+            blocks = ["[[events]]\n" + "".join(f"{k} = {_toml_value(v)}\n" for k, v in ev.items())
+                      for ev in file_events]
+            path.write_text(f"# {folder}/{path.name}\n\n" + "\n".join(blocks), encoding="utf-8")
+        paths.append(path)
+    return paths
+
+
+# --- Fasi ---
+def load_records(paths):
+    loaded = load_event_sources(paths)
+    records = []
+    for path in paths:
+        for rec in as_event_records(loaded[path]):
+            if path.suffix == '.json':
+                rec.set('source_type', 'discovered')
+            elif 'source_type' not in rec:
+                rec.set('source_type', 'manual_from_file')
+            records.append(rec)
+    return records
+
+
+def normalize_summaries(summaries):
+    normalize_cache_clear()
+    for s in summaries:
+        normalize_summary_for_signature(s)
+    return len(summaries)
+
+
+def compute_signatures(dicts):
+    normalize_cache_clear()
+    for ev in dicts:
+        create_event_signatures(ev)
+    return len(dicts)
+
+
+def icalendar_serialize(records):
+    return gcm.create_calendar_from_event_dicts(records, 'Benchmark').to_ical()
+
+
+def stream_serialize(records):
+    prepared = gcm.serializable_events(records)
+    gcm.write_ics_stream(prepared, 'Benchmark', io.BytesIO())
+    return prepared
+
+
+def parse_feeds(feeds, cutoff):
+    return [ev for club, text in feeds for ev in gcm.parse_feed_home_events(text, club, cutoff)]
+
+
+def run_stage(setup, fn, repeat, memory):
+    """(risultato, secondi migliori, picco di memoria in byte o None). setup() prepara
+    argomenti freschi fuori dal tempo misurato (la dedup modifica i record)."""
+    best = float('inf')
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(repeat):
+            args = setup()
+            t0 = time.perf_counter()
+            out = fn(*args)
+            best = min(best, time.perf_counter() - t0)
+        peak = None
+        if memory:
+            args = setup()
+            gc.collect()
+            tracemalloc.start()
+            fn(*args)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+    return out, best, peak
+
+
+def bench_size(n, args):
+    rnd = random.Random(args.seed)
+    venues = make_venues(args.venues)
+    clubs = make_clubs(args.feeds)
+    n_feed = int(n * FEED_SHARE) if clubs else 0
+    feeds, home_matches = [], []
+    for i, club in enumerate(clubs):
+        text, home = make_feed(club, n_feed // len(clubs) + (i < n_feed % len(clubs)), rnd)
+        feeds.append((club, text))
+        home_matches.extend(home)
+    file_events = make_file_events(n - n_feed, venues, args.dup_rate, rnd, home_matches)
+    cutoff = gcm.TARGET_TIMEZONE_OBJ.localize(BASE_DATE - timedelta(days=1))
+
+    stages = {}
+
+    def record(name, items, seconds, peak):
+        stages[name] = {'items': items, 'seconds': round(seconds, 6),
+                        'items_per_s': round(items / seconds, 1) if seconds else None, 'peak_bytes': peak}
+        mem = f"{peak / 2**20:9.1f} MiB" if peak is not None else "        -"
+        print(f"  {name:<16} {items:>9} {seconds:9.3f} s {items / seconds if seconds else 0:>12.0f}/s {mem}",
+              file=sys.stderr)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = write_dataset(Path(tmp), file_events)
+        records, t, peak = run_stage(lambda: (paths,), load_records, args.repeat, args.memory)
+        record('caricamento', len(records), t, peak)
+
+    dicts = [rec.to_dict() for rec in records]
+    summaries = [ev.get('summary') for ev in dicts]
+    _, t, peak = run_stage(lambda: (summaries,), normalize_summaries, args.repeat, args.memory)
+    record('normalizzazione', len(summaries), t, peak)
+    _, t, peak = run_stage(lambda: (dicts,), compute_signatures, args.repeat, args.memory)
+    record('firme', len(dicts), t, peak)
+
+    feed_events, t, peak = run_stage(lambda: (feeds, cutoff), parse_feeds, args.repeat, args.memory)
+    record('feed', sum(text.count("BEGIN:VEVENT") for _, text in feeds), t, peak)
+
+    all_dicts = dicts + feed_events
+    deduped, t, peak = run_stage(lambda: (as_event_records(all_dicts),), gcm.deduplicate_events,
+                                 args.repeat, args.memory)
+    record('dedup', len(all_dicts), t, peak)
+
+    if len(deduped) <= args.icalendar_max:
+        _, t, peak = run_stage(lambda: (deduped,), icalendar_serialize, args.repeat, args.memory)
+        record('icalendar', len(deduped), t, peak)
+    else:
+        stages['icalendar'] = {'items': len(deduped), 'skipped': f"oltre --icalendar-max {args.icalendar_max}"}
+        print(f"  {'icalendar':<16} {len(deduped):>9} saltato (oltre --icalendar-max)", file=sys.stderr)
+    _, t, peak = run_stage(lambda: (deduped,), stream_serialize, args.repeat, args.memory)
+    record('serializzazione', len(deduped), t, peak)
+
+    return {'events': n, 'file_events': len(records), 'feed_vevents': n_feed,
+            'deduplicated_events': len(deduped), 'stages': stages}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', default="1000,10000,100000,1000000",
+                        help="numeri di eventi separati da virgola")
+    parser.add_argument('--feeds', type=int, default=2)
+    parser.add_argument('--venues', type=int, default=3)
+    parser.add_argument('--dup-rate', type=float, default=0.25)
+    parser.add_argument('--repeat', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--icalendar-max', type=int, default=100000,
+                        help="salta la serializzazione icalendar sopra questo numero di eventi")
+    parser.add_argument('--no-memory', dest='memory', action='store_false',
+                        help="non misurare il picco di memoria (dimezza la durata)")
+    parser.add_argument('--output', type=Path, help="file JSON dei risultati (default: stdout)")
+    args = parser.parse_args()
+
+    report = {
+        'suite': 'pipeline',
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'params': {'feeds': args.feeds, 'venues': args.venues, 'dup_rate': args.dup_rate,
+                   'repeat': args.repeat, 'seed': args.seed, 'feed_share': FEED_SHARE},
+        'runs': [],
+    }
+    for n in (int(s) for s in args.sizes.split(',')):
+        print(f"{n} eventi", file=sys.stderr)
+        report['runs'].append(bench_size(n, args))
+
+    payload = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(payload + "\n", encoding="utf-8")
+    else:
+        print(payload)
+
+
+if __name__ == "__main__":
+    main()
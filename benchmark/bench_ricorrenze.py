@@ -0,0 +1,85 @@
+"""Espansione delle ricorrenze dei feed (ricorrenze.py): un feed sintetico con N serie
+settimanali senza fine (con EXDATE e qualche RECURRENCE-ID) passa da
+parse_feed_home_events come nella Fase 2. Misura il tempo totale, le occorrenze al
+secondo e il picco di memoria dell'espansione da sola (consumata senza tenerla), che
+non cresce con la lunghezza delle serie.
+
+Esecuzione: python benchmark/bench_ricorrenze.py [--series 1000,5000] [--seasons 3]
+"""
+
+import argparse
+import contextlib
+import io
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import genera_calendari_mensili as gcm  # noqa: E402
+from ricorrenze import expand_vevents, recurrence_window  # noqa: E402
+
+CLUB = "Inter"
+
+
+def make_feed(n_series):
+    lines = ["BEGIN:VCALENDAR", "VERSION:2.0"]
+    for i in range(n_series):
+        hour = 14 + i % 8
+        day = 1 + i % 28
+        lines += [
+            "BEGIN:VEVENT",
+            f"UID:serie-{i}@bench",
+            f"SUMMARY:{CLUB} - Serie {i}" if i % 4 else f"Avversaria {i} - {CLUB}",  # 1 su 4 in trasferta
+            f"DTSTART;TZID=Europe/Rome:202501{day:02d}T{hour:02d}0000",
+            f"DTEND;TZID=Europe/Rome:202501{day:02d}T{hour + 2:02d}0000",
+            "RRULE:FREQ=WEEKLY",
+            f"EXDATE;TZID=Europe/Rome:202509{day:02d}T{hour:02d}0000",
+            "END:VEVENT",
+        ]
+        if i % 10 == 0:
+            lines += [
+                "BEGIN:VEVENT",
+                f"UID:serie-{i}@bench",
+                f"RECURRENCE-ID;TZID=Europe/Rome:202501{day:02d}T{hour:02d}0000",
+                f"SUMMARY:{CLUB} - Serie {i} (spostata)",
+                f"DTSTART;TZID=Europe/Rome:202501{day:02d}T{hour - 1:02d}0000",
+                "END:VEVENT",
+            ]
+    lines.append("END:VCALENDAR")
+    return "\r\n".join(lines) + "\r\n"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--series', default="1000,5000")
+    parser.add_argument('--seasons', type=int, default=gcm.FEED_RECURRENCE_SEASONS)
+    args = parser.parse_args()
+    data_riferimento_feed = gcm.TARGET_TIMEZONE_OBJ.localize(datetime(2025, 7, 1))
+    window = recurrence_window(data_riferimento_feed, args.seasons)
+
+    for n in (int(s) for s in args.series.split(',')):
+        feed = make_feed(n)
+        components = gcm.prefilter_feed_vevents(feed, lambda *_: True)
+
+        t0 = time.perf_counter()
+        occurrences = sum(1 for _ in expand_vevents(components, *window))
+        t_expand = time.perf_counter() - t0
+        tracemalloc.start()  # passata a parte: tracemalloc rallenta molto
+        sum(1 for _ in expand_vevents(components, *window))
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        t0 = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            home_events = gcm.parse_feed_home_events(feed, CLUB, data_riferimento_feed)
+        t_parse = time.perf_counter() - t0
+        print(f"  {n:>5} serie: {occurrences} occorrenze espanse in {t_expand:.2f} s "
+              f"({occurrences / t_expand:,.0f}/s, picco {peak / 1e6:.1f} MB); "
+              f"feed completo {t_parse:.2f} s -> {len(home_events)} partite casalinghe")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""Test di carico del server locale (server_calendari.py): avvia il server in un
+sottoprocesso sugli output gia' generati e lo interroga per --seconds secondi da N client
+con connessioni keep-alive, su un mix di ICS statici (gzip e no), revalidation con
+If-None-Match (304) e query filtrate. Stampa richieste/s e latenze p50/p99 per tipo.
+Prima del carico verifica la negoziazione: gzip solo con q > 0, ETag deboli (W/) validi
+per il 304.
+
+Prima esegui il generatore (servono calendari_output/ e .cache/eventi.sqlite).
+
+Esecuzione: python benchmark/bench_server.py [--clients 8] [--seconds 10] [--port 8081]
+"""
+
+import argparse
+import http.client
+import json
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+QUERIES = [
+    "/eventi.ics?venue=la-maura",
+    "/eventi.ics?type=match&from=2025-09-01&to=2026-01-01",
+    "/eventi.ics?team=inter",
+    "/eventi.ics?venue=stadio-san-siro,ippodromo-san-siro&type=event",
+]
+
+
+def wait_ready(host, port, timeout=15):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection(host, port, timeout=1)
+            conn.request("GET", "/")
+            return json.loads(conn.getresponse().read())
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"il server non risponde su {host}:{port}")
+
+
+def make_requests(listing, host, port):
+    """(tipo, path, header) del mix; gli ETag per le revalidation sono letti una volta."""
+    conn = http.client.HTTPConnection(host, port)
+    requests_mix = []
+    for path in listing["calendari"]:
+        conn.request("GET", path)
+        response = conn.getresponse()
+        response.read()
+        requests_mix.append(("statico", path, {}))
+        requests_mix.append(("gzip", path, {"Accept-Encoding": "gzip"}))
+        requests_mix.append(("304", path, {"If-None-Match": response.getheader("ETag")}))
+    requests_mix.extend(("query", path, {"Accept-Encoding": "gzip"}) for path in QUERIES)
+    return requests_mix
+
+
+# Accept-Encoding -> risposta gzip attesa
+ACCEPT_ENCODING_CASES = [
+    ("gzip", True),
+    ("gzip;q=0.5, identity", True),
+    ("*", True),
+    ("gzip;q=0", False),
+    ("identity, gzip;q=0", False),
+    ("br, *;q=0", False),
+    ("identity", False),
+]
+
+
+def check_negotiation(listing, host, port):
+    conn = http.client.HTTPConnection(host, port)
+    path = listing["calendari"][0]
+    for accept_encoding, expect_gzip in ACCEPT_ENCODING_CASES:
+        conn.request("GET", path, headers={"Accept-Encoding": accept_encoding})
+        response = conn.getresponse()
+        response.read()
+        assert (response.getheader("Content-Encoding") == "gzip") == expect_gzip, accept_encoding
+    for headers in ({}, {"Accept-Encoding": "gzip"}):
+        conn.request("GET", path, headers=headers)
+        response = conn.getresponse()
+        response.read()
+        weak = "W/" + response.getheader("ETag")
+        conn.request("GET", path, headers={**headers, "If-None-Match": f'"altro", {weak}'})
+        response = conn.getresponse()
+        response.read()
+        assert response.status == 304, (headers, weak, response.status)
+    print(f"  negoziazione: {len(ACCEPT_ENCODING_CASES)} casi di Accept-Encoding e ETag deboli OK")
+
+
+def client(host, port, requests_mix, offset, stop_at, latencies, errors):
+    conn = http.client.HTTPConnection(host, port)
+    i = offset
+    while time.perf_counter() < stop_at:
+        kind, path, headers = requests_mix[i % len(requests_mix)]
+        i += 1
+        t0 = time.perf_counter()
+        conn.request("GET", path, headers=headers)
+        response = conn.getresponse()
+        response.read()
+        latencies.setdefault(kind, []).append(time.perf_counter() - t0)
+        if response.status not in (200, 304):
+            errors.append((path, response.status))
+
+
+def percentile(values, p):
+    return statistics.quantiles(values, n=100)[p - 1] if len(values) > 1 else values[0]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--clients', type=int, default=8)
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--host', default="127.0.0.1")
+    parser.add_argument('--port', type=int, default=8081)
+    args = parser.parse_args()
+
+    server = subprocess.Popen([sys.executable, str(ROOT / "server_calendari.py"), "--host", args.host,
+                               "--port", str(args.port)], cwd=ROOT, stdout=subprocess.DEVNULL)
+    try:
+        listing = wait_ready(args.host, args.port)
+        check_negotiation(listing, args.host, args.port)
+        requests_mix = make_requests(listing, args.host, args.port)
+        print(f"{len(listing['calendari'])} ICS, {listing['eventi_indicizzati']} eventi indicizzati, "
+              f"{args.clients} client keep-alive per {args.seconds:g} s")
+        per_client = [{} for _ in range(args.clients)]
+        errors = []
+        stop_at = time.perf_counter() + args.seconds
+        threads = [threading.Thread(target=client, args=(args.host, args.port, requests_mix, n * 7, stop_at,
+                                                         per_client[n], errors))
+                   for n in range(args.clients)]
+        t0 = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        elapsed = time.perf_counter() - t0
+    finally:
+        server.terminate()
+        server.wait()
+
+    by_kind = {}
+    for latencies in per_client:
+        for kind, values in latencies.items():
+            by_kind.setdefault(kind, []).extend(values)
+    total = sum(len(v) for v in by_kind.values())
+    print(f"  totale  {total / elapsed:8.0f} req/s ({total} richieste, {len(errors)} errori)")
+    for kind, values in sorted(by_kind.items()):
+        print(f"  {kind:<7} {len(values):>8} richieste  p50 {percentile(values, 50) * 1000:6.2f} ms  "
+              f"p99 {percentile(values, 99) * 1000:6.2f} ms")
+    assert not errors, errors[:5]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Caricamento di centinaia di file mensili: import dei .py con importlib (storico)
+contro sorgenti.load_event_sources su TOML, a cache fredda, calda e dopo un checkout
+(mtime cambiati, contenuto uguale).
+
+Esecuzione: python benchmark/bench_sorgenti.py [--files 300] [--events 30]
+"""
+
+import argparse
+import importlib.util
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import sorgenti  # noqa: E402
+
+
+def make_event(month, i):
+    return {
+        'summary': f"Artista {month}-{i} - Tour",
+        'dtstart_str': f"2025-06-{1 + i % 28:02}T21:00:00",
+        'dtend_str': f"2025-06-{1 + i % 28:02}T23:30:00",
+        'location_name': "Stadio San Siro (Giuseppe Meazza)",
+        'location_address': "Piazzale Angelo Moratti, 20151 Milano MI, Italy",
+        'google_maps_url_str': "https://www.google.com/maps/search/?api=1&query=Stadio+San+Siro",
+        'description': "Concerto allo Stadio San Siro.",
+    }
+
+
+def legacy_import(path):
+    spec = importlib.util.spec_from_file_location(path.stem, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.event_list
+
+
+def timed(fn):
+    t0 = time.perf_counter()
+    out = fn()
+    return out, (time.perf_counter() - t0) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--files', type=int, default=300)
+    parser.add_argument('--events', type=int, default=30)
+    args = parser.parse_args()
+    sys.dont_write_bytecode = True  # come un checkout pulito in CI: niente __pycache__
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        py_paths, toml_paths = [], []
+        for n in range(args.files):
+            events = [make_event(n, i) for i in range(args.events)]
+            py_path = tmp / f"eventi_{n:04}.py"
+            py_path.write_text(f"event_list = {events!r}\n", encoding="utf-8")
+            py_paths.append(py_path)
+            toml_path = py_path.with_suffix(".toml")
+            toml_path.write_text(sorgenti.convert_legacy_py_to_toml(py_path), encoding="utf-8")
+            toml_paths.append(toml_path)
+        cache_path = tmp / "cache" / sorgenti.SOURCE_CACHE_FILENAME
+
+        legacy, t_legacy = timed(lambda: [legacy_import(p) for p in py_paths])
+        cold, t_cold = timed(lambda: sorgenti.load_event_sources(toml_paths, cache_path))
+        warm, t_warm = timed(lambda: sorgenti.load_event_sources(toml_paths, cache_path))
+        for p in toml_paths:
+            os.utime(p)
+        touched, t_touched = timed(lambda: sorgenti.load_event_sources(toml_paths, cache_path))
+        assert legacy == [cold[p] for p in toml_paths] == [warm[p] for p in toml_paths] == [touched[p] for p in toml_paths]
+
+        print(f"{args.files} file x {args.events} eventi")
+        print(f"  import .py (importlib):      {t_legacy:8.1f} ms")
+        print(f"  TOML, cache fredda:          {t_cold:8.1f} ms")
+        print(f"  TOML, cache calda:           {t_warm:8.1f} ms")
+        print(f"  TOML, mtime cambiati (hash): {t_touched:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
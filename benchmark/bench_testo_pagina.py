@@ -0,0 +1,103 @@
+"""Testo delle pagine per il prompt (discover_eventi.page_text): estrattore in streaming
+su html.parser, che salta il rumore mentre legge e si ferma a PAGE_TEXT_MAX_CHARS,
+contro la versione precedente (albero BeautifulSoup completo, decompose del rumore,
+get_text e troncamento). Verifica che il testo sia identico e misura latenza mediana e
+picco di memoria per pagina.
+
+Pagine: quelle salvate in benchmark/fixtures/ (o in --pages DIR, es. pagine vere
+scaricate a mano con curl) piu' pagine grandi generate come quelle di una venue: script
+inline nell'<head>, menu enorme, centinaia di schede evento con pulsanti social.
+Serve beautifulsoup4 (pip install beautifulsoup4), non piu' richiesto da discover_eventi.
+
+Esecuzione: python benchmark/bench_testo_pagina.py [--pages DIR] [--cards 500,3000] [--repeat 5]
+"""
+
+import argparse
+import re
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from discover_eventi import NOISE_CLASS_KEYWORDS, NOISE_TAGS, PAGE_TEXT_MAX_CHARS, page_text  # noqa: E402
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+
+
+def page_text_bs4(page_html):
+    """La versione precedente di page_text, per confronto."""
+    soup = BeautifulSoup(page_html, "html.parser")
+    for tag in soup(sorted(NOISE_TAGS)):
+        tag.decompose()
+    for el in list(soup.find_all(True, class_=True)):
+        if not el.attrs:
+            continue
+        classes = " ".join(el.get("class") or []).lower()
+        if any(k in classes for k in NOISE_CLASS_KEYWORDS):
+            el.decompose()
+    root = soup.body or soup
+    text = re.sub(r"\s+", " ", root.get_text(separator=" ", strip=True))
+    if len(text) > PAGE_TEXT_MAX_CHARS:
+        text = text[:PAGE_TEXT_MAX_CHARS] + " ...[truncated]"
+    return text
+
+
+def make_venue_page(cards):
+    head_script = "<script>" + "window.__STATE__ = {};\n" * 4000 + "</script>"
+    menu = "".join(f'<li class="menu-item"><a href="/p/{i}">Voce di menu {i}</a></li>' for i in range(600))
+    body = []
+    for i in range(cards):
+        body.append(
+            f'<div class="event-card" data-id="{i}"><div class="event-card__media"><img src="/img/{i}.jpg" alt=""></div>'
+            f'<div class="event-card__body"><h3>Artista {i} &amp; Band - Tour {2027 + i % 2}</h3>'
+            f'<p class="date"><time datetime="2027-06-{1 + i % 28:02}T21:00">{1 + i % 28} giugno 2027, ore 21:00</time></p>'
+            f'<p>Stadio San Siro &ndash; Piazzale Angelo Moratti, Milano. Apertura cancelli alle 18:00.</p>'
+            f'<div class="social-share"><a href="#">Facebook</a> <a href="#">WhatsApp</a></div>'
+            f'<a class="btn" href="/e/{i}">Biglietti</a></div></div>\n')
+    return ("<!DOCTYPE html><html lang=\"it\"><head><meta charset=\"utf-8\"><title>Eventi</title>"
+            f"{head_script}</head><body><header class=\"site-header\"><nav><ul>{menu}</ul></nav></header>"
+            f"<div class=\"cookie-banner\">Usiamo i cookie. <button>Accetta</button></div>"
+            f"<main><h1>Tutti gli eventi</h1>{''.join(body)}</main>"
+            f"<footer class=\"site-footer\">{menu}</footer></body></html>")
+
+
+def measure(fn, page_html, repeat):
+    latencies = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn(page_html)
+        latencies.append(time.perf_counter() - t0)
+    tracemalloc.start()  # passata a parte: tracemalloc rallenta molto
+    fn(page_html)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return statistics.median(latencies), peak, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--pages', type=Path, default=FIXTURES, help="cartella di pagine .html salvate")
+    parser.add_argument('--cards', default="500,3000", help="schede evento delle pagine generate")
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    pages = [(path.name, path.read_text(encoding="utf-8", errors="replace"))
+             for path in sorted(args.pages.glob("*.htm*"))]
+    pages += [(f"venue generata {n} schede", make_venue_page(int(n))) for n in args.cards.split(",")]
+
+    for name, page_html in pages:
+        t_old, mem_old, text_old = measure(page_text_bs4, page_html, args.repeat)
+        t_new, mem_new, text_new = measure(page_text, page_html, args.repeat)
+        assert text_new == text_old, f"{name}: testo diverso dalla versione BeautifulSoup"
+        print(f"  {name:<30} {len(page_html) / 1e3:8.0f} kB -> {len(text_new):5} car. | "
+              f"BeautifulSoup {t_old * 1e3:8.2f} ms {mem_old / 1e6:6.2f} MB | "
+              f"streaming {t_new * 1e3:7.2f} ms {mem_new / 1e6:6.2f} MB ({t_old / t_new:5.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Costo di una risoluzione location -> venue al crescere del numero di alias:
+scansione lineare per sottostringa (approccio storico di LOCATION_ALIASES) contro
+la regex a trie unica di normalizzazione.py.
+
+Esecuzione: python benchmark/bench_venue_resolver.py
+"""
+
+import random
+import string
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import normalizzazione as nz  # noqa: E402
+
+LOOKUPS = 20000
+
+
+def synthetic_aliases(n, rnd):
+    words = ["teatro", "arena", "palazzetto", "stadio", "ippodromo", "parco", "piazza", "via", "forum", "auditorium"]
+    out = set()
+    while len(out) < n:
+        out.add(f"{rnd.choice(words)} {''.join(rnd.choices(string.ascii_lowercase, k=rnd.randint(4, 10)))}")
+    return sorted(out)
+
+
+def main():
+    rnd = random.Random(7)
+    texts = [
+        "Ippodromo SNAI San Siro - Piazzale dello Sport 16, 20151 Milano MI, Italy",
+        "Stadio San Siro (Giuseppe Meazza), Piazzale Angelo Moratti",
+        "Unipol Forum, Via G. Di Vittorio 6, Assago (MI)",
+        "Alcatraz, Via Valtellina 25, Milano",
+    ]
+    print(f"{'alias':>7} {'lineare (µs)':>14} {'trie regex (µs)':>16}")
+    for n in (10, 100, 1000, 10000):
+        aliases = synthetic_aliases(n, rnd) + ["ippodromo snai san siro", "san siro", "piazzale angelo moratti"]
+        regex = nz._trie_regex(aliases)
+
+        def linear(text):
+            low = text.lower()
+            return max((a for a in aliases if a in low), key=len, default=None)
+
+        def trie(text):
+            return max((m.group() for m in regex.finditer(text.lower())), key=len, default=None)
+
+        for text in texts:
+            assert linear(text) == trie(text), text
+        timings = []
+        for fn in (linear, trie):
+            t0 = time.perf_counter()
+            for i in range(LOOKUPS):
+                fn(texts[i % len(texts)])
+            timings.append((time.perf_counter() - t0) / LOOKUPS * 1e6)
+        print(f"{n:>7} {timings[0]:>14.2f} {timings[1]:>16.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Smistamento nelle viste: route_events (una passata, viste candidate per coppia
+venue/source_type) contro una list comprehension per vista (una passata per vista,
+come la vecchia Fase 4 di Lampugnano), al crescere del numero di viste.
+
+Esecuzione: python benchmark/bench_viste.py [--events 100000] [--views 1,10,50]
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bench_evento import make_events_json  # noqa: E402
+from evento import as_event_records  # noqa: E402
+from normalizzazione import VENUES  # noqa: E402
+from viste import compile_views, route_events  # noqa: E402
+
+SOURCE_TYPES = ['manual_from_file', 'discovered', 'ics_feed']
+
+
+def make_views(n):
+    """n viste per venue, fonte e anno (tutte diverse, la maggior parte selettive)."""
+    views = {}
+    venue_ids = list(VENUES)
+    for i in range(n):
+        year = 2025 + i % 10
+        views[f"vista_{i}"] = {'filter': {
+            'venue': venue_ids[i % len(venue_ids)],
+            'source_type': SOURCE_TYPES[(i // len(venue_ids)) % len(SOURCE_TYPES)],
+            'from': f"{year}-01-01", 'to': f"{year + 1}-01-01",
+        }}
+    return views
+
+
+def naive_route(records, views):
+    out = {}
+    for name, view in views.items():
+        flt = view['filter']
+        out[name] = [
+            rec for rec in records
+            if rec.venue_id == flt['venue'] and rec.get('source_type') == flt['source_type']
+            and flt['from'] <= rec.strong_signature[1] < flt['to']
+        ]
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--events', type=int, default=100000)
+    parser.add_argument('--views', default="1,10,50")
+    args = parser.parse_args()
+    records = as_event_records(json.loads(make_events_json(args.events)))
+    print(f"{args.events} eventi")
+    for n in (int(v) for v in args.views.split(',')):
+        views = make_views(n)
+        compiled = compile_views(views)
+        t0 = time.perf_counter()
+        routed = route_events(records, compiled)
+        t_route = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        expected = naive_route(records, views)
+        t_naive = time.perf_counter() - t0
+        assert routed == expected
+        print(f"  {n:>3} viste: route_events {t_route * 1000:7.1f} ms, una passata per vista {t_naive * 1000:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
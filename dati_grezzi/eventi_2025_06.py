@@ -1,146 +0,0 @@
-event_list = [
-    {
-        'summary': 'Justin Timberlake - The Forget Tomorrow World Tour',
-        'dtstart_str': '2025-06-02T21:00:00',
-        'dtend_str': '2025-06-02T23:30:00',
-        'location_name': 'Ippodromo SNAI San Siro',
-        'location_address': 'Piazzale dello Sport, 16, 20151 Milano MI, Italy',
-        'google_maps_url_str': 'https://www.google.com/maps/search/?api=1&query=Ippodromo+SNAI+San+Siro%2C+Piazzale+dello+Sport%2C+16%2C+20151+Milano+MI%2C+Italy',
-        'description': "Concerto di Justin Timberlake per il suo 'The Forget Tomorrow World Tour'. Evento parte degli I-Days Milano Coca-Cola."
-    },
-    {
-        'summary': 'Dua Lipa - I-Days Milano',
-        'dtstart_str': '2025-06-07T20:30:00',
-        'dtend_str': '2025-06-07T23:00:00',
-        'location_name': 'Ippodromo SNAI La Maura',
-        'location_address': 'Via Lampugnano, 95, 20151 Milano MI, Italy',
-        'google_maps_url_str': 'https://www.google.com/maps/search/?api=1&query=Ippodromo+SNAI+La+Maura%2C+Via+Lampugnano%2C+95%2C+20151+Milano+MI%2C+Italy',
-        'description': "Concerto di Dua Lipa nell'ambito del festival I-Days Milano Coca-Cola."
-    },
-    {
-        'summary': 'Elodie - Stadio San Siro',
-        'dtstart_str': '2025-06-08T21:00:00',
-        'dtend_str': '2025-06-08T23:30:00',
-        'location_name': 'Stadio San Siro (Giuseppe Meazza)',
-        'location_address': 'Piazzale Angelo Moratti, 20151 Milano MI, Italy',
-        'google_maps_url_str': 'https://www.google.com/maps/search/?api=1&query=Stadio+San+Siro%2C+Piazzale+Angelo+Moratti%2C+20151+Milano+MI%2C+Italy',
-        'description': "Concerto di Elodie allo Stadio San Siro."
-    },
-    {
-        'summary': 'Pinguini Tattici Nucleari - Hello World Tour Stadi 2025',
-        'dtstart_str': '2025-06-10T21:00:00',
-        'dtend_str': '2025-06-10T23:45:00',
-        'location_name': 'Stadio San Siro (Giuseppe Meazza)',
-        'location_address': 'Piazzale Angelo Moratti, 20151 Milano MI, Italy',
-        'google_maps_url_str': 'https://www.google.com/maps/search/?api=1&query=Stadio+San+Siro%2C+Piazzale+Angelo+Moratti%2C+20151+Milano+MI%2C+Italy',
-        'description': "Prima data dei Pinguini Tattici Nucleari allo Stadio San Siro per il loro 'Hello World Tour Stadi 2025'."
-    },
-    {
-        'summary': 'Pinguini Tattici Nucleari - Hello World Tour Stadi 2025',
-        'dtstart_str': '2025-06-11T21:00:00',
-        'dtend_str': '2025-06-11T23:45:00',
-        'location_name': 'Stadio San Siro (Giuseppe Meazza)',
-        'location_address': 'Piazzale Angelo Moratti, 20151 Milano MI, Italy',
-        'google_maps_url_str': 'https://www.google.com/maps/search/?api=1&query=Stadio+San+Siro%2C+Piazzale+Angelo+Moratti%2C+20151+Milano+MI%2C+Italy',
-        'description': "Seconda data dei Pinguini Tattici Nucleari allo Stadio San Siro per il loro 'Hello World Tour Stadi 2025'."
-    },
-    {
-        'summary': 'Modà',
-        'dtstart_str': '2025-06-12T21:00:00',
-        'dtend_str': '2025-06-12T23:45:00',
-        'location_name': 'Stadio San Siro (Giuseppe Meazza)',
-        'location_address': 'Piazzale Angelo Moratti, 20151 Milano MI, Italy',
-        'google_maps_url_str': 'https://www.google.com/maps/search/?api=1&query=Stadio+San+Siro%2C+Piazzale+Angelo+Moratti%2C+20151+Milano+MI%2C+Italy',
-        'description': "Modà allo Stadio San Siro per il loro 'Hello World Tour Stadi 2025'."
-    },
-    {
-        'summary': 'Cesare Cremonini - Stadi 2025 (Data 1)',
-        'dtstart_str': '2025-06-15T21:00:00',
-        'dtend_str': '2025-06-15T23:45:00',
-        'location_name': 'Stadio San Siro (Giuseppe Meazza)',
-        'location_address': 'Piazzale Angelo Moratti, 20151 Milano MI, Italy',
-        'google_maps_url_str': 'https://www.google.com/maps/search/?api=1&query=Stadio+San+Siro%2C+Piazzale+Angelo+Moratti%2C+20151+Milano+MI%2C+Italy',
-        'description': "Prima data del concerto di Cesare Cremonini allo Stadio San Siro."
-    },
-    {
-        'summary': 'Cesare Cremonini - Stadi 2025 (Data 2 - Ipotizzata)',
-        'dtstart_str': '2025-06-16T21:00:00', # Data ipotizzata, orario ipotizzato
-        'dtend_str': '2025-06-16T23:45:00',   # Orario ipotizzato
-        'location_name': 'Stadio San Siro (Giuseppe Meazza)',
-        'location_address': 'Piazzale Angelo Moratti, 20151 Milano MI, Italy',
-        'google_maps_url_str': 'https://www.google.com/maps/search/?api=1&query=Stadio+San+Siro%2C+Piazzale+Angelo+Moratti%2C+20151+Milano+MI%2C+Italy',
-        'description': "Seconda data (ipotizzata) del concerto di Cesare Cremonini allo Stadio San Siro."
-    },
-    {
-        'summary': 'Elisa - Concerto Stadio San Siro',
-        'dtstart_str': '2025-06-18T21:00:00',
-        'dtend_str': '2025-06-18T23:30:00',
-        'location_name': 'Stadio San Siro (Giuseppe Meazza)',
-        'location_address': 'Piazzale Angelo Moratti, 20151 Milano MI, Italy',
-        'google_maps_url_str': 'https://www.google.com/maps/search/?api=1&query=Stadio+San+Siro%2C+Piazzale+Angelo+Moratti%2C+20151+Milano+MI%2C+Italy',
-        'description': "Concerto di Elisa allo Stadio San Siro."
-    },
-    {
-        'summary': 'Duran Duran - I-Days Milano',
-        'dtstart_str': '2025-06-20T21:00:00',
-        'dtend_str': '2025-06-20T23:30:00',
-        'location_name': 'Ippodromo SNAI San Siro',
-        'location_address': 'Piazzale dello Sport, 16, 20151 Milano MI, Italy',
-        'google_maps_url_str': 'https://www.google.com/maps/search/?api=1&query=Ippodromo+SNAI+San+Siro%2C+Piazzale+dello+Sport%2C+16%2C+20151+Milano+MI%2C+Italy',
-        'description': "Concerto dei Duran Duran, parte degli I-Days Milano Coca-Cola."
-    },
-    {
-        'summary': 'Gazzelle - Stadio San Siro',
-        'dtstart_str': '2025-06-22T21:00:00',
-        'dtend_str': '2025-06-22T23:30:00',
-        'location_name': 'Stadio San Siro (Giuseppe Meazza)',
-        'location_address': 'Piazzale Angelo Moratti, 20151 Milano MI, Italy',
-        'google_maps_url_str': 'https://www.google.com/maps/search/?api=1&query=Stadio+San+Siro%2C+Piazzale+Angelo+Moratti%2C+20151+Milano+MI%2C+Italy',
-        'description': "Concerto di Gazzelle allo Stadio San Siro."
-    },
-    {
-        'summary': 'Linkin Park - I-Days Milano',
-        'dtstart_str': '2025-06-24T20:30:00',
-        'dtend_str': '2025-06-24T23:00:00',
-        'location_name': 'Ippodromo SNAI La Maura',
-        'location_address': 'Via Lampugnano, 95, 20151 Milano MI, Italy',
-        'google_maps_url_str': 'https://www.google.com/maps/search/?api=1&query=Ippodromo+SNAI+La+Maura%2C+Via+Lampugnano%2C+95%2C+20151+Milano+MI%2C+Italy',
-        'description': "Concerto dei Linkin Park (o della loro attuale formazione) al festival I-Days Milano Coca-Cola."
-    },
-    {
-        'summary': 'Marracash - Stadi 2025',
-        'dtstart_str': '2025-06-25T21:00:00',
-        'dtend_str': '2025-06-25T23:30:00',
-        'location_name': 'Stadio San Siro (Giuseppe Meazza)',
-        'location_address': 'Piazzale Angelo Moratti, 20151 Milano MI, Italy',
-        'google_maps_url_str': 'https://www.google.com/maps/search/?api=1&query=Stadio+San+Siro%2C+Piazzale+Angelo+Moratti%2C+20151+Milano+MI%2C+Italy',
-        'description': "Concerto di Marracash allo Stadio San Siro."
-    },
-    {
-        'summary': 'Gabry Ponte - Stadio San Siro',
-        'dtstart_str': '2025-06-28T21:00:00',
-        'dtend_str': '2025-06-28T23:59:00',
-        'location_name': 'Stadio San Siro (Giuseppe Meazza)',
-        'location_address': 'Piazzale Angelo Moratti, 20151 Milano MI, Italy',
-        'google_maps_url_str': 'https://www.google.com/maps/search/?api=1&query=Stadio+San+Siro%2C+Piazzale+Angelo+Moratti%2C+20151+Milano+MI%2C+Italy',
-        'description': "Evento dance con Gabry Ponte allo Stadio San Siro."
-    },
-    {
-        'summary': 'Bruce Springsteen and The E Street Band',
-        'dtstart_str': '2025-06-30T20:30:00',
-        'dtend_str': '2025-06-30T23:59:00',
-        'location_name': 'Stadio San Siro (Giuseppe Meazza)',
-        'location_address': 'Piazzale Angelo Moratti, 20151 Milano MI, Italy',
-        'google_maps_url_str': 'https://www.google.com/maps/search/?api=1&query=Stadio+San+Siro%2C+Piazzale+Angelo+Moratti%2C+20151+Milano+MI%2C+Italy',
-        'description': "Prima data del concerto di Bruce Springsteen and The E Street Band allo Stadio San Siro."
-    },
-    {
-        'summary': 'Marracash - Marra Stadi25 (Data 2)',
-        'dtstart_str': '2025-06-26T21:00:00', # Orario ipotizzato, tipico per concerti a San Siro
-        'dtend_str': '2025-06-26T23:30:00',   # Orario ipotizzato
-        'location_name': 'Stadio San Siro (Giuseppe Meazza)',
-        'location_address': 'Piazzale Angelo Moratti, 20151 Milano MI, Italy',
-        'google_maps_url_str': 'https://www.google.com/maps/search/?api=1&query=Stadio+San+Siro%2C+Piazzale+Angelo+Moratti%2C+20151+Milano+MI%2C+Italy',
-        'description': "Seconda data del concerto di Marracash allo Stadio San Siro per il tour 'Marra Stadi25'."
-    }
-]
@@ -1,84 +0,0 @@
-# dati_grezzi/eventi_2025_07.py
-event_list = [
-    {
-        'summary': 'Bruce Springsteen and The E Street Band (Data 2)',
-        'dtstart_str': '2025-07-03T20:30:00', # Orario ipotizzato
-        'dtend_str': '2025-07-03T23:59:00',   # Orario ipotizzato
-        'location_name': 'Stadio San Siro (Giuseppe Meazza)',
-        'location_address': 'Piazzale Angelo Moratti, 20151 Milano MI, Italy',
-        'google_maps_url_str': 'https://www.google.com/maps/search/?api=1&query=Stadio+San+Siro%2C+Piazzale+Angelo+Moratti%2C+20151+Milano+MI%2C+Italy',
-        'description': "Seconda data del concerto di Bruce Springsteen and The E Street Band allo Stadio San Siro."
-    },
-    {
-        'summary': 'Ultimo - Stadi 2025 (Data 1)',
-        'dtstart_str': '2025-07-05T21:00:00', # Orario ipotizzato
-        'dtend_str': '2025-07-05T23:45:00',   # Orario ipotizzato
-        'location_name': 'Stadio San Siro (Giuseppe Meazza)',
-        'location_address': 'Piazzale Angelo Moratti, 20151 Milano MI, Italy',
-        'google_maps_url_str': 'https://www.google.com/maps/search/?api=1&query=Stadio+San+Siro%2C+Piazzale+Angelo+Moratti%2C+20151+Milano+MI%2C+Italy',
-        'description': "Prima data del concerto di Ultimo allo Stadio San Siro."
-    },
-    {
-        'summary': 'Ultimo - Stadi 2025 (Data 2)',
-        'dtstart_str': '2025-07-07T21:00:00', # Orario ipotizzato (alcune fonti dicono 6, altre 7, metto il 7 per ora)
-        'dtend_str': '2025-07-07T23:45:00',   # Orario ipotizzato
-        'location_name': 'Stadio San Siro (Giuseppe Meazza)',
-        'location_address': 'Piazzale Angelo Moratti, 20151 Milano MI, Italy',
-        'google_maps_url_str': 'https://www.google.com/maps/search/?api=1&query=Stadio+San+Siro%2C+Piazzale+Angelo+Moratti%2C+20151+Milano+MI%2C+Italy',
-        'description': "Seconda data del concerto di Ultimo allo Stadio San Siro."
-    },
-    {
-        'summary': 'Marco Mengoni - Marco Negli Stadi (Data 1)',
-        'dtstart_str': '2025-07-13T21:00:00', # Orario ipotizzato
-        'dtend_str': '2025-07-13T23:30:00',   # Orario ipotizzato
-        'location_name': 'Stadio San Siro (Giuseppe Meazza)',
-        'location_address': 'Piazzale Angelo Moratti, 20151 Milano MI, Italy',
-        'google_maps_url_str': 'https://www.google.com/maps/search/?api=1&query=Stadio+San+Siro%2C+Piazzale+Angelo+Moratti%2C+20151+Milano+MI%2C+Italy',
-        'description': "Prima data del concerto di Marco Mengoni allo Stadio San Siro."
-    },
-    {
-        'summary': 'Marco Mengoni - Marco Negli Stadi (Data 2)',
-        'dtstart_str': '2025-07-14T21:00:00', # Orario ipotizzato
-        'dtend_str': '2025-07-14T23:30:00',   # Orario ipotizzato
-        'location_name': 'Stadio San Siro (Giuseppe Meazza)',
-        'location_address': 'Piazzale Angelo Moratti, 20151 Milano MI, Italy',
-        'google_maps_url_str': 'https://www.google.com/maps/search/?api=1&query=Stadio+San+Siro%2C+Piazzale+Angelo+Moratti%2C+20151+Milano+MI%2C+Italy',
-        'description': "Seconda data del concerto di Marco Mengoni allo Stadio San Siro."
-    },
-    {
-        'summary': 'Olivia Rodrigo - GUTS World Tour - I-Days Milano',
-        'dtstart_str': '2025-07-15T20:30:00', # Orario ipotizzato
-        'dtend_str': '2025-07-15T23:00:00',   # Orario ipotizzato
-        'location_name': 'Ippodromo SNAI La Maura', # Fonti indicano La Maura per questo evento I-Days
-        'location_address': 'Via Lampugnano, 95, 20151 Milano MI, Italy',
-        'google_maps_url_str': 'https://www.google.com/maps/search/?api=1&query=Ippodromo+SNAI+La+Maura%2C+Via+Lampugnano%2C+95%2C+20151+Milano+MI%2C+Italy',
-        'description': "Concerto di Olivia Rodrigo, parte degli I-Days Milano Coca-Cola."
-    },
-    {
-        'summary': 'The Who - I-Days Milano',
-        'dtstart_str': '2025-07-20T20:30:00', # Orario ipotizzato
-        'dtend_str': '2025-07-20T23:00:00',   # Orario ipotizzato
-        'location_name': 'Ippodromo SNAI San Siro', # Da confermare se San Siro o La Maura, spesso variabile per I-Days
-        'location_address': 'Piazzale dello Sport, 16, 20151 Milano MI, Italy',
-        'google_maps_url_str': 'https://www.google.com/maps/search/?api=1&query=Ippodromo+SNAI+San+Siro%2C+Piazzale+dello+Sport%2C+16%2C+20151+Milano+MI%2C+Italy',
-        'description': "Concerto dei The Who, parte degli I-Days Milano Coca-Cola."
-    },
-    {
-        'summary': 'Thirty Seconds To Mars - Seasons World Tour 2025', # Aggiunto nome tour
-        'dtstart_str': '2025-07-02T21:00:00', # Orario ipotizzato (Ho visto questo anche il 2 luglio in alcune ricerche precedenti)
-        'dtend_str': '2025-07-02T23:30:00',   # Orario ipotizzato
-        'location_name': 'Ippodromo SNAI San Siro',
-        'location_address': 'Piazzale dello Sport, 16, 20151 Milano MI, Italy',
-        'google_maps_url_str': 'https://www.google.com/maps/search/?api=1&query=Ippodromo+SNAI+San+Siro%2C+Piazzale+dello+Sport%2C+16%2C+20151+Milano+MI%2C+Italy',
-        'description': "Concerto dei Thirty Seconds To Mars."
-    },
-    {
-    'summary': 'Lazza - Concerto Ippodromo La Maura',
-    'dtstart_str': '2025-07-09T21:00:00', # Orario ipotizzato, da verificare se possibile
-    'dtend_str': '2025-07-09T23:30:00',   # Orario ipotizzato
-    'location_name': 'Ippodromo SNAI La Maura',
-    'location_address': 'Via Lampugnano, 95, 20151 Milano MI, Italy',
-    'google_maps_url_str': 'https://www.google.com/maps/search/?api=1&query=Ippodromo+SNAI+La+Maura%2C+Via+Lampugnano%2C+95%2C+20151+Milano+MI%2C+Italy',
-    'description': "Concerto di Lazza all'Ippodromo SNAI La Maura."
-    }
-]
@@ -1,41 +0,0 @@
-# dati_grezzi/eventi_2025_08.py
-event_list = [
-    {
-        'source_type': 'manual_from_file',
-        'summary': 'AC Milan - Cremonese', # MODIFICATO
-        'dtstart_str': '2025-08-23T20:45:00',
-        # ... resto dei campi ...
-    },
-    {
-        'source_type': 'manual_from_file',
-        'summary': 'Inter - Torino', # Già corretto
-        'dtstart_str': '2025-08-25T20:45:00',
-        # ... resto dei campi ...
-    },
-    {
-        'source_type': 'manual_from_file',
-        'summary': 'Inter - Udinese', # Già corretto
-        'dtstart_str': '2025-08-31T20:45:00',
-        # ... resto dei campi ...
-    },
-    {
-        'summary': 'BLACKPINK - BORN PINK World Tour ENCORE', # Aggiunto nome tour
-        'dtstart_str': '2025-08-06T20:30:00', # Orario ipotizzato
-        'dtend_str': '2025-08-06T23:00:00',   # Orario ipotizzato
-        'location_name': 'Ippodromo SNAI La Maura',
-        'location_address': 'Via Lampugnano, 95, 20151 Milano MI, Italy',
-        'google_maps_url_str': 'https://www.google.com/maps/search/?api=1&query=Ippodromo+SNAI+La+Maura%2C+Via+Lampugnano%2C+95%2C+20151+Milano+MI%2C+Italy',
-        'description': "Concerto delle BLACKPINK."
-    },
-    {
-        'summary': 'Post Malone - I-Days Milano',
-        'dtstart_str': '2025-08-27T20:30:00', # Orario ipotizzato
-        'dtend_str': '2025-08-27T23:00:00',   # Orario ipotizzato
-        'location_name': 'Ippodromo SNAI San Siro',
-        'location_address': 'Piazzale dello Sport, 16, 20151 Milano MI, Italy',
-        'google_maps_url_str': 'https://www.google.com/maps/search/?api=1&query=Ippodromo+SNAI+San+Siro%2C+Piazzale+dello+Sport%2C+16%2C+20151+Milano+MI%2C+Italy',
-        'description': "Concerto di Post Malone, parte degli I-Days Milano Coca-Cola."
-    }
-    # Agosto è spesso più tranquillo per i grandissimi eventi negli stadi/ippodromi principali
-    # a causa delle ferie estive, ma potrebbero esserci eventi minori o annunci successivi.
-]
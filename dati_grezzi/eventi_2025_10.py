@@ -1,23 +0,0 @@
-# dati_grezzi/eventi_2025_10.py
-event_list = [
-    # Eventi Ippici (se di interesse, altrimenti rimuovi)
-    {
-        'summary': 'Premio Cumani – Premio Verziere – Premio del Piazzale',
-        'dtstart_str': '2025-10-12T14:00:00', # Orario tipico per corse diurne
-        'dtend_str': '2025-10-12T18:00:00',
-        'location_name': 'Ippodromo SNAI San Siro',
-        'location_address': 'Piazzale dello Sport, 16, 20151 Milano MI, Italy',
-        'google_maps_url_str': 'https://www.google.com/maps/search/?api=1&query=Ippodromo+SNAI+San+Siro%2C+Piazzale+dello+Sport%2C+16%2C+20151+Milano+MI%2C+Italy',
-        'description': "Importante giornata di corse ippiche all'Ippodromo SNAI San Siro."
-    },
-    {
-        'summary': 'Premio C. Porta – Jockey Club – Premio Dormello',
-        'dtstart_str': '2025-10-19T14:00:00', # Orario tipico
-        'dtend_str': '2025-10-19T18:00:00',
-        'location_name': 'Ippodromo SNAI San Siro',
-        'location_address': 'Piazzale dello Sport, 16, 20151 Milano MI, Italy',
-        'google_maps_url_str': 'https://www.google.com/maps/search/?api=1&query=Ippodromo+SNAI+San+Siro%2C+Piazzale+dello+Sport%2C+16%2C+20151+Milano+MI%2C+Italy',
-        'description': "Altra importante giornata di corse ippiche all'Ippodromo SNAI San Siro."
-    }
-    # La stagione calcistica dovrebbe essere in corso, i feed Inter/Milan dovrebbero popolarla.
-]
@@ -0,0 +1,296 @@
+"""Eventi dai dati strutturati di una pagina: JSON-LD e microdata schema.org, link iCal.
+
+Molte pagine di biglietterie e venue descrivono i loro eventi con schema.org `Event`
+(o sottotipi: MusicEvent, SportsEvent, Festival...). parse_structured_data() li legge
+in una sola passata dell'HTML (html.parser della libreria standard) e li restituisce
+gia' nel formato di discovered/ (summary, dtstart_str, dtend_str, location_name...),
+insieme ai link a calendari .ics/webcal trovati nella pagina; events_from_ical()
+converte uno di quei calendari nello stesso formato. discover_eventi.py chiama il
+modello solo per le pagine in cui non trova niente di strutturato.
+
+- Le date con fuso sono portate in ora di Roma; una data senza ora diventa le
+  DEFAULT_START_TIME (come per easypark24) con confidence "medium".
+- La location passa da resolve_venue(): se e' una venue del registro si usano nome e
+  indirizzo canonici, altrimenti resta il nome della pagina (filter_and_dedup la scarta se non e' in zona).
+- Gli eventi cancellati o rinviati (eventStatus, STATUS:CANCELLED) sono ignorati.
+
+Nessuna rete e nessun log qui: chi chiama scarica le pagine e i calendari e decide
+cosa stampare (i blocchi JSON-LD illeggibili sono contati in `invalid_blocks`).
+"""
+
+from __future__ import annotations
+
+import html
+import json
+import re
+from datetime import date, datetime
+from html.parser import HTMLParser
+from typing import NamedTuple
+from urllib.parse import urljoin, urlparse
+
+from icalendar import Calendar
+
+from evento import DATETIME_FORMAT, TARGET_TIMEZONE_OBJ
+from normalizzazione import VENUES, resolve_venue
+from ricorrenze import expand_vevents
+
+DEFAULT_START_TIME = "21:00:00"
+MAX_ICAL_LINKS = 3  # calendari .ics scaricati al massimo per pagina
+
+_VOID_TAGS = frozenset(("area", "base", "br", "col", "embed", "hr", "img", "input",
+                        "link", "meta", "param", "source", "track", "wbr"))
+_SKIPPED_STATUSES = ("EventCancelled", "EventPostponed")
+_WHITESPACE_RE = re.compile(r"\s+")
+_JSON_LD_WRAPPER_RE = re.compile(r"^\s*(?:<!--|//\s*<!\[CDATA\[)|(?:-->|//\s*\]\]>)\s*$")
+
+
+class StructuredData(NamedTuple):
+    events: list[dict]
+    ical_urls: list[str]
+    invalid_blocks: int
+
+
+def _is_event_type(types) -> bool:
+    if isinstance(types, str):
+        types = [types]
+    if not isinstance(types, list):
+        return False
+    for t in types:
+        name = str(t).rstrip("/").rsplit("/", 1)[-1]
+        if name.endswith("Event") or name == "Festival":
+            return True
+    return False
+
+
+def _first(value):
+    return value[0] if isinstance(value, list) and value else value
+
+
+def _text(value) -> str:
+    value = _first(value)
+    if isinstance(value, dict):
+        value = value.get("name") or value.get("@value") or ""
+    if not isinstance(value, (str, int, float)):
+        return ""
+    return _WHITESPACE_RE.sub(" ", html.unescape(str(value))).strip()
+
+
+def _local(value) -> tuple[str, bool] | None:
+    """date/datetime (o stringa ISO 8601) -> ('YYYY-MM-DDTHH:MM:SS' in ora di Roma, ha_ora)."""
+    if isinstance(value, str):
+        value = value.strip()
+        try:
+            value = datetime.fromisoformat(value) if "T" in value or " " in value else date.fromisoformat(value)
+        except ValueError:
+            return None
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(TARGET_TIMEZONE_OBJ).replace(tzinfo=None)
+        return value.strftime(DATETIME_FORMAT), True
+    if isinstance(value, date):
+        return f"{value.isoformat()}T{DEFAULT_START_TIME}", False
+    return None
+
+
+def _location_parts(location) -> list[str]:
+    location = _first(location)
+    if isinstance(location, str):
+        return [_text(location)]
+    if not isinstance(location, dict):
+        return []
+    parts = [_text(location.get("name"))]
+    address = _first(location.get("address"))
+    if isinstance(address, dict):
+        parts += [_text(address.get(key)) for key in ("streetAddress", "postalCode", "addressLocality")]
+    else:
+        parts.append(_text(address))
+    return [p for p in parts if p]
+
+
+def make_event(summary, start, end, location_parts, source_label) -> dict | None:
+    """Evento nel formato di discovered/ (None se mancano titolo o inizio validi)."""
+    summary = _text(summary)[:200]
+    start = _local(start)
+    if len(summary) < 3 or start is None:
+        return None
+    dtstart_str, has_time = start
+    venue_id = resolve_venue(" ".join(location_parts))
+    if venue_id:
+        location_name, location_address = VENUES[venue_id]["name"], VENUES[venue_id]["address"]
+    else:
+        location_name = location_parts[0] if location_parts else ""
+        location_address = ", ".join(location_parts[1:])
+    event = {"summary": summary, "dtstart_str": dtstart_str}
+    end = _local(end) if end else None
+    if end is not None and end[1] and end[0] > dtstart_str:
+        event["dtend_str"] = end[0]
+    event["location_name"] = location_name[:200]
+    if location_address:
+        event["location_address"] = location_address[:300]
+    event["description"] = f"Fonte: {source_label}."[:1000]
+    event["confidence"] = "high" if has_time and venue_id else "medium"
+    return event
+
+
+def _event_from_schema(obj: dict, source_label: str) -> dict | None:
+    if str(_first(obj.get("eventStatus")) or "").rstrip("/").endswith(_SKIPPED_STATUSES):
+        return None
+    return make_event(obj.get("name"), _first(obj.get("startDate")), _first(obj.get("endDate")),
+                      _location_parts(obj.get("location")), source_label)
+
+
+def _walk_schema(node, out: list[dict], source_label: str) -> None:
+    """Cerca gli Event ovunque nel JSON-LD (@graph, ItemList, subEvent...)."""
+    if isinstance(node, list):
+        for child in node:
+            _walk_schema(child, out, source_label)
+    elif isinstance(node, dict):
+        if _is_event_type(node.get("@type")):
+            event = _event_from_schema(node, source_label)
+            if event is not None:
+                out.append(event)
+        for key, child in node.items():
+            if key != "location" and isinstance(child, (list, dict)):
+                _walk_schema(child, out, source_label)
+
+
+def _microdata_as_schema(item: dict) -> dict:
+    """Item microdata -> dict in stile JSON-LD (primo valore di ogni proprieta')."""
+    obj = {"@type": item["type"]}
+    for name, values in item["props"].items():
+        value = values[0]
+        obj[name] = _microdata_as_schema(value) if isinstance(value, dict) else value
+    return obj
+
+
+def _is_ical_link(href: str, mime: str | None) -> bool:
+    if (mime or "").lower().startswith("text/calendar") or href.lower().startswith("webcal:"):
+        return True
+    return urlparse(href).path.lower().endswith(".ics")
+
+
+class _StructuredDataParser(HTMLParser):
+    """Una passata sull'HTML: testi dei blocchi JSON-LD, item microdata di primo livello
+    (annidati come valori delle proprieta') e link iCal."""
+
+    def __init__(self, base_url: str) -> None:
+        super().__init__(convert_charrefs=True)
+        self.base_url = base_url
+        self.json_ld: list[str] = []
+        self.items: list[dict] = []
+        self.ical_urls: list[str] = []
+        self._json_ld_parts: list[str] | None = None
+        self._in_script = False
+        self._stack: list[list] = []  # [tag, item, itemprop, parti di testo, valore]
+        self._capturing = 0  # quanti frame nello stack raccolgono testo
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag in ("script", "style"):
+            self._in_script = True
+            if tag == "script" and "ld+json" in (attrs.get("type") or "").lower():
+                self._json_ld_parts = []
+            return
+        href = attrs.get("href")
+        if href and tag in ("a", "link") and _is_ical_link(href, attrs.get("type")):
+            url = urljoin(self.base_url, re.sub(r"^webcal:", "https:", href.strip(), flags=re.I))
+            if url not in self.ical_urls:
+                self.ical_urls.append(url)
+        props = (attrs.get("itemprop") or "").split()
+        item = {"type": (attrs.get("itemtype") or "").split(), "props": {}} if "itemscope" in attrs else None
+        if tag in _VOID_TAGS:
+            if props and item is None:
+                self._add_props(props, attrs.get("content") or attrs.get("href") or attrs.get("src") or "")
+            return
+        value = None
+        if props and item is None:
+            value = attrs.get("content") or (attrs.get("datetime") if tag == "time" else None)
+        parts = [] if props and item is None and value is None else None
+        self._capturing += parts is not None
+        self._stack.append([tag, item, props, parts, value])
+
+    def handle_endtag(self, tag):
+        if tag in ("script", "style"):
+            if self._json_ld_parts is not None:
+                self.json_ld.append("".join(self._json_ld_parts))
+                self._json_ld_parts = None
+            self._in_script = False
+            return
+        for i in range(len(self._stack) - 1, -1, -1):
+            if self._stack[i][0] == tag:
+                break
+        else:
+            return  # tag di chiusura senza apertura: ignorato
+        while len(self._stack) > i:
+            self._close(self._stack.pop())
+
+    def handle_data(self, data):
+        if self._json_ld_parts is not None:
+            self._json_ld_parts.append(data)
+        elif self._capturing and not self._in_script:
+            for frame in self._stack:
+                if frame[3] is not None:
+                    frame[3].append(data)
+
+    def close(self):
+        super().close()
+        while self._stack:
+            self._close(self._stack.pop())
+
+    def _close(self, frame):
+        _tag, item, props, parts, value = frame
+        if parts is not None:
+            self._capturing -= 1
+        if item is not None:
+            if props:
+                self._add_props(props, item)
+            else:
+                self.items.append(item)
+        elif props:
+            self._add_props(props, value if value is not None else " ".join("".join(parts).split()))
+
+    def _add_props(self, names, value):
+        for frame in reversed(self._stack):
+            if frame[1] is not None:
+                for name in names:
+                    frame[1]["props"].setdefault(name, []).append(value)
+                return
+
+
+def parse_structured_data(page_html: str, base_url: str) -> StructuredData:
+    """Eventi JSON-LD + microdata della pagina, link iCal (assoluti, al massimo
+    MAX_ICAL_LINKS) e numero di blocchi JSON-LD non validi."""
+    parser = _StructuredDataParser(base_url)
+    parser.feed(page_html)
+    parser.close()
+    events: list[dict] = []
+    invalid = 0
+    for block in parser.json_ld:
+        try:
+            data = json.loads(_JSON_LD_WRAPPER_RE.sub("", block), strict=False)
+        except ValueError:
+            invalid += 1
+            continue
+        _walk_schema(data, events, "dati strutturati della pagina (JSON-LD schema.org)")
+    _walk_schema([_microdata_as_schema(item) for item in parser.items], events,
+                 "dati strutturati della pagina (microdata schema.org)")
+    return StructuredData(events, parser.ical_urls[:MAX_ICAL_LINKS], invalid)
+
+
+def events_from_ical(ics_text: str, ical_url: str, window_start, window_end) -> list[dict]:
+    """VEVENT di un calendario .ics nel formato di discovered/, con le serie espanse in
+    [window_start, window_end). Solleva ValueError se il calendario non e' leggibile."""
+    calendar = Calendar.from_ical(ics_text)
+    events = []
+    for component in expand_vevents(calendar.walk("VEVENT"), window_start, window_end):
+        if str(component.get("STATUS", "")).upper() == "CANCELLED" or component.get("DTSTART") is None:
+            continue
+        dtend = component.get("DTEND")
+        location = _text(str(component.get("LOCATION", "")))
+        event = make_event(str(component.get("SUMMARY", "")), component.get("DTSTART").dt,
+                           dtend.dt if dtend is not None else None,
+                           [p.strip() for p in location.split(",", 1)] if location else [],
+                           f"calendario iCal {ical_url}")
+        if event is not None:
+            events.append(event)
+    return events
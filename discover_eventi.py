@@ -1,52 +1,104 @@
 """Discovery automatica di eventi (concerti) in zona San Siro / Lampugnano / Ippodromo SNAI
 via GitHub Models. Output: file JSON in discovered/eventi_YYYY_MM.json.
 
-NON modifica i file Python in dati_grezzi/ direttamente. Il workflow di generazione
+NON modifica i file in dati_grezzi/ direttamente. Il workflow di generazione
 ICS legge entrambe le fonti; questo script si limita a proporre candidati nuovi.
 
-Esecuzione: python discover_eventi.py
+Esecuzione: python discover_eventi.py [--max-workers 8] [--budget-s 600]
 Variabili env richieste:
   GITHUB_TOKEN (o GH_MODELS_TOKEN) - PAT o token Actions con accesso a GitHub Models
+Opzionali:
+  GH_MODELS_ENDPOINT - endpoint chat/completions alternativo (es. un server locale di prova)
+
+Le fonti sono elaborate in parallelo (thread pool) con al massimo
+DISCOVERY_MAX_PER_HOST richieste per host (GH_MODELS_MAX_CONCURRENT verso il modello),
+un token bucket davanti all'endpoint del modello (GH_MODELS_REQUESTS_PER_MINUTE,
+raffiche fino a GH_MODELS_BURST) e un budget totale per il run: le fonti non completate entro il budget sono saltate. I risultati
+passano da filter_and_dedup nell'ordine di SOURCES, quindi l'output non dipende
+dall'ordine di completamento; anche i log di ogni fonte sono stampati in quell'ordine.
+
+Per le pagine con eventi schema.org (JSON-LD, microdata) o link iCal, gli eventi si
+leggono da li' (dati_strutturati.py) senza chiamare il modello.
 """
 
 from __future__ import annotations
 
+import argparse
 import hashlib
 import json
 import os
 import re
 import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime, date, timedelta
+from html.parser import HTMLParser
 from pathlib import Path
+from urllib.parse import urlparse
 
 import pytz
 import requests
-from bs4 import BeautifulSoup
 from jsonschema import Draft202012Validator
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+
+import rete
+from dati_strutturati import events_from_ical, parse_structured_data
+from normalizzazione import VENUES, create_event_signatures_batch, normalize_summary_for_signature, resolve_venue
+from sorgenti import SOURCE_CACHE_FILENAME, list_event_source_files, load_event_sources
 
 
 SCRIPT_DIR = Path(__file__).resolve().parent
 DISCOVERED_DIR = SCRIPT_DIR / "discovered"
 DATI_GREZZI_DIR = SCRIPT_DIR / "dati_grezzi"
 SCHEMA_PATH = DISCOVERED_DIR / "SCHEMA.json"
+SOURCE_CACHE_PATH = SCRIPT_DIR / ".cache" / SOURCE_CACHE_FILENAME  # condivisa col generatore
 
 TARGET_TIMEZONE = pytz.timezone("Europe/Rome")
 NOW = datetime.now(TARGET_TIMEZONE)
 WINDOW_DAYS = 180  # cerca eventi fino a 6 mesi nel futuro
 
-GH_MODELS_ENDPOINT = "https://models.github.ai/inference/chat/completions"
+GH_MODELS_ENDPOINT = os.environ.get("GH_MODELS_ENDPOINT") or "https://models.github.ai/inference/chat/completions"
 GH_MODELS_MODEL = "openai/gpt-4o-mini"
 GH_MODELS_MAX_TOKENS = 2000
+GH_MODELS_TIMEOUT_S = 60
+FETCH_TIMEOUT_S = 20  # pagine, API easypark24 e calendari .ics
+# Limiti del piano GitHub Models per i modelli "low" (gpt-4o-mini): 15 richieste/minuto,
+# 5 in parallelo. Il bucket parte pieno: le prime GH_MODELS_BURST partono subito.
+GH_MODELS_REQUESTS_PER_MINUTE = 15
+GH_MODELS_BURST = 5
+GH_MODELS_MAX_CONCURRENT = 5
+
+# Parole generiche che la discovery accetta come location in scope quando il testo non
+# cita un alias del registro VENUES (stessa regex e stesso ordine dei vecchi default di
+# indirizzo). Non sono alias: in normalizzazione.py sposterebbero eventi tra venue.
+DISCOVERY_VENUE_KEYWORDS = (
+    (re.compile(r"san\s*siro|meazza", re.IGNORECASE), "stadio-san-siro"),
+    (re.compile(r"la\s*maura|lampugnano", re.IGNORECASE), "la-maura"),
+    (re.compile(r"ippodromo", re.IGNORECASE), "ippodromo-san-siro"),
+)
+
+DISCOVERY_MAX_WORKERS = 8
+DISCOVERY_MAX_PER_HOST = 2
+DISCOVERY_BUDGET_S = 600
+# Le richieste (timeout e retry, vedi rete.py) finiscono questo margine prima del budget
+# (al massimo un decimo): il worker ha il tempo di elaborare l'ultima risposta.
+DISCOVERY_RESERVE_S = 5
+
+# Cache delle risposte del modello, indirizzata per contenuto (vedi LLMCache). Il
+# prompt chiede eventi fino a WINDOW_DAYS + LLM_CACHE_MAX_AGE_DAYS: una risposta
+# riusata entro LLM_CACHE_MAX_AGE_DAYS copre ancora tutta la finestra del run.
+LLM_CACHE_DIR = SCRIPT_DIR / ".cache" / "llm"  # persistita tra run da actions/cache
+LLM_CACHE_VERSION = 1  # da incrementare se cambia il formato delle voci
+LLM_CACHE_MAX_AGE_DAYS = 28
+LLM_CACHE_MAX_BYTES = 20 * 1024 * 1024
 
 # Fonti. Ogni fonte ha un 'type' che determina il parser:
 #   - easypark24_api: API JSON pubblica usata da sansiroparcheggi.it. Strutturata,
 #     niente LLM. Copre Stadio San Siro + Ippodromo SNAI La Maura + Ippodromo SNAI San Siro.
 #     Affidabile perche' la gente prenota il parcheggio sulla base degli eventi.
-#   - llm_html: HTML server-rendered passato a GitHub Models per estrazione.
-#     Fallback per fonti non strutturate.
+#   - llm_html: HTML server-rendered. Se la pagina ha eventi schema.org (JSON-LD,
+#     microdata) o link a calendari .ics si usano quelli (dati_strutturati.py);
+#     altrimenti il testo passa a GitHub Models per estrazione.
 SOURCES = [
     {
         "name": "easypark24-sansiroparcheggi",
@@ -56,42 +108,148 @@ SOURCES = [
     },
 ]
 
-# Mapping da PlaceEventDescr del feed easypark24 ai nostri (location_name, location_address) canonici.
-EASYPARK24_PLACE_MAP = {
-    "stadio san siro": (
-        "Stadio San Siro (Giuseppe Meazza)",
-        "Piazzale Angelo Moratti, 20151 Milano MI, Italy",
-    ),
-    "ippodromo snai san siro": (
-        "Ippodromo SNAI San Siro",
-        "Piazzale dello Sport 16, 20151 Milano MI, Italy",
-    ),
-    "ippodromo snai la maura": (
-        "Ippodromo SNAI La Maura",
-        "Via Lampugnano 95, 20151 Milano MI, Italy",
-    ),
-}
-
-LOCATION_REGEX = re.compile(
-    r"san\s*siro|meazza|lampugnano|la\s*maura|ippodromo",
-    re.IGNORECASE,
-)
+_log_buffer = threading.local()  # nei worker i log di una fonte si accumulano qui
 
 
 def log(msg: str) -> None:
-    print(f"[{datetime.now().isoformat(timespec='seconds')}] {msg}", flush=True)
+    line = f"[{datetime.now().isoformat(timespec='seconds')}] {msg}"
+    lines = getattr(_log_buffer, "lines", None)
+    if lines is not None:
+        lines.append(line)
+    else:
+        print(line, flush=True)
+
+
+class TokenBucket:
+    """Rate limiter thread-safe: `rate` gettoni al secondo, al massimo `burst` accumulati."""
+
+    def __init__(self, rate: float, burst: int) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self, deadline: float | None = None) -> bool:
+        """Prende un gettone, aspettando se serve. False (senza prenderlo) se non
+        arriverebbe prima di `deadline` (time.monotonic())."""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return True
+                delay = (1 - self.tokens) / self.rate
+            if deadline is not None and now + delay > deadline:
+                return False
+            time.sleep(delay)
+
+
+_HOST_SEMAPHORES: dict[str, threading.BoundedSemaphore] = {}
+_HOST_SEMAPHORES_LOCK = threading.Lock()
+
+
+def _host_semaphore(url: str, limit: int | None = None) -> threading.BoundedSemaphore:
+    host = urlparse(url).netloc.lower()
+    with _HOST_SEMAPHORES_LOCK:
+        if host not in _HOST_SEMAPHORES:
+            _HOST_SEMAPHORES[host] = threading.BoundedSemaphore(limit or DISCOVERY_MAX_PER_HOST)
+        return _HOST_SEMAPHORES[host]
+
+
+class LLMCache:
+    """Risposte JSON del modello su disco, una per file, con chiave llm_cache_key(): una
+    pagina con lo stesso testo ripulito di un run precedente non richiama il modello.
+    Le voci scadono LLM_CACHE_MAX_AGE_DAYS dopo l'estrazione; prune() toglie le scadute
+    e poi le piu' vecchie finche' il totale sta in max_bytes. Con refresh=True non
+    restituisce nulla ma salva comunque le risposte nuove. Thread-safe."""
+
+    def __init__(self, cache_dir: Path, max_age_days: int = LLM_CACHE_MAX_AGE_DAYS,
+                 max_bytes: int = LLM_CACHE_MAX_BYTES, refresh: bool = False) -> None:
+        self.cache_dir = cache_dir
+        self.refresh = refresh
+        self.max_age_days = max_age_days
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def _age_days(self, entry: dict) -> int:
+        return (NOW.date() - datetime.fromisoformat(entry["created"]).date()).days
+
+    def _load(self, key: str) -> dict | None:
+        if self.refresh:
+            return None
+        try:
+            entry = json.loads(self._path(key).read_text(encoding="utf-8"))
+            fresh = entry.get("key") == key and 0 <= self._age_days(entry) <= self.max_age_days
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            log(f"  WARN: voce della cache LLM {key[:12]} illeggibile, la ignoro: {e}")
+            return None
+        return entry if fresh else None
+
+    def get(self, key: str) -> dict | None:
+        entry = self._load(key)
+        with self.lock:
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return entry["response"] if entry is not None else None
+
+    def put(self, key: str, source_url: str, response: dict) -> None:
+        entry = {
+            "key": key,
+            "created": NOW.isoformat(timespec="seconds"),
+            "model": GH_MODELS_MODEL,
+            "source_url": source_url,
+            "response": response,
+        }
+        path = self._path(key)
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_text(json.dumps(entry, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp_path, path)
+        except Exception as e:
+            log(f"  WARN: impossibile salvare la risposta nella cache LLM: {e}")
+            tmp_path.unlink(missing_ok=True)
+
+    def prune(self) -> tuple[int, int, int]:
+        """Ritorna (voci rimaste, byte rimasti, voci rimosse)."""
+        entries = []
+        removed = 0
+        for path in self.cache_dir.glob("*.json") if self.cache_dir.is_dir() else []:
+            try:
+                entry = json.loads(path.read_text(encoding="utf-8"))
+                age = self._age_days(entry)
+            except Exception:
+                age = None
+            if age is None or not 0 <= age <= self.max_age_days:
+                path.unlink(missing_ok=True)
+                removed += 1
+            else:
+                entries.append((entry["created"], path.name, path, path.stat().st_size))
+        entries.sort()
+        total = sum(size for *_rest, size in entries)
+        while entries and total > self.max_bytes:
+            _created, _name, path, size = entries.pop(0)
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        return len(entries), total, removed
 
 
 def make_http_session() -> requests.Session:
-    s = requests.Session()
-    retry = Retry(
-        total=3,
-        backoff_factor=2,
-        status_forcelist=[500, 502, 503, 504],
-        allowed_methods=frozenset(["GET"]),
-    )
-    s.mount("https://", HTTPAdapter(max_retries=retry))
-    s.mount("http://", HTTPAdapter(max_retries=retry))
+    """Session per pagine e API; retry e timeout per richiesta in rete.get (entro il budget)."""
+    s = rete.retry_session(DISCOVERY_MAX_WORKERS)
     s.headers.update({
         "User-Agent": (
             "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
@@ -102,44 +260,156 @@ def make_http_session() -> requests.Session:
     return s
 
 
-def fetch_source_text(session: requests.Session, source: dict) -> str | None:
+def fetch_source_html(session: requests.Session, source: dict,
+                      deadline: float | None = None) -> str | None:
     url = source["url"]
     try:
-        r = session.get(url, timeout=20)
+        r = rete.get(session, url, deadline, FETCH_TIMEOUT_S)
         r.raise_for_status()
     except Exception as e:
         log(f"  ERRORE fetch {url}: {e}")
         return None
-    soup = BeautifulSoup(r.text, "html.parser")
-    # Rimuovo elementi non utili (rumore: chrome, navigazione, embed, cookie banner, ecc.)
-    for tag in soup(["script", "style", "noscript", "iframe", "header", "footer", "nav", "aside", "form"]):
-        tag.decompose()
-    # Rimuovo nodi con classi tipiche di banner/cookie/menu (snapshot per evitare
-    # mutazione concorrente durante decompose).
-    noise_keywords = ("cookie", "newsletter", "site-footer", "site-header",
-                      "share", "social", "advert", "banner-")
-    candidates = list(soup.find_all(True, class_=True))
-    for el in candidates:
-        if not el.attrs:
-            continue
-        classes = " ".join(el.get("class") or []).lower()
-        if any(k in classes for k in noise_keywords):
-            el.decompose()
-    root = soup.body or soup
-    text = root.get_text(separator=" ", strip=True)
-    text = re.sub(r"\s+", " ", text)
-    # Tronco a ~8000 caratteri (~2000 token) per non sporcare il prompt
-    if len(text) > 8000:
-        text = text[:8000] + " ...[truncated]"
+    return r.text
+
+
+def fetch_source_text(session: requests.Session, source: dict,
+                      deadline: float | None = None) -> str | None:
+    page_html = fetch_source_html(session, source, deadline)
+    return page_text(page_html) if page_html is not None else None
+
+
+PAGE_TEXT_MAX_CHARS = 8000  # ~2000 token: oltre si tronca per non sporcare il prompt
+PAGE_TEXT_CHUNK_CHARS = 16384  # l'HTML entra nel parser a blocchi per potersi fermare presto
+# Rumore: chrome, navigazione, embed, cookie banner, ecc. (sottoalberi interi)
+NOISE_TAGS = frozenset(("script", "style", "noscript", "iframe", "header", "footer", "nav", "aside", "form"))
+NOISE_CLASS_KEYWORDS = ("cookie", "newsletter", "site-footer", "site-header",
+                        "share", "social", "advert", "banner-")
+# Elementi senza chiusura (gli stessi di BeautifulSoup, inclusi quelli obsoleti)
+_VOID_TAGS = frozenset(("area", "base", "br", "col", "embed", "hr", "img", "input", "keygen",
+                        "link", "menuitem", "meta", "param", "source", "track", "wbr", "basefont",
+                        "bgsound", "command", "frame", "image", "isindex", "nextid", "spacer"))
+
+
+class _PageTextParser(HTMLParser):
+    """Testo visibile in streaming, senza costruire l'albero: salta i sottoalberi di
+    rumore (NOISE_TAGS o class con NOISE_CLASS_KEYWORDS) man mano che li incontra e
+    segnala `done` appena il testo supera `limit` caratteri o il <body> si chiude.
+
+    Il testo e' lo stesso che darebbe BeautifulSoup(html.parser) togliendo quei nodi e
+    poi get_text(" ", strip=True) sul <body> (su tutto il documento se non c'e'): le
+    stringhe sono i tratti di testo tra due tag, ognuna ripulita dagli spazi."""
+
+    def __init__(self, limit: int) -> None:
+        super().__init__(convert_charrefs=True)
+        self.limit = limit
+        self.done = False
+        self.pieces: list[str] = []  # testo del <body> (o di tutto, finche' il body non c'e')
+        self.length = -1  # len(" ".join(pieces))
+        self._data: list[str] = []  # tratto di testo corrente, non ancora chiuso da un tag
+        self._stack: list[str] = []
+        self._skip_depth: int | None = None  # profondita' del sottoalbero di rumore aperto
+        self._body_depth: int | None = None
+        self._body_seen = False
+        self._void_open: dict[str, int] = {}  # <br> & co. gia' chiusi: il loro </br> non conta
+
+    def _flush(self) -> None:
+        if not self._data:
+            return
+        piece = " ".join("".join(self._data).split())
+        self._data = []
+        if not piece or self._skip_depth is not None or self.done:
+            return
+        self.pieces.append(piece)
+        self.length += len(piece) + 1
+        if self.length > self.limit and self._body_depth is not None:
+            self.done = True  # troncamento certo: il resto della pagina non serve
+
+    def handle_starttag(self, tag, attrs):
+        self._flush()
+        if tag in _VOID_TAGS:
+            self._void_open[tag] = self._void_open.get(tag, 0) + 1
+            return
+        self._stack.append(tag)
+        if self._skip_depth is None:
+            # class ripetuta: vale l'ultima, come in BeautifulSoup
+            classes = " ".join((next((v for k, v in reversed(attrs) if k == "class"), None) or "").split()).lower()
+            if tag in NOISE_TAGS or (classes and any(k in classes for k in NOISE_CLASS_KEYWORDS)):
+                self._skip_depth = len(self._stack)
+        if tag == "body" and not self._body_seen and self._skip_depth is None:
+            # Il testo prima del <body> (title, ...) conta solo se il body non c'e'
+            self._body_seen = True
+            self._body_depth = len(self._stack)
+            self.pieces, self.length = [], -1
+
+    def handle_startendtag(self, tag, attrs):
+        if tag in _VOID_TAGS:
+            self._flush()
+        else:
+            self.handle_starttag(tag, attrs)
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if self._void_open.get(tag):
+            self._void_open[tag] -= 1
+            return
+        self._flush()
+        if tag not in self._stack:
+            return  # chiusura senza apertura: ignorata, come in BeautifulSoup
+        depth = len(self._stack) - self._stack[::-1].index(tag) - 1
+        del self._stack[depth:]
+        if self._skip_depth is not None and self._skip_depth > depth:
+            self._skip_depth = None
+        if self._body_depth is not None and self._body_depth > depth:
+            self._body_depth = None
+            self.done = True  # dopo il </body> non c'e' altro testo da prendere
+
+    def handle_data(self, data):
+        if self._skip_depth is None and not (self._body_seen and self._body_depth is None):
+            self._data.append(data)
+
+    def handle_comment(self, data):
+        self._flush()
+
+    def handle_decl(self, decl):
+        self._flush()
+
+    def handle_pi(self, data):
+        self._flush()
+
+    def unknown_decl(self, data):
+        self._flush()
+        if data.upper().startswith("CDATA["):  # <![CDATA[...]]> e' testo anche per BeautifulSoup
+            self.handle_data(data[6:])
+            self._flush()
+
+    def close(self):
+        super().close()
+        self._flush()
+
+
+def page_text(page_html: str) -> str:
+    """Testo visibile della pagina senza il rumore, troncato a PAGE_TEXT_MAX_CHARS
+    caratteri per il prompt. Il parsing si ferma appena il testo basta."""
+    parser = _PageTextParser(PAGE_TEXT_MAX_CHARS)
+    for start in range(0, len(page_html), PAGE_TEXT_CHUNK_CHARS):
+        parser.feed(page_html[start:start + PAGE_TEXT_CHUNK_CHARS])
+        if parser.done:
+            break
+    else:
+        parser.close()
+    text = " ".join(parser.pieces)
+    if len(text) > PAGE_TEXT_MAX_CHARS:
+        text = text[:PAGE_TEXT_MAX_CHARS] + " ...[truncated]"
     return text
 
 
-def extract_from_easypark24(session: requests.Session, source: dict) -> list[dict]:
+def extract_from_easypark24(session: requests.Session, source: dict,
+                            deadline: float | None = None) -> list[dict]:
     """Parser per webapi.easypark24.com. Restituisce eventi gia' nel formato finale
     (non passa per l'LLM). Affidabilita' alta perche' la fonte e' API JSON strutturata."""
     url = source["url"]
     try:
-        r = session.get(url, headers={"Accept": "application/json"}, timeout=20)
+        r = rete.get(session, url, deadline, FETCH_TIMEOUT_S, headers={"Accept": "application/json"})
         r.raise_for_status()
         data = r.json()
     except Exception as e:
@@ -168,16 +438,12 @@ def extract_from_easypark24(session: requests.Session, source: dict) -> list[dic
         summary = re.sub(r"\s*-\s*\d{1,2}/\d{1,2}/\d{4}\s*$", "", desc).strip()
         if not summary:
             continue
-        # Location: lookup canonical name + address
-        place_lower = place.lower()
-        loc_name, loc_addr = None, None
-        for key, (name, addr) in EASYPARK24_PLACE_MAP.items():
-            if key in place_lower:
-                loc_name, loc_addr = name, addr
-                break
-        if not loc_name:
+        # Location: PlaceEventDescr -> venue del registro (nome + indirizzo canonici)
+        venue_id = resolve_venue(place)
+        if not venue_id:
             log(f"    SKIP easypark24: place sconosciuto {place!r} per '{summary}'")
             continue
+        loc_name, loc_addr = VENUES[venue_id]["name"], VENUES[venue_id]["address"]
         # dtstart + dtend = dtstart + 2h30m (concerto tipico)
         if not re.match(r"^\d{2}:\d{2}(:\d{2})?$", time_str):
             time_str = "21:00:00"
@@ -203,10 +469,8 @@ def extract_from_easypark24(session: requests.Session, source: dict) -> list[dic
     return events
 
 
-def call_github_models(token: str, source_url: str, page_text: str) -> dict | None:
-    today_iso = NOW.date().isoformat()
-    horizon_iso = (NOW + timedelta(days=WINDOW_DAYS)).date().isoformat()
-    system_prompt = (
+def _system_prompt(today_iso: str, horizon_iso: str) -> str:
+    return (
         "Sei un estrattore di eventi pubblici. Riceverai il testo di una pagina web italiana "
         "e devi estrarre SOLO eventi che si svolgono in una di queste location di Milano:\n"
         "- Stadio San Siro / Stadio Giuseppe Meazza\n"
@@ -228,7 +492,30 @@ def call_github_models(token: str, source_url: str, page_text: str) -> dict | No
         "- Salta menu, footer, banner cookie, articoli generici senza data certa.\n"
         '- Se non trovi eventi validi, restituisci {"events": []}.'
     )
-    user_prompt = f"Pagina sorgente: {source_url}\n\nTesto:\n{page_text}"
+
+
+def _user_prompt(source_url: str, page_text: str) -> str:
+    return f"Pagina sorgente: {source_url}\n\nTesto:\n{page_text}"
+
+
+def llm_cache_key(source_url: str, page_text: str) -> str:
+    """sha256 di tutto cio' che decide la risposta del modello: modello e parametri,
+    prompt (con le date come segnaposto: la finestra e' fissata dalle sue durate) e
+    testo ripulito della pagina."""
+    material = json.dumps([
+        LLM_CACHE_VERSION, GH_MODELS_MODEL, GH_MODELS_MAX_TOKENS,
+        WINDOW_DAYS, LLM_CACHE_MAX_AGE_DAYS,
+        _system_prompt("{oggi}", "{orizzonte}"), _user_prompt(source_url, page_text),
+    ], ensure_ascii=False)
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def call_github_models(token: str, source_url: str, page_text: str,
+                       deadline: float | None = None) -> dict | None:
+    today_iso = NOW.date().isoformat()
+    horizon_iso = (NOW + timedelta(days=WINDOW_DAYS + LLM_CACHE_MAX_AGE_DAYS)).date().isoformat()
+    system_prompt = _system_prompt(today_iso, horizon_iso)
+    user_prompt = _user_prompt(source_url, page_text)
     body = {
         "model": GH_MODELS_MODEL,
         "messages": [
@@ -240,12 +527,12 @@ def call_github_models(token: str, source_url: str, page_text: str) -> dict | No
         "max_tokens": GH_MODELS_MAX_TOKENS,
     }
     try:
-        r = requests.post(
-            GH_MODELS_ENDPOINT,
-            headers={"Authorization": f"Bearer {token}", "Content-Type": "application/json"},
-            json=body,
-            timeout=60,
-        )
+        with requests.Session() as session:
+            r = rete.request(
+                session, "POST", GH_MODELS_ENDPOINT, deadline, GH_MODELS_TIMEOUT_S,
+                headers={"Authorization": f"Bearer {token}", "Content-Type": "application/json"},
+                json=body,
+            )
         r.raise_for_status()
     except Exception as e:
         log(f"  ERRORE chiamata GitHub Models: {e}")
@@ -261,58 +548,53 @@ def call_github_models(token: str, source_url: str, page_text: str) -> dict | No
 
 
 def load_existing_manual_signatures() -> set[tuple[str, str]]:
-    """Legge tutti i file dati_grezzi/eventi_YYYY_MM.py e ritorna firme (summary_norm, date)
-    per dedup pre-PR (non riproporre eventi gia' curati a mano)."""
-    sigs: set[tuple[str, str]] = set()
+    """Legge tutti i file dati_grezzi/eventi_YYYY_MM.toml (o .py storici, senza eseguirli)
+    e ritorna firme (summary_norm, date) per dedup pre-PR (non riproporre eventi gia'
+    curati a mano)."""
     if not DATI_GREZZI_DIR.is_dir():
-        return sigs
-    for py_file in DATI_GREZZI_DIR.glob("eventi_*.py"):
-        try:
-            ns: dict = {}
-            exec(py_file.read_text(encoding="utf-8"), ns)
-            for ev in ns.get("event_list", []):
-                sig = _signature(ev.get("summary", ""), ev.get("dtstart_str", ""))
-                if sig:
-                    sigs.add(sig)
-        except Exception as e:
-            log(f"  WARN: impossibile leggere {py_file}: {e}")
-    return sigs
+        return set()
+    return _signatures_from_sources(list_event_source_files(DATI_GREZZI_DIR))
 
 
 def load_existing_discovered_signatures() -> set[tuple[str, str]]:
     """Firme di eventi gia' presenti nei JSON discovered/ committati."""
-    sigs: set[tuple[str, str]] = set()
     if not DISCOVERED_DIR.is_dir():
-        return sigs
-    for jf in DISCOVERED_DIR.glob("eventi_*.json"):
-        try:
-            doc = json.loads(jf.read_text(encoding="utf-8"))
-            for ev in doc.get("events", []):
-                sig = _signature(ev.get("summary", ""), ev.get("dtstart_str", ""))
-                if sig:
-                    sigs.add(sig)
-        except Exception as e:
-            log(f"  WARN: impossibile leggere {jf}: {e}")
-    return sigs
+        return set()
+    return _signatures_from_sources(sorted(DISCOVERED_DIR.glob("eventi_*.json")))
 
 
-def _normalize_summary(s: str) -> str:
-    s = (s or "").lower().strip()
-    s = re.sub(r"[^a-z0-9àèéìòù\s]", " ", s)
-    s = re.sub(r"\s+", " ", s).strip()
-    # rimuovo parole comuni rumorose
-    s = re.sub(r"\b(live|concerto|tour|show|stadi|i-days)\b", "", s).strip()
-    return s
+def _signatures_from_sources(paths) -> set[tuple[str, str]]:
+    sigs: set[tuple[str, str]] = set()
+    for events in load_event_sources(paths, SOURCE_CACHE_PATH).values():
+        events = events or []
+        for ev, ((norm, _date), _strong) in zip(events, create_event_signatures_batch(events)):
+            dtstart_str = ev.get("dtstart_str", "")
+            if norm and dtstart_str:
+                sigs.add((norm, dtstart_str[:10]))  # come _signature
+    return sigs
 
 
 def _signature(summary: str, dtstart_str: str) -> tuple[str, str] | None:
-    norm = _normalize_summary(summary)
+    # Stessa normalizzazione del generatore ICS: un evento e' "gia' noto" qui se e solo
+    # se il generatore lo riconoscerebbe come duplicato.
+    norm = normalize_summary_for_signature(summary)
     if not norm or not dtstart_str:
         return None
     date_part = dtstart_str[:10]  # YYYY-MM-DD
     return (norm, date_part)
 
 
+def discovery_venue(location_name: str) -> str | None:
+    """Venue di una location proposta: alias del registro, altrimenti parole generiche."""
+    venue_id = resolve_venue(location_name)
+    if venue_id:
+        return venue_id
+    for regex, keyword_venue_id in DISCOVERY_VENUE_KEYWORDS:
+        if regex.search(location_name):
+            return keyword_venue_id
+    return None
+
+
 def filter_and_dedup(
     raw_events: list[dict],
     existing_manual: set[tuple[str, str]],
@@ -338,8 +620,9 @@ def filter_and_dedup(
             continue
         if not (today <= dt.date() <= horizon):
             continue
-        # Location deve matchare regex
-        if not LOCATION_REGEX.search(location_name):
+        # Location deve essere una venue del registro (o citarne la zona)
+        venue_id = discovery_venue(location_name)
+        if not venue_id:
             log(f"    SKIP: location non in scope: {location_name!r}")
             continue
         sig = _signature(summary, dtstart_str)
@@ -355,15 +638,9 @@ def filter_and_dedup(
         if not ev.get("dtend_str"):
             dt_end = dt + timedelta(hours=2, minutes=30)
             ev["dtend_str"] = dt_end.strftime("%Y-%m-%dT%H:%M:%S")
-        # Default address se la location matcha
+        # Default address della venue riconosciuta
         if not ev.get("location_address"):
-            loc_lower = location_name.lower()
-            if "san siro" in loc_lower or "meazza" in loc_lower:
-                ev["location_address"] = "Piazzale Angelo Moratti, 20151 Milano MI, Italy"
-            elif "la maura" in loc_lower or "lampugnano" in loc_lower:
-                ev["location_address"] = "Via Lampugnano 95, 20151 Milano MI, Italy"
-            elif "ippodromo" in loc_lower:
-                ev["location_address"] = "Piazzale dello Sport 16, 20151 Milano MI, Italy"
+            ev["location_address"] = VENUES[venue_id]["address"]
         ev["source_url"] = source_url
         out.append(ev)
         # Aggiungo subito alla blacklist per non duplicare tra fonti diverse in questo run
@@ -419,7 +696,158 @@ def validate_against_schema(doc: dict) -> list[str]:
     return errors
 
 
-def main() -> int:
+def collect_structured_events(session: requests.Session, source: dict, page_html: str,
+                              deadline: float | None = None) -> list[dict]:
+    """Eventi da JSON-LD/microdata della pagina o, se non ce ne sono, dai calendari .ics
+    linkati (vedi dati_strutturati.py). Lista vuota: la pagina va al modello."""
+    data = parse_structured_data(page_html, source["url"])
+    if data.invalid_blocks:
+        log(f"  WARN: {data.invalid_blocks} blocchi JSON-LD non validi ignorati")
+    if data.events or not data.ical_urls:
+        return data.events
+    events: list[dict] = []
+    window_end = NOW + timedelta(days=WINDOW_DAYS + 1)
+    for ical_url in data.ical_urls:
+        try:
+            with _host_semaphore(ical_url):
+                r = rete.get(session, ical_url, deadline, FETCH_TIMEOUT_S, headers={"Accept": "text/calendar"})
+            r.raise_for_status()
+            ical_events = events_from_ical(r.text, ical_url, NOW, window_end)
+        except Exception as e:
+            log(f"  WARN: calendario iCal {ical_url} non leggibile: {e}")
+            continue
+        log(f"  Calendario iCal {ical_url}: {len(ical_events)} eventi")
+        events.extend(ical_events)
+    return events
+
+
+def collect_source(session: requests.Session, source: dict, token: str,
+                   model_bucket: TokenBucket, deadline: float,
+                   llm_cache: LLMCache | None = None) -> list[dict] | None:
+    """Eventi grezzi proposti da una fonte, None se saltata. Gira in un worker: fetch e
+    chiamata al modello rispettano i limiti per host, il rate limit e il budget; con
+    `llm_cache` un testo gia' visto riusa la risposta salvata senza chiamare il modello."""
+    source_type = source.get("type", "llm_html")
+    human_url = source.get("human_url") or source["url"]
+    log(f"--- Sorgente: {source['name']} (type={source_type}) {human_url} ---")
+
+    if source_type == "easypark24_api":
+        with _host_semaphore(source["url"]):
+            raw_events = extract_from_easypark24(session, source, deadline)
+        log(f"  Fonte strutturata ha restituito {len(raw_events)} eventi")
+        return raw_events
+    if source_type == "llm_html":
+        with _host_semaphore(source["url"]):
+            page_html = fetch_source_html(session, source, deadline)
+        if page_html is None:
+            log("  Skip sorgente (fetch fallito).")
+            return None
+        structured_events = collect_structured_events(session, source, page_html, deadline)
+        if structured_events:
+            log(f"  Dati strutturati: {len(structured_events)} eventi, nessuna chiamata al modello")
+            return structured_events
+        text = page_text(page_html)
+        if not text:
+            log("  Skip sorgente (pagina senza testo).")
+            return None
+        log(f"  Testo estratto: {len(text)} chars")
+        cache_key = llm_cache_key(source["url"], text) if llm_cache is not None else None
+        parsed = llm_cache.get(cache_key) if llm_cache is not None else None
+        if parsed is not None:
+            log(f"  Cache LLM: hit ({cache_key[:12]}), nessuna chiamata al modello")
+        else:
+            if not model_bucket.acquire(deadline):
+                log("  Skip sorgente (budget esaurito in attesa del rate limit del modello).")
+                return None
+            with _host_semaphore(GH_MODELS_ENDPOINT, GH_MODELS_MAX_CONCURRENT):
+                parsed = call_github_models(token, source["url"], text, deadline)
+            if not parsed:
+                log("  Skip sorgente (LLM fallito).")
+                return None
+            if llm_cache is not None and isinstance(parsed, dict):
+                llm_cache.put(cache_key, source["url"], parsed)
+        raw_events = parsed.get("events", []) if isinstance(parsed, dict) else []
+        log(f"  LLM ha proposto {len(raw_events)} eventi candidati")
+        return raw_events
+    log(f"  Type sconosciuto: {source_type}. Skip.")
+    return None
+
+
+def _collect_source_buffered(*args) -> tuple[list[dict] | None, list[str]]:
+    _log_buffer.lines = []
+    try:
+        return collect_source(*args), _log_buffer.lines
+    except Exception as e:
+        log(f"  ERRORE inatteso: {e}. Skip sorgente.")
+        return None, _log_buffer.lines
+    finally:
+        _log_buffer.lines = None
+
+
+def discover_sources(session: requests.Session, sources: list[dict], token: str,
+                     max_workers: int = DISCOVERY_MAX_WORKERS,
+                     budget_s: float = DISCOVERY_BUDGET_S,
+                     llm_cache: LLMCache | None = None) -> list[list[dict] | None]:
+    """Elabora le fonti in parallelo entro `budget_s` secondi. Ritorna gli eventi grezzi
+    di ogni fonte (None se saltata) nell'ordine di `sources`, stampandone i log in
+    quell'ordine; le fonti non concluse entro il budget risultano saltate. Ogni richiesta
+    (pagine, calendari, API, modello) ha timeout e retry ricavati dal tempo rimasto, quindi
+    anche i worker ancora in corso allo scadere del budget terminano entro il budget."""
+    deadline = time.monotonic() + budget_s
+    request_deadline = deadline - min(DISCOVERY_RESERVE_S, budget_s / 10)
+    model_bucket = TokenBucket(GH_MODELS_REQUESTS_PER_MINUTE / 60, GH_MODELS_BURST)
+    pool = ThreadPoolExecutor(max_workers=max(1, max_workers))
+    futures = [pool.submit(_collect_source_buffered, session, source, token, model_bucket,
+                           request_deadline, llm_cache)
+               for source in sources]
+    wait(futures, timeout=max(0, deadline - time.monotonic()))
+    pool.shutdown(wait=False, cancel_futures=True)
+
+    results: list[list[dict] | None] = []
+    for source, future in zip(sources, futures):
+        if future.done() and not future.cancelled():
+            raw_events, lines = future.result()
+            for line in lines:
+                print(line, flush=True)
+        else:
+            log(f"--- Sorgente: {source['name']}: budget di {budget_s:.0f} s esaurito. Skip. ---")
+            raw_events = None
+        results.append(raw_events)
+    return results
+
+
+def merge_source_results(
+    sources: list[dict],
+    results: list[list[dict] | None],
+    existing_manual: set[tuple[str, str]],
+    existing_discovered: set[tuple[str, str]],
+) -> tuple[list[dict], list[str]]:
+    """Passa i risultati da filter_and_dedup nell'ordine di `sources`: filter_and_dedup
+    aggiorna existing_discovered, quindi l'ordine decide quale fonte "vince" sui duplicati
+    e non deve dipendere da quale worker ha finito prima."""
+    all_new_events: list[dict] = []
+    source_urls_used: list[str] = []
+    for source, raw_events in zip(sources, results):
+        if raw_events is None:
+            continue
+        human_url = source.get("human_url") or source["url"]
+        new_events = filter_and_dedup(raw_events, existing_manual, existing_discovered, human_url)
+        log(f"  {source['name']}: dopo filtro/dedup {len(new_events)} eventi nuovi")
+        all_new_events.extend(new_events)
+        source_urls_used.append(human_url)
+    return all_new_events, source_urls_used
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Discovery eventi da fonti web (PR di proposta).")
+    parser.add_argument("--max-workers", type=int, default=DISCOVERY_MAX_WORKERS,
+                        help=f"fonti elaborate in parallelo (default {DISCOVERY_MAX_WORKERS})")
+    parser.add_argument("--budget-s", type=float, default=DISCOVERY_BUDGET_S,
+                        help=f"tempo massimo del run in secondi (default {DISCOVERY_BUDGET_S})")
+    parser.add_argument("--no-llm-cache", action="store_true",
+                        help="richiama il modello anche per le pagine gia' in cache (la cache viene aggiornata)")
+    args = parser.parse_args(argv)
+
     needs_llm = any(s.get("type", "llm_html") == "llm_html" for s in SOURCES)
     token = os.environ.get("GH_MODELS_TOKEN") or os.environ.get("GITHUB_TOKEN")
     if needs_llm and not token:
@@ -433,38 +861,15 @@ def main() -> int:
     log(f"  Eventi discovered noti: {len(existing_discovered)}")
 
     session = make_http_session()
-    all_new_events: list[dict] = []
-    source_urls_used: list[str] = []
-
-    for source in SOURCES:
-        source_type = source.get("type", "llm_html")
-        human_url = source.get("human_url") or source["url"]
-        log(f"--- Sorgente: {source['name']} (type={source_type}) {human_url} ---")
-
-        raw_events: list[dict]
-        if source_type == "easypark24_api":
-            raw_events = extract_from_easypark24(session, source)
-            log(f"  Fonte strutturata ha restituito {len(raw_events)} eventi")
-        elif source_type == "llm_html":
-            text = fetch_source_text(session, source)
-            if not text:
-                log("  Skip sorgente (fetch fallito).")
-                continue
-            log(f"  Testo estratto: {len(text)} chars")
-            parsed = call_github_models(token or "", source["url"], text)
-            if not parsed:
-                log("  Skip sorgente (LLM fallito).")
-                continue
-            raw_events = parsed.get("events", []) if isinstance(parsed, dict) else []
-            log(f"  LLM ha proposto {len(raw_events)} eventi candidati")
-        else:
-            log(f"  Type sconosciuto: {source_type}. Skip.")
-            continue
-
-        new_events = filter_and_dedup(raw_events, existing_manual, existing_discovered, human_url)
-        log(f"  Dopo filtro/dedup: {len(new_events)} eventi nuovi")
-        all_new_events.extend(new_events)
-        source_urls_used.append(human_url)
+    llm_cache = LLMCache(LLM_CACHE_DIR, refresh=args.no_llm_cache)
+    results = discover_sources(session, SOURCES, token or "", max_workers=args.max_workers,
+                               budget_s=args.budget_s, llm_cache=llm_cache)
+    if llm_cache.hits or llm_cache.misses:
+        log(f"  Cache LLM: {llm_cache.hits} hit, {llm_cache.misses} miss")
+    entries, size, removed = llm_cache.prune()
+    log(f"  Cache LLM: {entries} voci ({size / 1024:.0f} KB), {removed} rimosse (scadute o oltre il limite)")
+    all_new_events, source_urls_used = merge_source_results(
+        SOURCES, results, existing_manual, existing_discovered)
 
     if not all_new_events:
         log("Nessun evento nuovo da proporre.")
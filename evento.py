@@ -0,0 +1,186 @@
+"""Record compatto di un evento, con date e firme calcolate una volta sola.
+
+Gli eventi arrivano come dict (dati_grezzi/*.py, discovered/*.json, feed, manifest di
+build) con le date come stringhe 'YYYY-MM-DDTHH:MM:SS'. EventRecord li tiene in uno
+slot per campo noto, piu' le datetime aware (Europe/Rome), la firma forte di
+de-duplicazione e l'ID della venue, calcolati al caricamento: dedup e serializzatore
+non riparsano piu' le stringhe a ogni confronto.
+
+La conversione e' senza perdite: to_dict() restituisce le stesse chiavi, nello stesso
+ordine, con gli stessi valori (chiavi assenti restano assenti, chiavi sconosciute
+finiscono in `extra`), quindi i file sorgente e il manifest non cambiano formato.
+"""
+
+from __future__ import annotations
+
+import re
+import sys
+from datetime import date, datetime
+from functools import lru_cache
+
+import pytz
+
+from normalizzazione import NORMALIZE_CACHE_SIZE, create_event_signatures, create_event_signatures_batch, resolve_venue
+
+TARGET_TIMEZONE_OBJ = pytz.timezone('Europe/Rome')
+DATETIME_FORMAT = '%Y-%m-%dT%H:%M:%S'
+_STRICT_DATETIME_RE = re.compile(r'\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d')
+
+# Campi noti, uno slot ciascuno; tutto il resto va in `extra`.
+EVENT_FIELDS = (
+    'summary', 'dtstart_str', 'dtend_str', 'location_name', 'location_address',
+    'description', 'google_maps_url_str', 'source_type', 'original_uid_from_feed',
+)
+_EVENT_FIELDS_SET = frozenset(EVENT_FIELDS)
+# Valori che si ripetono su molti eventi (stessa venue, stessa fonte): interning,
+# cosi' 100k eventi JSON non tengono 100k copie di "Stadio San Siro".
+_INTERNED_FIELDS = ('location_name', 'location_address', 'google_maps_url_str', 'source_type')
+# Campi da cui dipendono le firme e la venue: cambiarli le ricalcola.
+_SIGNATURE_FIELDS = frozenset(('summary', 'dtstart_str', 'location_name', 'location'))
+# Tuple delle chiavi condivise tra eventi con la stessa "forma" (quasi sempre poche).
+_KEY_SHAPES: dict[tuple, tuple] = {}
+
+
+def _shape(keys):
+    keys = tuple(keys)
+    return _KEY_SHAPES.setdefault(keys, keys)
+
+
+def parse_datetime_str(dt_str):
+    if not dt_str: return None
+    try:
+        return datetime.strptime(dt_str, DATETIME_FORMAT)
+    except (TypeError, ValueError):
+        return None
+
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def _local_tzinfo_for_hour(naive_hour):
+    # In Europe/Rome i cambi d'ora cadono allo scoccare dell'ora: l'offset scelto da
+    # localize() e' lo stesso per tutti i minuti della stessa ora locale.
+    return TARGET_TIMEZONE_OBJ.localize(naive_hour).tzinfo
+
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def parse_local_datetime(dt_str):
+    """'YYYY-MM-DDTHH:MM:SS' -> datetime aware Europe/Rome, None se assente o non valida.
+    Stesso risultato di make_timezone_aware(parse_datetime_str(dt_str)), ma memoizzato
+    per stringa e senza la localize() completa di pytz per ogni evento."""
+    if not dt_str or type(dt_str) is not str: return None
+    if _STRICT_DATETIME_RE.fullmatch(dt_str):
+        try:
+            naive = datetime.fromisoformat(dt_str)
+        except ValueError:
+            return None
+    else:
+        naive = parse_datetime_str(dt_str)
+        if naive is None: return None
+    return naive.replace(tzinfo=_local_tzinfo_for_hour(naive.replace(minute=0, second=0, microsecond=0)))
+
+
+def make_timezone_aware(dt_obj, timezone_obj=TARGET_TIMEZONE_OBJ):
+    if not dt_obj: return None
+    if isinstance(dt_obj, date) and not isinstance(dt_obj, datetime):
+        dt_obj = datetime.combine(dt_obj, datetime.min.time())
+    if not isinstance(dt_obj, datetime): return None
+    if dt_obj.tzinfo is None or dt_obj.tzinfo.utcoffset(dt_obj) is None:
+        return timezone_obj.localize(dt_obj)
+    return dt_obj.astimezone(timezone_obj)
+
+
+class EventRecord:
+    """Evento della pipeline. Si legge come un dict (`get`, `in`, `[]`) per compatibilita'
+    con il codice esistente; le scritture passano da `set` per tenere allineati datetime,
+    firme e venue."""
+
+    __slots__ = (*EVENT_FIELDS, 'extra', 'keys', 'dtstart', 'dtend', 'strong_signature', 'venue_id')
+
+    @classmethod
+    def from_dict(cls, event_dict, signatures=None):
+        """`signatures`: (debole, forte) gia' calcolate per questo dict, come le da
+        create_event_signatures_batch (as_event_records); None: calcolate qui."""
+        rec = cls.__new__(cls)
+        extra = None
+        for field in EVENT_FIELDS:
+            setattr(rec, field, None)
+        for key, value in event_dict.items():
+            if key in _EVENT_FIELDS_SET:
+                if key in _INTERNED_FIELDS and type(value) is str:
+                    value = sys.intern(value)
+                setattr(rec, key, value)
+            else:
+                if extra is None: extra = {}
+                extra[key] = value
+        rec.extra = extra
+        rec.keys = _shape(event_dict)
+        rec.dtstart = parse_local_datetime(rec.dtstart_str)
+        rec.dtend = parse_local_datetime(rec.dtend_str)
+        rec._refresh_signatures(signatures)
+        return rec
+
+    def to_dict(self):
+        extra = self.extra
+        return {key: (getattr(self, key) if key in _EVENT_FIELDS_SET else extra[key]) for key in self.keys}
+
+    def copy(self):
+        rec = EventRecord.__new__(EventRecord)
+        for slot in EventRecord.__slots__:
+            setattr(rec, slot, getattr(self, slot))
+        if self.extra is not None:
+            rec.extra = dict(self.extra)
+        return rec
+
+    @property
+    def weak_signature(self):
+        return self.strong_signature[:2]
+
+    def _refresh_signatures(self, signatures=None):
+        _weak, self.strong_signature = signatures or create_event_signatures(self)
+        self.venue_id = resolve_venue(self.get('location_name', ''))
+
+    # --- Interfaccia dict (sola lettura) ---
+    def __contains__(self, key):
+        return key in self.keys
+
+    def get(self, key, default=None):
+        if key not in self.keys:
+            return default
+        if key in _EVENT_FIELDS_SET:
+            return getattr(self, key)
+        return self.extra[key]
+
+    def __getitem__(self, key):
+        if key not in self.keys:
+            raise KeyError(key)
+        return self.get(key)
+
+    def set(self, key, value):
+        """Come dict[key] = value (una chiave nuova va in coda all'ordine)."""
+        if key not in self.keys:
+            self.keys = _shape(self.keys + (key,))
+        if key in _EVENT_FIELDS_SET:
+            setattr(self, key, value)
+        else:
+            if self.extra is None: self.extra = {}
+            self.extra[key] = value
+        if key == 'dtstart_str':
+            self.dtstart = parse_local_datetime(value)
+        elif key == 'dtend_str':
+            self.dtend = parse_local_datetime(value)
+        if key in _SIGNATURE_FIELDS:
+            self._refresh_signatures()
+
+    def __repr__(self):
+        return f"EventRecord({self.to_dict()!r})"
+
+
+def as_event_records(events):
+    """Lista di EventRecord da una sequenza mista di dict e record (i record passano invariati).
+    Le firme dei dict sono calcolate in blocco con create_event_signatures_batch."""
+    events = list(events)
+    signatures = iter(create_event_signatures_batch([ev for ev in events if not isinstance(ev, EventRecord)]))
+    return [ev if isinstance(ev, EventRecord) else EventRecord.from_dict(ev, next(signatures)) for ev in events]
+
+
+def records_to_dicts(records):
+    return [rec.to_dict() for rec in records]
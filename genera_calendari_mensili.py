@@ -1,19 +1,51 @@
 # genera_calendari_mensili.py
 
 from icalendar import Calendar, Event
-from datetime import datetime, date, timedelta
+from datetime import datetime, timedelta
 import pytz
 import os
 import sys
 import json
 import hashlib
-import shutil
+import io
+import mmap
 from pathlib import Path
 import re
-import importlib.util
+import argparse
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait
+from contextlib import redirect_stdout
+from itertools import groupby
+from urllib.parse import urlparse
 import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+
+from normalizzazione import (
+    CANONICAL_TO_VENUE_ID,
+    UNKNOWN_LOCATION,
+    normalize_location_for_signature,
+    normalize_summary_for_signature,
+    resolve_venue,
+)
+from archivio import (
+    EVENT_STORE_FILENAME,
+    ingest_source,
+    iter_month_events,
+    open_event_store,
+    prune_feed_sources,
+    replace_canonical_events,
+    sync_file_sources,
+)
+from ricorrenze import expand_vevents, recurrence_window
+import rete
+import telemetria
+from viste import compile_views, route_events
+from sorgenti import SOURCE_CACHE_FILENAME, list_event_source_files, load_event_sources
+from evento import (
+    as_event_records,
+    make_timezone_aware,
+    records_to_dicts,
+)
 
 # --- Configurazione Globale ---
 TARGET_TIMEZONE_STR = 'Europe/Rome'
@@ -22,6 +54,11 @@ TARGET_TIMEZONE_OBJ = pytz.timezone(TARGET_TIMEZONE_STR)
 DATA_SOURCE_FOLDER_NAME = "dati_grezzi"
 DISCOVERED_FOLDER_NAME = "discovered"
 OUTPUT_ICS_FOLDER_NAME = "calendari_output"
+CACHE_FOLDER_NAME = ".cache"  # persistita tra run dal workflow (actions/cache), non committata
+BUILD_MANIFEST_FILENAME = "build_manifest.json"
+# Sorgenti del generatore: il loro hash entra nel manifest di build, cosi' una modifica
+# alla logica invalida tutti i mensili in cache.
+GENERATOR_SOURCE_FILES = ("genera_calendari_mensili.py", "normalizzazione.py", "evento.py", "sorgenti.py", "archivio.py", "ricorrenze.py")
 CURRENT_YEAR = datetime.now().year
 AGGREGATED_ICS_FILENAME = "eventi_san_siro_aggregato.ics"
 
@@ -34,35 +71,74 @@ STADIO_SAN_SIRO_KEYWORDS = [
     "san siro", "giuseppe meazza"
 ]
 
-LOCATION_ALIASES = {
-    "ippodromo snai la maura": ["ippodromo la maura", "la maura", "via lampugnano 95"],
-    "ippodromo snai san siro": ["ippodromo san siro", "piazzale dello sport 16", "piazzale dello sport"],
-    "stadio san siro": ["stadio giuseppe meazza", "san siro", "piazzale angelo moratti"]
-}
-
 LAMPUGNANO_CANONICAL_LOCATION = "ippodromo snai la maura"
+LAMPUGNANO_VENUE_ID = CANONICAL_TO_VENUE_ID[LAMPUGNANO_CANONICAL_LOCATION]
+
+# Calendari pubblicati (Fase 4): viste sull'aggregato de-duplicato, riempite in una sola
+# passata. Filtri ammessi: venue, team, source_type, from, to (vedi viste.py).
+# - required: soglie di sicurezza (MIN_AGGREGATED_EVENTS, SHRINK_TOLERANCE); se non
+#   rispettate il run si ferma senza aggiornare il manifest. Le altre viste, se vuote,
+#   non sovrascrivono l'output esistente.
+# - compat_copy: copia in root per gli URL pubblici storici.
+# Altri esempi:
+#   'partite_inter': {'file': 'partite_inter.ics', 'title': 'Partite Inter a San Siro',
+#                     'filter': {'team': 'Inter', 'source_type': 'ics_feed'}},
+#   'concerti_2026': {'file': 'concerti_2026.ics', 'title': 'Concerti 2026',
+#                     'filter': {'source_type': ['manual_from_file', 'discovered'],
+#                                'from': '2026-01-01', 'to': '2027-01-01'}},
+CALENDAR_VIEWS = {
+    'aggregato': {
+        'file': AGGREGATED_ICS_FILENAME,
+        'title': 'Eventi San Siro (Aggregato)',
+        'filter': {},
+        'required': True,
+        'compat_copy': 'eventi_san_siro_merged.ics',
+    },
+    'lampugnano': {
+        'file': 'eventi_lampugnano.ics',
+        'title': 'Eventi Ippodromo La Maura (Lampugnano)',
+        'filter': {'venue': LAMPUGNANO_VENUE_ID},
+        'compat_copy': 'eventi_lampugnano.ics',
+    },
+}
 UID_DOMAIN = "calendari.danielecarletti"
 MIN_AGGREGATED_EVENTS = 5
 SHRINK_TOLERANCE = 0.5  # se nuovi < 50% dei precedenti, abortisci senza scrivere
+# Da incrementare quando cambia la logica di filtro partite casalinghe: invalida
+# gli eventi gia' filtrati salvati negli snapshot dei feed.
+FEED_FILTER_VERSION = 2
+# Le serie ricorrenti dei feed (RRULE/RDATE) si espandono da data_riferimento_feed per
+# questo numero di stagioni: le SEASONS_LOOKBACK dell'archivio piu' la prossima.
+FEED_RECURRENCE_SEASONS = 3
+# Fase 2: download+parsing dei feed in parallelo. Il tempo totale segue il feed piu'
+# lento (non la somma), con al massimo FEED_MAX_PER_HOST connessioni per host e una
+# deadline globale oltre la quale i feed ancora pendenti ripiegano sullo snapshot.
+# Le richieste (timeout e retry, vedi rete.py) finiscono FEED_FETCH_RESERVE_S prima
+# della deadline: il worker ha il tempo di parsare o ripiegare da solo sullo snapshot.
+FEED_MAX_WORKERS = 8
+FEED_MAX_PER_HOST = 2
+FEED_FETCH_DEADLINE_S = 90
+FEED_FETCH_RESERVE_S = 5
+FEED_FETCH_TIMEOUT_S = 20
+# Uno snapshot confermato (scaricato o 304) da piu' di tanti giorni non sostituisce un
+# feed irraggiungibile: il feed conta come fallito (feed_failures).
+FEED_SNAPSHOT_MAX_AGE_DAYS = 3
+
+_log_buffer = threading.local()  # nei worker dei feed i log di un feed si accumulano qui
 
 
 def log(msg):
-    print(f"[{datetime.now().isoformat(timespec='seconds')}] {msg}")
+    line = f"[{datetime.now().isoformat(timespec='seconds')}] {msg}"
+    lines = getattr(_log_buffer, 'lines', None)
+    if lines is not None:
+        lines.append(line)
+    else:
+        print(line)
 
 
 def _make_http_session():
-    """Session HTTP con retry+timeout per i fetch dei feed ICS."""
-    s = requests.Session()
-    retry = Retry(
-        total=3,
-        backoff_factor=2,
-        status_forcelist=[500, 502, 503, 504],
-        allowed_methods=frozenset(["GET"]),
-    )
-    adapter = HTTPAdapter(max_retries=retry)
-    s.mount('https://', adapter)
-    s.mount('http://', adapter)
-    return s
+    """Session HTTP per i fetch dei feed ICS (retry e timeout per richiesta in rete.get)."""
+    return rete.retry_session(FEED_MAX_WORKERS)
 
 
 def stable_uid(summary, dtstart_iso, location_name):
@@ -75,6 +151,10 @@ def stable_uid(summary, dtstart_iso, location_name):
     return f"{digest}@{UID_DOMAIN}"
 
 
+def event_uid(event):
+    return stable_uid(event.get('summary', 'Evento Senza Titolo'), event.get('dtstart_str'), event.get('location_name', ''))
+
+
 def stable_dtstamp(dtstart_aware):
     """DTSTAMP stabile derivato da dtstart (in UTC). Necessario per idempotenza dell'output ICS."""
     if not dtstart_aware:
@@ -83,116 +163,662 @@ def stable_dtstamp(dtstart_aware):
 
 
 def count_events_in_ics_file(path):
-    """Conta i VEVENT in un file ICS esistente; ritorna 0 se il file non esiste o non parsabile."""
+    """Conta i VEVENT in un file ICS esistente; ritorna 0 se il file non esiste o non leggibile.
+    Usa l'indice sidecar se coerente col file, altrimenti una scansione dei byte."""
     if not path.exists():
         return 0
     try:
-        with open(path, 'rb') as f:
-            cal = Calendar.from_ical(f.read())
-        return sum(1 for _ in cal.walk('VEVENT'))
+        return read_ics_index(path)['events']
     except Exception as e:
-        log(f"WARN: impossibile parsare {path} per conteggio storico: {e}")
+        log(f"WARN: impossibile leggere {path} per conteggio storico: {e}")
         return 0
 
 
+# --- Indice sidecar degli ICS generati ---
+# Accanto a ogni ICS scritto (eventi_X.ics) c'e' eventi_X.idx.json con numero di eventi,
+# UID, intervallo di DTSTART, sha256 e dimensione del file. Controllo di shrink e smoke
+# test sugli UID lo leggono invece di riparsare l'ICS. Se manca o non corrisponde al
+# file (dimensione o sha256 diversi, es. ICS modificato a mano), scan_ics_file fa una
+# sola passata sui byte via mmap. Niente mtime: sidecar e ICS sono committati e dopo un
+# checkout l'mtime non dice nulla sul contenuto.
+ICS_INDEX_SUFFIX = ".idx.json"
+ICS_INDEX_VERSION = 1
+
+
+def ics_index_path(ics_path):
+    return ics_path.with_suffix(ICS_INDEX_SUFFIX)
+
+
+def scan_ics_file(path):
+    """Conta i BEGIN:VEVENT e raccoglie gli UID con mmap, senza parsare l'ICS.
+    Il conteggio non alloca oggetti; gli UID sono le sole stringhe create."""
+    size = path.stat().st_size
+    if size == 0:
+        return {'events': 0, 'uids': [], 'size': 0}
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        count = 0
+        pos = mm.find(b'BEGIN:VEVENT')
+        while pos != -1:
+            if pos == 0 or mm[pos - 1] == 0x0A:  # solo a inizio riga
+                count += 1
+            pos = mm.find(b'BEGIN:VEVENT', pos + 12)
+        uids = []
+        pos = mm.find(b'\nUID')
+        while pos != -1:
+            start = pos + 1
+            if mm[start + 3:start + 4] in (b':', b';'):
+                end = mm.find(b'\n', start)
+                # Righe foldate: la riga logica continua finche' la successiva inizia con spazio/tab
+                while end != -1 and mm[end + 1:end + 2] in (b' ', b'\t'):
+                    end = mm.find(b'\n', end + 1)
+                line = _ICS_FOLD_RE.sub(b'', mm[start:size if end == -1 else end]).rstrip(b'\r')
+                uids.append(_unescape_ics_text(line[line.index(b':') + 1:].decode('utf-8')))
+            pos = mm.find(b'\nUID', start)
+    return {'events': count, 'uids': uids, 'size': size}
+
+
+def read_ics_index(path):
+    """Indice di un ICS: il sidecar se esiste e corrisponde al file (stessa dimensione e
+    stesso sha256), altrimenti scan_ics_file."""
+    index_path = ics_index_path(path)
+    try:
+        index = json.loads(index_path.read_text(encoding='utf-8'))
+        if (index.get('version') == ICS_INDEX_VERSION
+                and same_content(path, index.get('sha256'), index.get('size'))):
+            return index
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        log(f"  WARN: indice {index_path.name} illeggibile ({e}); scansione del file.")
+    return scan_ics_file(path)
+
+
+def write_ics_index(ics_path, prepared_events, sha256_hex, size):
+    index = {
+        'version': ICS_INDEX_VERSION,
+        'events': len(prepared_events),
+        # prepared_events e' ordinato per dtstart (serializable_events)
+        'dtstart_min': prepared_events[0].get('dtstart_str') if prepared_events else None,
+        'dtstart_max': prepared_events[-1].get('dtstart_str') if prepared_events else None,
+        'sha256': sha256_hex,
+        'size': size,
+        'uids': [event_uid(ev) for ev in prepared_events],
+    }
+    write_if_changed(ics_index_path(ics_path), (json.dumps(index, ensure_ascii=False, indent=1) + "\n").encode('utf-8'))
+
+
+# --- Scrittura degli output: atomica e solo se cambiati ---
+# I file pubblicati (ICS, indici, copie in root) vengono confrontati per sha256 con
+# quelli esistenti: se identici non si tocca niente (mtime invariato, git add non vede
+# nulla). Se cambiati si scrive un temporaneo nella stessa cartella e lo si rinomina
+# con os.replace: chi legge trova il file vecchio o il nuovo, mai uno troncato.
+def atomic_write(target_path, chunks):
+    """Scrive i chunk (bytes) in un temporaneo accanto a target_path e lo rinomina."""
+    tmp_path = target_path.with_name(f".{target_path.name}.tmp")
+    try:
+        with open(tmp_path, 'wb') as f:
+            for chunk in chunks:
+                f.write(chunk)
+        os.replace(tmp_path, target_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def same_content(path, sha256_hex, size):
+    """True se path esiste con esattamente quella dimensione e quell'hash."""
+    try:
+        return path.stat().st_size == size and _sha256_file(path) == sha256_hex
+    except FileNotFoundError:
+        return False
+
+
+def write_if_changed(target_path, data):
+    """Scrittura atomica di `data` (bytes) se diverso dal contenuto attuale. True se scritto."""
+    if same_content(target_path, hashlib.sha256(data).hexdigest(), len(data)):
+        return False
+    atomic_write(target_path, [data])
+    return True
+
+
+def copy_if_changed(source_path, target_path):
+    """Copia atomica di source_path su target_path se il contenuto e' diverso. True se copiato."""
+    if same_content(target_path, _sha256_file(source_path), source_path.stat().st_size):
+        return False
+    with open(source_path, 'rb') as f:
+        atomic_write(target_path, iter(lambda: f.read(1 << 16), b''))
+    return True
+
+
 # --- Funzioni di Download e Parsing URL ---
 _HTTP_SESSION = None
+_HOST_SEMAPHORES = {}
+_HOST_SEMAPHORES_LOCK = threading.Lock()
+
 
+def _host_semaphore(url):
+    host = urlparse(url).netloc.lower()
+    with _HOST_SEMAPHORES_LOCK:
+        if host not in _HOST_SEMAPHORES:
+            _HOST_SEMAPHORES[host] = threading.BoundedSemaphore(FEED_MAX_PER_HOST)
+        return _HOST_SEMAPHORES[host]
 
-def get_calendar_from_url(url):
+
+def _get_http_session():
     global _HTTP_SESSION
     if _HTTP_SESSION is None:
         _HTTP_SESSION = _make_http_session()
+    return _HTTP_SESSION
+
+
+# --- Cache dei feed (GET condizionale + snapshot su disco) ---
+# Letture e scritture degli snapshot sono serializzate: un worker oltre la deadline non
+# scrive piu', ma uno che ha iniziato a scrivere appena prima finisce prima che il
+# thread principale legga lo stesso snapshot per il fallback.
+_FEED_SNAPSHOT_LOCK = threading.Lock()
+
+
+def _before(deadline):
+    return deadline is None or rete.time_left(deadline) > 0
+
+
+def _feed_snapshot_paths(cache_dir, url):
+    key = hashlib.sha256(url.encode('utf-8')).hexdigest()[:16]
+    return cache_dir / f"{key}.ics", cache_dir / f"{key}.json"
+
+
+def load_feed_snapshot(cache_dir, url):
+    """Ritorna (body, meta) dell'ultimo snapshot valido del feed, (None, {}) se assente o illeggibile."""
+    body_path, meta_path = _feed_snapshot_paths(cache_dir, url)
+    try:
+        with _FEED_SNAPSHOT_LOCK:
+            if not body_path.exists() or not meta_path.exists():
+                return None, {}
+            meta = json.loads(meta_path.read_text(encoding='utf-8'))
+            body = body_path.read_bytes().decode('utf-8')
+    except Exception as e:
+        log(f"  WARN: snapshot del feed {url} illeggibile, lo ignoro: {e}")
+        return None, {}
+    if meta.get('url') != url or meta.get('sha256') != hashlib.sha256(body.encode('utf-8')).hexdigest():
+        log(f"  WARN: snapshot del feed {url} incoerente, lo ignoro.")
+        return None, {}
+    return body, meta
+
+
+def snapshot_is_fresh(url, snapshot_meta):
+    """True se lo snapshot e' stato confermato dal server (download o 304) da non piu' di
+    FEED_SNAPSHOT_MAX_AGE_DAYS giorni. Uno snapshot senza data valida conta come vecchio."""
+    stamp = snapshot_meta.get('checked_at') or snapshot_meta.get('fetched_at')
+    try:
+        age = datetime.now(pytz.UTC) - datetime.fromisoformat(stamp)
+    except (TypeError, ValueError):
+        age = None
+    if age is not None and age <= timedelta(days=FEED_SNAPSHOT_MAX_AGE_DAYS):
+        return True
+    log(f"ERRORE: l'ultimo snapshot di {url} (del {stamp}) ha piu' di {FEED_SNAPSHOT_MAX_AGE_DAYS} giorni: "
+        f"feed considerato fallito.")
+    return False
+
+
+def save_feed_snapshot(cache_dir, url, body, meta, deadline=None):
+    """Salva body+metadati del feed. Il body viene scritto prima dei metadati, che ne
+    contengono l'hash: uno snapshot interrotto a meta' viene scartato da load_feed_snapshot.
+    Oltre `deadline` non scrive niente (il feed e' gia' passato al fallback)."""
+    body_path, meta_path = _feed_snapshot_paths(cache_dir, url)
     try:
-        response = _HTTP_SESSION.get(url, timeout=20)
-        response.raise_for_status()
-        return Calendar.from_ical(response.text)
+        with _FEED_SNAPSHOT_LOCK:
+            if not _before(deadline):
+                return
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            if body is not None:
+                body_path.write_bytes(body.encode('utf-8'))
+                meta['sha256'] = hashlib.sha256(body.encode('utf-8')).hexdigest()
+            meta['url'] = url
+            meta_path.write_text(json.dumps(meta, ensure_ascii=False, indent=1), encoding='utf-8')
+    except Exception as e:
+        log(f"  WARN: impossibile salvare lo snapshot del feed {url}: {e}")
+
+
+def fetch_feed_conditional(url, snapshot_meta, deadline=None):
+    """GET condizionale del feed (If-None-Match / If-Modified-Since dai validator dello snapshot),
+    con timeout e retry che finiscono entro `deadline` (time.monotonic(), None: nessuna).
+    Ritorna (stato, body, validators) con stato in {'scaricato', 'non_modificato'};
+    solleva requests.exceptions.RequestException in caso di errore di rete/HTTP."""
+    headers = {}
+    if snapshot_meta.get('etag'):
+        headers['If-None-Match'] = snapshot_meta['etag']
+    if snapshot_meta.get('last_modified'):
+        headers['If-Modified-Since'] = snapshot_meta['last_modified']
+    with _host_semaphore(url):
+        response = rete.get(_get_http_session(), url, deadline, FEED_FETCH_TIMEOUT_S, headers=headers)
+    if response.status_code == 304 and headers:
+        return 'non_modificato', None, {}
+    response.raise_for_status()
+    telemetria.record_feed(url, bytes_downloaded=len(response.content))
+    validators = {
+        'etag': response.headers.get('ETag'),
+        'last_modified': response.headers.get('Last-Modified'),
+    }
+    return 'scaricato', response.text, validators
+
+def club_name_for_team(team_key):
+    if team_key.lower() == "milan": return "AC Milan"
+    if team_key.lower() == "inter": return "Inter"
+    return team_key.capitalize()
+
+
+def is_home_match_summary(summary_text, club_name_for_feed):
+    """True se il club e' da solo nella prima parte del summary ("home - away")."""
+    summary_parts = [p.strip() for p in re.split(r'\s+vs\s+|\s+-\s+', summary_text, 1)]
+    if len(summary_parts) > 0 and club_name_for_feed.lower() in summary_parts[0].lower():
+        remaining_summary_part = re.sub(re.escape(club_name_for_feed), '', summary_parts[0], flags=re.IGNORECASE).strip()
+        if not re.search(r'[a-zA-Z0-9]', remaining_summary_part):
+            return True
+    return False
+
+
+def extract_home_match_events(vevent_components, club_name_for_feed, data_riferimento_feed):
+    """Filtra i VEVENT di un feed: solo partite casalinghe di club_name_for_feed da data_riferimento_feed in poi."""
+    home_events = []
+    for component in vevent_components:
+        summary_text = str(component.get('summary', ''))
+        location_text = str(component.get('location', ''))
+        dtstart_prop = component.get('dtstart')
+        if not dtstart_prop: continue
+        
+        dtstart_event_obj_orig = dtstart_prop.dt
+        dtstart_event_obj_aware = make_timezone_aware(dtstart_event_obj_orig, TARGET_TIMEZONE_OBJ)
+        if not dtstart_event_obj_aware: continue
+
+        # Filtro Data per i feed
+        # Se usi il filtro stagione per test:
+        # if not (data_riferimento_feed_inizio_stagione <= dtstart_event_obj_aware <= data_riferimento_feed_fine_stagione):
+        #     continue
+        # Filtro per produzione (eventi futuri o recenti):
+        if dtstart_event_obj_aware < data_riferimento_feed: # Usa questo per la produzione
+             continue
+
+        is_home_match_candidate = is_home_match_summary(summary_text, club_name_for_feed)
+
+        # Detection casa:
+        # 1. club primo nel summary (es. "AC Milan - Cagliari" -> casa Milan): la
+        #    convention osservata su ics.fixtur.es e' "home - away".
+        # 2. se il feed popola LOCATION, deve essere una location nota (sanity check).
+        #    Oggi ics.fixtur.es lascia LOCATION vuota su TUTTI gli eventi: in quel
+        #    caso ci basiamo solo sul summary (era il comportamento storico).
+        #    Se in futuro il feed iniziasse a popolare LOCATION con qualcosa di
+        #    diverso da San Siro per le partite casalinghe, il match e' un warning.
+        is_truly_relevant_match = False
+        if is_home_match_candidate:
+            if location_text:
+                if is_location_relevant_for_feed(location_text):
+                    is_truly_relevant_match = True
+                else:
+                    log(f"    SKIP feed match con location estranea: '{summary_text}' loc='{location_text}'")
+            else:
+                # Location assente: ci fidiamo del summary (case attuale di ics.fixtur.es)
+                is_truly_relevant_match = True
+        
+        if is_truly_relevant_match:
+            event_dict = ical_event_component_to_dict(component)
+            if event_dict.get('dtstart_str'):
+                home_events.append(event_dict)
+                log(f"    + casa: {dtstart_event_obj_aware.date()} {summary_text}")
+    return home_events
+
+
+# --- Scanner streaming dei feed ICS ---
+# Un feed multi-stagione contiene centinaia di VEVENT di cui sopravvive solo una
+# frazione (partite casalinghe dopo data_riferimento_feed). Lo scanner legge il feed
+# riga per riga (con unfolding), estrae DTSTART/SUMMARY/LOCATION senza costruire
+# componenti icalendar e scarta subito gli eventi fuori finestra o in trasferta.
+# Solo i sopravvissuti (+ eventuali VTIMEZONE) passano da Calendar.from_ical.
+_ICS_FOLD_RE = re.compile(rb'\r?\n[ \t]')
+_ICS_TEXT_UNESCAPE_RE = re.compile(r'\\([\\;,nN])')
+# Il pre-filtro deve solo essere conservativo: il filtro esatto resta in
+# extract_home_match_events.
+_PREFILTER_CUTOFF_MARGIN = timedelta(days=1)
+
+
+def iter_unfolded_ics_lines(text):
+    """Righe logiche di un testo ICS (RFC 5545 unfolding), senza materializzare la lista."""
+    pending = None
+    start, length = 0, len(text)
+    while start < length:
+        end = text.find('\n', start)
+        if end == -1:
+            end = length
+        raw = text[start:end].rstrip('\r')
+        start = end + 1
+        if raw[:1] in (' ', '\t') and pending is not None:
+            pending += raw[1:]
+            continue
+        if pending is not None:
+            yield pending
+        pending = raw
+    if pending:
+        yield pending
+
+
+def _split_ics_property(line):
+    """'NAME;P=V:VALUE' -> (NAME, {P: V}, VALUE). I ':' dentro parametri quotati sono ignorati."""
+    in_quotes = False
+    for i, ch in enumerate(line):
+        if ch == '"':
+            in_quotes = not in_quotes
+        elif ch == ':' and not in_quotes:
+            head, value = line[:i], line[i + 1:]
+            break
+    else:
+        return line.upper(), {}, ''
+    name, *raw_params = head.split(';')
+    params = {}
+    for raw_param in raw_params:
+        key, _, param_value = raw_param.partition('=')
+        params[key.upper()] = param_value.strip('"')
+    return name.upper(), params, value
+
+
+def _unescape_ics_text(value):
+    return _ICS_TEXT_UNESCAPE_RE.sub(lambda m: '\n' if m.group(1) in 'nN' else m.group(1), value)
+
+
+def prefilter_feed_vevents(text, keep):
+    """Scansiona il feed e ritorna, come componenti icalendar, i VEVENT per cui
+    keep(summary, location, dtstart_day) e' True. dtstart_day e' la data 'YYYYMMDD'
+    letta da DTSTART cosi' com'e' (senza conversione di timezone) o '' se assente o se
+    l'evento e' una serie (RRULE/RDATE: le occorrenze possono cadere dopo il DTSTART).
+    Le modifiche di singole occorrenze (RECURRENCE-ID) passano sempre: servono a
+    expand_vevents per sostituire l'occorrenza originale.
+    Solleva ValueError se il testo non e' un VCALENDAR."""
+    saw_vcalendar = False
+    kept_blocks = []
+    current = None
+    in_vevent = False
+    depth = 0
+    summary = location = dtstart_day = ''
+    recurring = is_override = False
+    for line in iter_unfolded_ics_lines(text):
+        upper = line[:16].upper()
+        if current is None:
+            if upper.startswith('BEGIN:VCALENDAR'):
+                saw_vcalendar = True
+            elif upper.startswith('BEGIN:VEVENT') or upper.startswith('BEGIN:VTIMEZONE'):
+                current, depth = [line], 1
+                in_vevent = upper.startswith('BEGIN:VEVENT')
+                summary = location = dtstart_day = ''
+                recurring = is_override = False
+            continue
+        current.append(line)
+        if upper.startswith('BEGIN:'):
+            depth += 1
+        elif upper.startswith('END:'):
+            depth -= 1
+            if depth == 0:
+                if not in_vevent or is_override or keep(summary, location, '' if recurring else dtstart_day):
+                    kept_blocks.append(current)
+                current = None
+        elif in_vevent and depth == 1:
+            if upper.startswith('SUMMARY'):
+                name, _, value = _split_ics_property(line)
+                if name == 'SUMMARY':
+                    summary = _unescape_ics_text(value)
+            elif upper.startswith('LOCATION'):
+                name, _, value = _split_ics_property(line)
+                if name == 'LOCATION':
+                    location = _unescape_ics_text(value)
+            elif upper.startswith('DTSTART'):
+                name, _, value = _split_ics_property(line)
+                if name == 'DTSTART' and value[:8].isdigit():
+                    dtstart_day = value[:8]
+            elif upper.startswith('RRULE') or upper.startswith('RDATE'):
+                recurring = True
+            elif upper.startswith('RECURRENCE-ID'):
+                is_override = True
+    if not saw_vcalendar:
+        raise ValueError("il contenuto non e' un VCALENDAR")
+    if not kept_blocks:
+        return []
+    mini_calendar = ['BEGIN:VCALENDAR', 'VERSION:2.0']
+    for block in kept_blocks:
+        mini_calendar.extend(block)
+    mini_calendar.append('END:VCALENDAR')
+    return Calendar.from_ical('\r\n'.join(mini_calendar)).walk('VEVENT')
+
+
+def parse_feed_home_events(text, club_name_for_feed, data_riferimento_feed):
+    """Partite casalinghe da un feed ICS: pre-filtro streaming + filtro esatto sui sopravvissuti."""
+    # Confronto tra stringhe YYYYMMDD: il margine di un giorno copre qualsiasi offset
+    # di timezone tra il DTSTART grezzo e data_riferimento_feed.
+    cutoff_day = (data_riferimento_feed - _PREFILTER_CUTOFF_MARGIN).strftime('%Y%m%d')
+
+    def keep(summary, location, dtstart_day):
+        if dtstart_day and dtstart_day < cutoff_day:
+            return False
+        return is_home_match_summary(summary, club_name_for_feed)
+
+    # Le serie si espandono pigramente: le occorrenze vanno una alla volta nel filtro esatto.
+    window_start, window_end = recurrence_window(data_riferimento_feed, FEED_RECURRENCE_SEASONS)
+    vevents = expand_vevents(prefilter_feed_vevents(text, keep), window_start, window_end)
+    return extract_home_match_events(vevents, club_name_for_feed, data_riferimento_feed)
+
+
+def load_feed_home_events(team_key, url, data_riferimento_feed, cache_dir, deadline=None):
+    """Partite casalinghe dal feed `url`, passando per la cache su disco.
+
+    - 304 Not Modified: niente download ne' parsing, riuso gli eventi gia' filtrati dello snapshot.
+    - errore di rete/HTTP/parsing: fallback sull'ultimo snapshot valido (WARN, non conta come fallimento).
+    - `deadline` (time.monotonic()): le richieste finiscono FEED_FETCH_RESERVE_S prima;
+      oltre la deadline snapshot e telemetria non vengono piu' scritti.
+    Ritorna None solo se il feed e' irraggiungibile E non esiste uno snapshot."""
+    t0 = time.perf_counter()
+    home_events = _load_feed_home_events(team_key, url, data_riferimento_feed, cache_dir, deadline)
+    if _before(deadline):
+        telemetria.record_feed(url, team=team_key, seconds=round(time.perf_counter() - t0, 4),
+                               home_events=None if home_events is None else len(home_events))
+    return home_events
+
+
+def _load_feed_home_events(team_key, url, data_riferimento_feed, cache_dir, deadline):
+    club_name_for_feed = club_name_for_team(team_key)
+    filter_key = _feed_filter_key(club_name_for_feed, data_riferimento_feed)
+    log(f"  Scaricando calendario per: {club_name_for_feed} da {url}")
+    snapshot_body, snapshot_meta = load_feed_snapshot(cache_dir, url)
+    fetch_deadline = None if deadline is None else deadline - FEED_FETCH_RESERVE_S
+
+    not_modified = False
+    try:
+        stato, new_body, validators = fetch_feed_conditional(url, snapshot_meta if snapshot_body else {},
+                                                             fetch_deadline)
+        telemetria.record_feed(url, outcome=stato)
+        if stato == 'non_modificato':
+            log(f"    304 Not Modified: riuso lo snapshot del {snapshot_meta.get('fetched_at')}.")
+            not_modified = True
+            snapshot_meta['checked_at'] = datetime.now(pytz.UTC).isoformat(timespec='seconds')
+            save_feed_snapshot(cache_dir, url, None, snapshot_meta, deadline)
+        else:
+            home_events = parse_feed_home_events(new_body, club_name_for_feed, data_riferimento_feed)
+            save_feed_snapshot(cache_dir, url, new_body, {
+                **validators,
+                'fetched_at': datetime.now(pytz.UTC).isoformat(timespec='seconds'),
+                'filter_key': filter_key,
+                'home_events': home_events,
+            }, deadline)
+            log(f"    Totale {len(home_events)} partite casalinghe aggiunte da {club_name_for_feed}.")
+            return home_events
     except requests.exceptions.Timeout:
         log(f"ERRORE: Timeout durante il download del calendario da {url}")
     except requests.exceptions.RequestException as e:
         log(f"ERRORE nel scaricare il calendario da {url}: {e}")
     except Exception as e:
         log(f"ERRORE nel parsare il calendario da {url}: {e}")
-    return None
 
-def is_location_relevant_for_feed(location_text):
-    if not location_text: return False
-    normalized_loc = normalize_location_for_signature(location_text)
-    return normalized_loc in LOCATION_ALIASES
+    if not not_modified:
+        if snapshot_body is not None and not snapshot_is_fresh(url, snapshot_meta):
+            snapshot_body = None
+        if _before(deadline):
+            telemetria.record_feed(url, outcome='fallito' if snapshot_body is None else 'snapshot')
+        if snapshot_body is None:
+            return None
+        log(f"  WARN: uso l'ultimo snapshot valido di {url} (del {snapshot_meta.get('fetched_at')}).")
+    return _home_events_from_snapshot(url, club_name_for_feed, data_riferimento_feed, cache_dir,
+                                      snapshot_body, snapshot_meta, filter_key, deadline)
 
-# --- Funzioni di Normalizzazione e Utilità ---
-def parse_datetime_str(dt_str):
-    if not dt_str: return None
-    try:
-        return datetime.strptime(dt_str, '%Y-%m-%dT%H:%M:%S')
-    except ValueError:
-        return None
-
-def make_timezone_aware(dt_obj, timezone_obj=TARGET_TIMEZONE_OBJ):
-    if not dt_obj: return None
-    if isinstance(dt_obj, date) and not isinstance(dt_obj, datetime):
-        dt_obj = datetime.combine(dt_obj, datetime.min.time())
-    if not isinstance(dt_obj, datetime): return None
-    if dt_obj.tzinfo is None or dt_obj.tzinfo.utcoffset(dt_obj) is None:
-        return timezone_obj.localize(dt_obj)
-    return dt_obj.astimezone(timezone_obj)
-
-def normalize_summary_for_signature(summary):
-    if not summary: return ""
-    s = str(summary).lower().strip()
-    s = re.sub(r'\s*\[(cl|el|cop|serie a|campionato)\]\s*$', '', s, flags=re.IGNORECASE)
-    s = re.sub(r'\b(live|world tour|concerto|evento|show|i-days milano|stadi \d{4}|partita)\b', '', s, flags=re.IGNORECASE)
-    s = re.sub(r'\(data \d+(?: - ipotizzata)?\)', '', s, flags=re.IGNORECASE)
-    s = re.sub(r'[^\w\s-]', '', s)
-    s = re.sub(r'\s+', ' ', s).strip()
-    s = re.sub(r'\s*\(\d+-\d+\)\s*$', '', s).strip()
-    parts = sorted([p.strip() for p in re.split(r'\s+vs\s+|\s+-\s+', s) if p.strip()])
-    s = " vs ".join(parts)
-    return s
-
-def normalize_location_for_signature(location_name):
-    if not location_name: return ""
-    loc_lower = str(location_name).lower().strip()
-    for canonical, aliases in LOCATION_ALIASES.items():
-        if canonical in loc_lower: return canonical
-        for alias in aliases:
-            if alias in loc_lower: return canonical
-    loc_lower = re.sub(r'[^\w\s-,]', '', loc_lower)
-    loc_lower = re.sub(r'\s+', ' ', loc_lower).strip()
-    return loc_lower if loc_lower else "unknown_location" # Ritorna "unknown_location" se vuota
-
-def create_event_signatures(event_data_dict):
-    """Crea sia una firma debole (summary+data) sia una forte (summary+data+location)."""
-    norm_summary = normalize_summary_for_signature(event_data_dict.get('summary'))
-    dt_start_obj_naive = parse_datetime_str(event_data_dict.get('dtstart_str'))
-    event_date_str = dt_start_obj_naive.date().isoformat() if dt_start_obj_naive else ""
-    
-    weak_signature = (norm_summary, event_date_str)
-    
-    raw_location = event_data_dict.get('location_name', event_data_dict.get('location', ''))
-    norm_loc_specific = normalize_location_for_signature(raw_location) # Restituisce 'unknown_location' se vuota
-    
-    strong_signature = (norm_summary, event_date_str, norm_loc_specific)
-    return weak_signature, strong_signature
-
-def load_event_list_from_file(file_path):
-    module_name = file_path.stem
-    spec = importlib.util.spec_from_file_location(module_name, file_path)
-    if not spec or not spec.loader: return None
-    module = importlib.util.module_from_spec(spec)
+
+def _home_events_from_snapshot(url, club_name_for_feed, data_riferimento_feed, cache_dir,
+                               snapshot_body, snapshot_meta, filter_key, deadline=None):
+    if snapshot_meta.get('filter_key') == filter_key and isinstance(snapshot_meta.get('home_events'), list):
+        home_events = snapshot_meta['home_events']
+    else:
+        try:
+            home_events = parse_feed_home_events(snapshot_body, club_name_for_feed, data_riferimento_feed)
+        except Exception as e:
+            log(f"ERRORE nel parsare lo snapshot di {url}: {e}")
+            return None
+        snapshot_meta['filter_key'] = filter_key
+        snapshot_meta['home_events'] = home_events
+        save_feed_snapshot(cache_dir, url, None, snapshot_meta, deadline)
+    log(f"    Totale {len(home_events)} partite casalinghe aggiunte da {club_name_for_feed} (da snapshot).")
+    return home_events
+
+
+def _feed_filter_key(club_name_for_feed, data_riferimento_feed):
+    # Gli eventi filtrati in cache valgono solo a parita' di club, finestra temporale e logica di filtro
+    return f"{FEED_FILTER_VERSION}|{club_name_for_feed}|{data_riferimento_feed.isoformat()}"
+
+
+def _load_feed_home_events_buffered(*args):
+    _log_buffer.lines = []
     try:
-        spec.loader.exec_module(module)
-        # Assicurati di aggiungere 'source_type': 'manual' ai dizionari se non già presente
-        loaded_list = getattr(module, 'event_list', None)
-        if isinstance(loaded_list, list):
-            for item in loaded_list:
-                if 'source_type' not in item:
-                    item['source_type'] = 'manual_from_file' # O 'dati_grezzi'
-            return loaded_list
-        return None
-    except Exception as e:
-        print(f"Errore durante l'importazione di {file_path}: {e}")
-    return None
+        return load_feed_home_events(*args), _log_buffer.lines
+    finally:
+        _log_buffer.lines = None
+
+
+def load_all_feeds_home_events(calendar_urls, data_riferimento_feed, cache_dir):
+    """Esegue load_feed_home_events su tutti i feed in parallelo (thread pool).
+
+    Ritorna una lista [(team_key, home_events | None)] nello stesso ordine di
+    calendar_urls, indipendente dall'ordine di completamento; nello stesso ordine
+    stampa i log di ogni feed (accumulati dal worker, non mescolati tra thread).
+    I feed non completati entro FEED_FETCH_DEADLINE_S ripiegano sullo snapshot
+    (None se assente); i loro worker finiscono comunque entro la deadline le richieste
+    in corso e non scrivono piu' niente."""
+    _get_http_session()  # inizializzata qui, non in concorrenza dai worker
+    deadline = time.monotonic() + FEED_FETCH_DEADLINE_S
+    executor = ThreadPoolExecutor(max_workers=min(FEED_MAX_WORKERS, max(1, len(calendar_urls))))
+    futures = {
+        team_key: executor.submit(_load_feed_home_events_buffered, team_key, url, data_riferimento_feed,
+                                  cache_dir, deadline)
+        for team_key, url in calendar_urls.items()
+    }
+    done, pending = wait(futures.values(), timeout=max(0, deadline - time.monotonic()))
+    executor.shutdown(wait=False, cancel_futures=True)
+
+    results = []
+    for team_key, url in calendar_urls.items():
+        future = futures[team_key]
+        if future in done:
+            try:
+                home_events, lines = future.result()
+            except Exception as e:
+                log(f"ERRORE inatteso sul feed {url}: {e}")
+                results.append((team_key, None))
+                continue
+            for line in lines:
+                print(line)
+            results.append((team_key, home_events))
+            continue
+        club_name_for_feed = club_name_for_team(team_key)
+        log(f"ERRORE: deadline di {FEED_FETCH_DEADLINE_S}s superata per {url}.")
+        snapshot_body, snapshot_meta = load_feed_snapshot(cache_dir, url)
+        if snapshot_body is not None and not snapshot_is_fresh(url, snapshot_meta):
+            snapshot_body = None
+        telemetria.record_feed(url, team=team_key, outcome='deadline', seconds=FEED_FETCH_DEADLINE_S,
+                               home_events=None if snapshot_body is None else 0)
+        if snapshot_body is None:
+            results.append((team_key, None))
+            continue
+        log(f"  WARN: uso l'ultimo snapshot valido di {url} (del {snapshot_meta.get('fetched_at')}).")
+        results.append((team_key, _home_events_from_snapshot(
+            url, club_name_for_feed, data_riferimento_feed, cache_dir, snapshot_body, snapshot_meta,
+            _feed_filter_key(club_name_for_feed, data_riferimento_feed))))
+    return results
+
+def is_location_relevant_for_feed(location_text):
+    return resolve_venue(location_text) is not None
+
+# --- Caricamento sorgenti ---
+# parse_datetime_str / make_timezone_aware stanno in evento.py, il parsing dei file
+# sorgente (TOML, .py storico senza exec, JSON) e la loro cache in sorgenti.py.
+def month_key_for_source(path):
+    return path.stem.replace("eventi_", "")  # 2026_06
+
+
+# source_type per suffisso del file: (valore, forzato). I manuali lo possono dichiarare,
+# i discovered sono sempre 'discovered' (stessa regola di load_events_by_month).
+SOURCE_TYPE_BY_SUFFIX = {
+    '.toml': ('manual_from_file', False),
+    '.py': ('manual_from_file', False),
+    '.json': ('discovered', True),
+}
+
+
+def list_source_files_by_month(data_source_dir, discovered_dir):
+    """File sorgente per mese, nell'ordine di caricamento (prima dati_grezzi, poi discovered)."""
+    files_by_month: dict[str, list] = {}
+    for path in list_event_source_files(data_source_dir):
+        if path.suffix in ('.toml', '.py'):
+            files_by_month.setdefault(month_key_for_source(path), []).append(path)
+    if discovered_dir.is_dir():
+        for path in sorted(discovered_dir.glob("eventi_*.json")):
+            files_by_month.setdefault(month_key_for_source(path), []).append(path)
+    return files_by_month
+
+
+def load_events_by_month(data_source_dir, discovered_dir, months=None, cache_dir=None):
+    """Raggruppa per mese (YYYY_MM): manuali da dati_grezzi/*.toml (o .py storici) + AI-discovered da discovered/*.json.
+    I "discovered" sono eventi gia' revisionati e mergiati via PR (vedi discover_eventi.py).
+    Con `months` carica solo i file di quei mesi (gli altri arrivano dal manifest di build).
+    Con `cache_dir` i file non cambiati dall'ultimo run arrivano dalla cache di sorgenti.py.
+    Gli eventi sono EventRecord: date e firme vengono calcolate qui, una volta sola."""
+    events_by_month: dict[str, list] = {}
+    files_by_month = list_source_files_by_month(data_source_dir, discovered_dir)
+    selected = [p for m, paths in sorted(files_by_month.items()) if months is None or m in months for p in paths]
+    cache_path = cache_dir / SOURCE_CACHE_FILENAME if cache_dir else None
+    loaded = load_event_sources(selected, cache_path)
+
+    log(f"--- Fase 1a: Eventi manuali da '{data_source_dir}' ---")
+    if not any(p.suffix != '.json' for paths in files_by_month.values() for p in paths):
+        log(f"  WARN: nessun file mensile in {data_source_dir}.")
+    for data_file_path in (p for p in selected if p.suffix != '.json'):
+        month_key = month_key_for_source(data_file_path)
+        log(f"  Processando file dati: {data_file_path.name}")
+        raw_events_monthly = loaded[data_file_path]
+        if not raw_events_monthly:
+            log(f"    Nessun evento caricato da {data_file_path.name}. Skip.")
+            continue
+        records = as_event_records(raw_events_monthly)
+        for rec in records:
+            if 'source_type' not in rec:
+                rec.set('source_type', 'manual_from_file')
+        events_by_month.setdefault(month_key, []).extend(records)
+        log(f"    Caricati {len(raw_events_monthly)} eventi manuali per {month_key}.")
+
+    log(f"--- Fase 1b: Eventi AI-discovered da '{discovered_dir}' ---")
+    if discovered_dir.is_dir():
+        for json_file in (p for p in selected if p.suffix == '.json'):
+            month_key = month_key_for_source(json_file)
+            json_events = loaded[json_file]
+            if json_events is None:
+                continue
+            for rec in as_event_records(json_events):
+                rec.set('source_type', 'discovered')
+                events_by_month.setdefault(month_key, []).append(rec)
+            log(f"  Caricati {len(json_events)} eventi discovered per {month_key} ({json_file.name}).")
+    else:
+        log(f"  (Cartella {discovered_dir} non presente; skip.)")
+    return events_by_month
 
 def ical_event_component_to_dict(component):
     event_dict = {'source_type': 'ics_feed'} # Importante per la logica di merge
@@ -216,101 +842,108 @@ def ical_event_component_to_dict(component):
     event_dict['original_uid_from_feed'] = str(component.get('uid', ''))
     return event_dict
 
-def apply_deduplication_and_merge(event_list_of_dicts):
-    print(f"  Inizio de-duplicazione per {len(event_list_of_dicts)} eventi candidati...")
-    # Mappa da firma FORTE a dizionario evento
-    processed_events_by_strong_signature = {}
-    # Mappa da firma DEBOLE a firma FORTE (per trovare corrispondenze deboli)
-    weak_to_strong_map = {}
+# --- De-duplicazione ---
+# Motore a ordinamento e raggruppamento: i candidati sono ordinati una volta per firma
+# debole (summary normalizzato + data) e ogni gruppo viene fuso per intero con regole
+# che non dipendono dall'ordine di arrivo. Costo O(n log n); stesso risultato qualunque
+# sia l'ordine in ingresso (mensili, aggregato, feed in parallelo...).
+# Dentro un gruppo debole:
+# - i candidati con la stessa firma forte (+ location) diventano un solo evento: il
+#   "master" e' il primo per priorita' di fonte (manuale > discovered > feed) e poi per
+#   contenuto; inizio piu' presto, fine piu' tardi, descrizioni distinte concatenate,
+#   URL mappa + indirizzo dal primo evento non-feed che li ha;
+# - un evento da feed senza location viene assorbito (solo gli orari) dal master
+#   non-feed con location, se c'e'; altrimenti resta un evento a se';
+# - firme forti diverse (stesso titolo e giorno, location diverse) restano eventi distinti.
+SOURCE_PRIORITY = {'manual_from_file': 0, 'discovered': 1, 'ics_feed': 3}  # altre fonti: 2
+_LOCATION_UNKNOWN_SIGNATURES = ('', UNKNOWN_LOCATION)
 
-    for current_event_data in event_list_of_dicts:
-        weak_sig_curr, strong_sig_curr = create_event_signatures(current_event_data)
-        
-        dt_start_curr_obj = make_timezone_aware(parse_datetime_str(current_event_data.get('dtstart_str')))
-        if not dt_start_curr_obj: continue # Evento non valido
-
-        # Controlla se c'è già un evento con la stessa firma DEBOLE
-        if weak_sig_curr in weak_to_strong_map:
-            existing_event_strong_sig = weak_to_strong_map[weak_sig_curr]
-            existing_event_data = processed_events_by_strong_signature[existing_event_strong_sig]
-            
-            print(f"    INFO: Trovata corrispondenza debole (Summary+Data) tra NUOVO '{current_event_data.get('summary')}' e ESISTENTE '{existing_event_data.get('summary')}'")
-
-            is_current_from_feed = current_event_data.get('source_type') == 'ics_feed'
-            is_existing_manual = existing_event_data.get('source_type') != 'ics_feed' # o 'manual_from_file'
-            
-            current_loc_norm = normalize_location_for_signature(current_event_data.get('location_name',''))
-            existing_loc_norm = normalize_location_for_signature(existing_event_data.get('location_name',''))
-
-            # CASO 1: Nuovo da FEED senza location, Esistente MANUALE con location -> Priorità al manuale
-            if is_current_from_feed and is_existing_manual and \
-               current_loc_norm == 'unknown_location' and existing_loc_norm != 'unknown_location':
-                
-                print(f"      Merge: Feed senza loc. ('{current_event_data.get('summary')}') con Manuale con loc. ('{existing_event_data.get('summary')}'). Dettagli manuali mantenuti.")
-                # Aggiorna orari dell'evento manuale esistente se quelli del feed sono "migliori"
-                # (Questa logica di "migliore" potrebbe essere solo il timestamp o se uno è più preciso)
-                # Per ora, semplice sovrascrittura se diversi per semplicità
-                dt_end_curr_obj = make_timezone_aware(parse_datetime_str(current_event_data.get('dtend_str')))
-                dt_end_existing_obj = make_timezone_aware(parse_datetime_str(existing_event_data.get('dtend_str')))
-
-                if dt_start_curr_obj < make_timezone_aware(parse_datetime_str(existing_event_data.get('dtstart_str'))):
-                    existing_event_data['dtstart_str'] = current_event_data['dtstart_str']
-                if dt_end_curr_obj and dt_end_existing_obj:
-                    if dt_end_curr_obj > dt_end_existing_obj:
-                        existing_event_data['dtend_str'] = current_event_data['dtend_str']
-                elif dt_end_curr_obj and not dt_end_existing_obj:
-                    existing_event_data['dtend_str'] = current_event_data['dtend_str']
-                # Non toccare description, url mappa, ecc. del manuale.
-                processed_events_by_strong_signature[existing_event_strong_sig] = existing_event_data
-                continue # L'evento corrente dal feed è stato "assorbito"
-
-            # CASO 2: Altre corrispondenze deboli -> Procedi con il confronto della firma forte e merge standard
-            if strong_sig_curr == existing_event_strong_sig: # Stessa firma forte, sono lo stesso evento
-                print(f"      Merge: Stessa firma forte per '{current_event_data.get('summary')}'. Applico merge standard.")
-                # Logica di merge standard (come l'avevamo prima)
-                dt_end_curr_obj = make_timezone_aware(parse_datetime_str(current_event_data.get('dtend_str')))
-                dt_start_existing_obj = make_timezone_aware(parse_datetime_str(existing_event_data.get('dtstart_str')))
-                dt_end_existing_obj = make_timezone_aware(parse_datetime_str(existing_event_data.get('dtend_str')))
-
-                if dt_start_curr_obj < dt_start_existing_obj:
-                    existing_event_data['dtstart_str'] = current_event_data['dtstart_str']
-                if dt_end_curr_obj and dt_end_existing_obj:
-                    if dt_end_curr_obj > dt_end_existing_obj:
-                        existing_event_data['dtend_str'] = current_event_data['dtend_str']
-                elif dt_end_curr_obj and not dt_end_existing_obj:
-                    existing_event_data['dtend_str'] = current_event_data['dtend_str']
-                
-                ex_desc = str(existing_event_data.get('description', '')).strip()
-                new_desc = str(current_event_data.get('description', '')).strip()
-                if new_desc and new_desc.lower() != ex_desc.lower(): # Unisci solo se diverse
-                    merged_desc = f"{ex_desc}\n---\n{new_desc}" if ex_desc else new_desc
-                    existing_event_data['description'] = merged_desc
-                
-                # Arricchisci con URL mappa e indirizzo se il corrente è manuale e l'esistente no
-                if current_event_data.get('source_type') != 'ics_feed' and current_event_data.get('google_maps_url_str'):
-                    if not existing_event_data.get('google_maps_url_str'):
-                        existing_event_data['google_maps_url_str'] = current_event_data.get('google_maps_url_str')
-                        existing_event_data['location_address'] = current_event_data.get('location_address', existing_event_data.get('location_address',''))
-                
-                processed_events_by_strong_signature[strong_sig_curr] = existing_event_data
-                continue # Evento mergiato
-            else:
-                # Firme deboli uguali, ma forti diverse (es. stessa partita, date diverse ma location normalizzate diverse)
-                # Li trattiamo come eventi distinti per ora, aggiungendo quello nuovo.
-                # Potrebbe essere un'area di ulteriore affinamento se questo produce duplicati indesiderati.
-                print(f"    INFO: Firme deboli uguali ma forti diverse. Aggiungo '{current_event_data.get('summary')}' come nuovo.")
-                processed_events_by_strong_signature[strong_sig_curr] = current_event_data.copy()
-                weak_to_strong_map[weak_sig_curr] = strong_sig_curr # Aggiorna la mappa debole alla firma forte del *nuovo* evento se lo consideriamo "dominante" o più recente. O NON aggiornare, se vogliamo che il primo match debole sia il "master". Da decidere. Per ora, sovrascrivo.
+
+def _dedup_priority_key(rec):
+    """Ordine totale tra i candidati di un gruppo: fonte, poi contenuto (chiave per chiave)."""
+    return (
+        SOURCE_PRIORITY.get(rec.get('source_type'), 2),
+        rec.dtstart,
+        rec.dtend is None, rec.dtend or rec.dtstart,
+        sorted((key, str(value)) for key, value in rec.to_dict().items()),
+    )
+
+
+def merge_event_group(candidates):
+    """Fonde i candidati di un gruppo debole (gia' in ordine di priorita'). Ritorna nuovi record."""
+    by_strong = {}
+    for rec in candidates:
+        by_strong.setdefault(rec.strong_signature, []).append(rec)
+
+    merged = []
+    absorbed_feeds = []
+    for strong_sig, members in by_strong.items():
+        master = members[0]
+        if (master.get('source_type') == 'ics_feed' and strong_sig[2] in _LOCATION_UNKNOWN_SIGNATURES):
+            # Solo feed senza location in questo sotto-gruppo: candidati all'assorbimento
+            absorbed_feeds.append(members)
+            continue
+        merged.append(merge_strong_group(members))
+
+    hosts = [m for m in merged if m.get('source_type') != 'ics_feed' and m.strong_signature[2] not in _LOCATION_UNKNOWN_SIGNATURES]
+    for members in absorbed_feeds:
+        feed_event = merge_strong_group(members)
+        if hosts:
+            print(f"      Merge: Feed senza loc. ('{feed_event.get('summary')}') con Manuale con loc. ('{hosts[0].get('summary')}'). Dettagli manuali mantenuti.")
+            merge_event_times(hosts[0], feed_event)
         else:
-            # Nessuna corrispondenza debole, è un evento nuovo per summary+data
-            processed_events_by_strong_signature[strong_sig_curr] = current_event_data.copy()
-            weak_to_strong_map[weak_sig_curr] = strong_sig_curr
-            # print(f"  Aggiunto nuovo evento (firma debole unica): {current_event_data.get('summary')}")
-    
-    final_list = list(processed_events_by_strong_signature.values())
+            merged.append(feed_event)
+    return merged
+
+
+def merge_strong_group(members):
+    master = members[0].copy()
+    for rec in members[1:]:
+        merge_event_times(master, rec)
+        ex_desc = str(master.get('description', '')).strip()
+        new_desc = str(rec.get('description', '')).strip()
+        if new_desc and new_desc.lower() != ex_desc.lower(): # Unisci solo se diverse
+            master.set('description', f"{ex_desc}\n---\n{new_desc}" if ex_desc else new_desc)
+        # Arricchisci con URL mappa e indirizzo se il candidato è manuale e il master no
+        if rec.get('source_type') != 'ics_feed' and rec.get('google_maps_url_str') and not master.get('google_maps_url_str'):
+            master.set('google_maps_url_str', rec.get('google_maps_url_str'))
+            master.set('location_address', rec.get('location_address', master.get('location_address', '')))
+    return master
+
+
+def deduplicate_events(event_records, label=None):
+    """De-duplica una lista di EventRecord (o dict, convertiti). Ritorna nuovi record
+    ordinati per firma debole; quelli in ingresso non vengono modificati.
+    `label` identifica la chiamata nel report del run (telemetria.py)."""
+    candidates = [rec for rec in as_event_records(event_records) if rec.dtstart]
+    print(f"  Inizio de-duplicazione per {len(candidates)} eventi candidati...")
+    candidates.sort(key=lambda rec: rec.strong_signature[:2])
+    final_list = []
+    weak_merges = strong_merges = 0
+    for _weak_sig, group in groupby(candidates, key=lambda rec: rec.strong_signature[:2]):
+        group = list(group)
+        if len(group) == 1:
+            final_list.append(group[0].copy())
+            continue
+        group.sort(key=_dedup_priority_key)
+        merged = merge_event_group(group)
+        distinct_strong = len({rec.strong_signature for rec in group})
+        strong_merges += len(group) - distinct_strong
+        weak_merges += distinct_strong - len(merged)
+        print(f"    INFO: {len(group)} candidati per '{group[0].get('summary')}' ({group[0].dtstart.date()}) -> {len(merged)} eventi")
+        final_list.extend(merged)
     print(f"  De-duplicazione completata. Eventi unici/mergiati: {len(final_list)}")
+    telemetria.record_dedup(label or 'dedup', len(event_records), len(final_list), weak_merges, strong_merges)
     return final_list
 
+
+def merge_event_times(existing_event, current_event):
+    """Inizio piu' presto e fine piu' tardi tra i due eventi, scritti su existing_event."""
+    if current_event.dtstart < existing_event.dtstart:
+        existing_event.set('dtstart_str', current_event['dtstart_str'])
+    if current_event.dtend and (not existing_event.dtend or current_event.dtend > existing_event.dtend):
+        existing_event.set('dtend_str', current_event['dtend_str'])
+
 def create_calendar_from_event_dicts(event_dictionaries, calendar_display_name):
     final_calendar = Calendar()
     final_calendar.add('prodid', f'-//Generated Calendar ({TARGET_TIMEZONE_STR})//calendari.danielecarletti//')
@@ -319,13 +952,13 @@ def create_calendar_from_event_dicts(event_dictionaries, calendar_display_name):
     final_calendar.add('X-WR-TIMEZONE', TARGET_TIMEZONE_STR)
     # Ordino gli eventi per dtstart per garantire output deterministico (stesso ordine tra run)
     sorted_events = sorted(
-        event_dictionaries,
+        as_event_records(event_dictionaries),
         key=lambda e: (e.get('dtstart_str') or '', e.get('summary') or '')
     )
     for event_dict in sorted_events:
         ics_event = Event()
-        dtstart = make_timezone_aware(parse_datetime_str(event_dict.get('dtstart_str')))
-        dtend = make_timezone_aware(parse_datetime_str(event_dict.get('dtend_str')))
+        dtstart = event_dict.dtstart
+        dtend = event_dict.dtend
         if not dtstart: continue
         summary_val = event_dict.get('summary', 'Evento Senza Titolo')
         loc_name = event_dict.get('location_name', '')
@@ -338,17 +971,136 @@ def create_calendar_from_event_dicts(event_dictionaries, calendar_display_name):
         ics_event.add('dtstamp', stable_dtstamp(dtstart))
         if location_string: ics_event.add('location', location_string)
         if event_dict.get('description'): ics_event.add('description', event_dict.get('description'))
-        if event_dict.get('google_maps_url_str'): ics_event.add('url', event_dict.get('google_maps_url_str'))
+        url = _ics_uri(event_dict.get('google_maps_url_str') or '')
+        if url: ics_event.add('url', url)
         # UID deterministico: hash sha256(summary+dtstart+location) → stabile tra run
         ics_event.add('uid', stable_uid(summary_val, event_dict.get('dtstart_str'), loc_name))
         final_calendar.add_component(ics_event)
     return final_calendar
 
 
-def write_calendar_with_validation(cal_obj, target_path, label):
+# --- Serializzatore ICS streaming ---
+# Scrive l'RFC 5545 direttamente su file, un VEVENT alla volta, senza costruire il
+# Calendar icalendar ne' il documento intero in memoria. L'output e' byte-identico a
+# create_calendar_from_event_dicts(...).to_ical() (stesso ordine delle proprieta',
+# escaping, parametri e folding): quest'ultima resta come riferimento ed e' usata dal
+# controllo di regressione nel workflow.
+_ICS_QUOTABLE_PARAM_RE = re.compile("[,;:’]")
+_ICS_CONTROL_CHARS_RE = re.compile(r'[\x00-\x1f\x7f]')
+
+
+def _ics_text(value):
+    """Escaping TEXT, come icalendar.parser.escape_char (ordine delle sostituzioni incluso)."""
+    return (str(value).replace('\\N', '\n').replace('\\', '\\\\').replace(';', '\\;')
+            .replace(',', '\\,').replace('\r\n', '\\n').replace('\n', '\\n'))
+
+
+def _ics_uri(value):
+    """Valore URI per URL: senza escaping in RFC 5545, quindi via i caratteri di
+    controllo (un CR/LF spezzerebbe la riga e renderebbe l'ICS invalido)."""
+    return _ICS_CONTROL_CHARS_RE.sub('', str(value))
+
+
+def _ics_param(value):
+    value = value.replace('"', "'")
+    return f'"{value}"' if _ICS_QUOTABLE_PARAM_RE.search(value) else value
+
+
+def _ics_fold(line, limit=75):
+    """Folding con gli stessi punti di taglio di icalendar.parser.foldline."""
+    if line.isascii():
+        if len(line) < limit:
+            return line
+        return '\r\n '.join(line[i:i + limit - 1] for i in range(0, len(line), limit - 1))
+    chunks = []
+    byte_count = 0
+    for char in line:
+        char_byte_len = len(char.encode('utf-8'))
+        byte_count += char_byte_len
+        if byte_count >= limit:
+            chunks.append('\r\n ')
+            byte_count = char_byte_len
+        chunks.append(char)
+    return ''.join(chunks)
+
+
+def _ics_datetime_line(name, dt):
+    value = f"{dt.year:04}{dt.month:02}{dt.day:02}T{dt.hour:02}{dt.minute:02}{dt.second:02}"
+    tzid = getattr(dt.tzinfo, 'zone', None)
+    if tzid == 'UTC':
+        return f"{name}:{value}Z"
+    if tzid:
+        return f"{name};TZID={_ics_param(tzid)}:{value}"
+    return f"{name}:{value}"
+
+
+def serializable_events(event_records):
+    """Record ordinati come nell'output (dtstart, summary). Gli eventi senza dtstart
+    valido sono esclusi: len() del risultato = numero di VEVENT."""
+    return sorted(
+        (rec for rec in as_event_records(event_records) if rec.dtstart),
+        key=lambda e: (e.get('dtstart_str') or '', e.get('summary') or '')
+    )
+
+
+def iter_ics_chunks(prepared_events, calendar_display_name):
+    """Genera l'ICS a pezzi (bytes, uno per VEVENT) da serializable_events(...)."""
+    header = [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        f"PRODID:{_ics_text(f'-//Generated Calendar ({TARGET_TIMEZONE_STR})//calendari.danielecarletti//')}",
+        f"X-WR-CALNAME:{_ics_text(calendar_display_name)}",
+        f"X-WR-TIMEZONE:{_ics_text(TARGET_TIMEZONE_STR)}",
+    ]
+    yield ('\r\n'.join(_ics_fold(line) for line in header) + '\r\n').encode('utf-8')
+    for event_dict in prepared_events:
+        dtstart, dtend = event_dict.dtstart, event_dict.dtend
+        summary_val = event_dict.get('summary', 'Evento Senza Titolo')
+        loc_name = event_dict.get('location_name', '')
+        loc_addr = event_dict.get('location_address', '')
+        location_string = f"{loc_name} - {loc_addr}".strip().strip('-').strip() if loc_name and loc_addr else loc_name or loc_addr
+        # Ordine canonico icalendar (SUMMARY, DTSTART, DTEND, DTSTAMP, UID), poi alfabetico
+        lines = ["BEGIN:VEVENT", f"SUMMARY:{_ics_text(summary_val)}", _ics_datetime_line("DTSTART", dtstart)]
+        if dtend: lines.append(_ics_datetime_line("DTEND", dtend))
+        lines.append(_ics_datetime_line("DTSTAMP", stable_dtstamp(dtstart)))
+        lines.append(f"UID:{_ics_text(event_uid(event_dict))}")
+        if event_dict.get('description'): lines.append(f"DESCRIPTION:{_ics_text(event_dict.get('description'))}")
+        if location_string: lines.append(f"LOCATION:{_ics_text(location_string)}")
+        url = _ics_uri(event_dict.get('google_maps_url_str') or '')
+        if url: lines.append(f"URL:{url}")
+        lines.append("END:VEVENT")
+        yield ('\r\n'.join(_ics_fold(line) for line in lines) + '\r\n').encode('utf-8')
+    yield b"END:VCALENDAR\r\n"
+
+
+def write_ics_stream(prepared_events, calendar_display_name, fh):
+    """Scrive l'ICS su un file binario aperto, evento per evento. Ritorna il numero di VEVENT."""
+    for chunk in iter_ics_chunks(prepared_events, calendar_display_name):
+        fh.write(chunk)
+    return len(prepared_events)
+
+
+def write_ics_file(prepared_events, calendar_display_name, target_path):
+    """Scrive l'ICS (streaming, atomico) e il suo indice sidecar, solo se cambiati.
+    Il contenuto viene prima serializzato solo per l'hash, senza tenerlo in memoria:
+    se coincide col file esistente non si scrive niente. Ritorna True se l'ICS e' cambiato."""
+    digest = hashlib.sha256()
+    size = 0
+    for chunk in iter_ics_chunks(prepared_events, calendar_display_name):
+        digest.update(chunk)
+        size += len(chunk)
+    changed = not same_content(target_path, digest.hexdigest(), size)
+    if changed:
+        atomic_write(target_path, iter_ics_chunks(prepared_events, calendar_display_name))
+    write_ics_index(target_path, prepared_events, digest.hexdigest(), size)
+    return changed
+
+
+def write_calendar_with_validation(event_dictionaries, calendar_display_name, target_path, label):
     """Scrive l'ICS solo se l'output rispetta le soglie minime di sanità.
     Protegge da feed temporaneamente vuoto che svuoterebbe il calendario pubblico."""
-    new_count = sum(1 for _ in cal_obj.walk('VEVENT'))
+    prepared_events = serializable_events(event_dictionaries)
+    new_count = len(prepared_events)
     old_count = count_events_in_ics_file(target_path)
     if new_count < MIN_AGGREGATED_EVENTS:
         log(f"ERRORE [{label}]: nuovo conteggio eventi {new_count} < soglia minima {MIN_AGGREGATED_EVENTS}. NON sovrascrivo {target_path}.")
@@ -357,201 +1109,303 @@ def write_calendar_with_validation(cal_obj, target_path, label):
         log(f"ERRORE [{label}]: nuovo conteggio {new_count} < {SHRINK_TOLERANCE*100:.0f}% del precedente ({old_count}). NON sovrascrivo {target_path}.")
         return False
     try:
-        with open(target_path, 'wb') as f:
-            f.write(cal_obj.to_ical())
-        log(f"  OK [{label}] salvato in {target_path} ({new_count} eventi, prima {old_count}).")
+        if write_ics_file(prepared_events, calendar_display_name, target_path):
+            log(f"  OK [{label}] salvato in {target_path} ({new_count} eventi, prima {old_count}).")
+        else:
+            log(f"  OK [{label}] invariato: {target_path} ({new_count} eventi).")
         return True
     except Exception as e:
         log(f"ERRORE [{label}] in scrittura {target_path}: {e}")
         return False
 
+def publish_view(name, view, events, output_dir, script_dir):
+    """Scrive l'ICS di una vista di CALENDAR_VIEWS e la sua copia in root. Ritorna False
+    se l'ICS non e' stato scritto per validazione fallita o errore."""
+    target_path = output_dir / view['file']
+    if view.get('required'):
+        if not write_calendar_with_validation(events, view['title'], target_path, name):
+            return False
+    elif not events:
+        log(f"  Nessun evento per la vista {name} in questo run; non sovrascrivo l'output esistente.")
+        return True
+    else:
+        try:
+            if write_ics_file(serializable_events(events), view['title'], target_path):
+                log(f"  OK [{name}] salvato in {target_path} ({len(events)} eventi).")
+            else:
+                log(f"  OK [{name}] invariato: {target_path} ({len(events)} eventi).")
+        except Exception as e:
+            log(f"  ERRORE in scrittura della vista {name}: {e}")
+            return False
+    if view.get('compat_copy'):
+        # Copia esatta per gli URL pubblici storici: chi era iscritto via webcal continua a funzionare.
+        compat_path = script_dir / view['compat_copy']
+        try:
+            if copy_if_changed(target_path, compat_path):
+                log(f"  OK [compat] copia in {compat_path}")
+            else:
+                log(f"  OK [compat] {compat_path} gia' aggiornato")
+        except Exception as e:
+            log(f"  WARN: impossibile aggiornare {compat_path}: {e}")
+    return True
+
+
+# --- Fase 1c: rendering dei mesi, anche in parallelo ---
+# Ogni mese e' indipendente (dedup + ICS mensile): con --jobs N > 1 i mesi vanno a un
+# pool di processi. Ai worker passano dict (picklabili), il log di ogni mese viene
+# catturato e stampato dal processo principale nell'ordine dei mesi; i risultati
+# tornano in ordine di mese, quindi l'output non dipende dal numero di processi.
+def render_month(month_key, events, output_dir):
+    """Dedup + ICS mensile di un mese. Ritorna (eventi de-duplicati, ICS scritto senza errori)."""
+    log(f"  Mese {month_key}: {len(events)} eventi totali (pre-dedup).")
+    processed_monthly_events = deduplicate_events(events, label=f"mese {month_key}")
+    monthly_prepared_events = serializable_events(processed_monthly_events)
+    if len(monthly_prepared_events) > 0:
+        output_ics_file_path = output_dir / f"eventi_{month_key}.ics"
+        try:
+            if write_ics_file(monthly_prepared_events, f'Eventi San Siro - {month_key}', output_ics_file_path):
+                log(f"    Calendario mensile salvato in: {output_ics_file_path}")
+            else:
+                log(f"    Calendario mensile invariato: {output_ics_file_path}")
+        except Exception as e:
+            log(f"    ERRORE nello scrivere il file ICS mensile {output_ics_file_path}: {e}")
+            return processed_monthly_events, False
+    return processed_monthly_events, True
+
+
+def _render_month_worker(month_key, event_dicts, output_dir):
+    telemetria.start_worker()
+    out = io.StringIO()
+    with redirect_stdout(out):
+        processed, ok = render_month(month_key, event_dicts, output_dir)
+    return records_to_dicts(processed), ok, out.getvalue(), telemetria.take_worker_records()
+
+
+def render_months(months, output_dir, jobs=1):
+    """{mese: (eventi de-duplicati, ok)} per [(mese, eventi), ...]; jobs > 1 usa un pool di processi."""
+    jobs = jobs or os.cpu_count() or 1
+    if jobs <= 1 or len(months) <= 1:
+        return {month_key: render_month(month_key, events, output_dir) for month_key, events in months}
+    rendered = {}
+    with ProcessPoolExecutor(max_workers=min(jobs, len(months))) as executor:
+        futures = [(month_key, executor.submit(_render_month_worker, month_key, records_to_dicts(events), output_dir))
+                   for month_key, events in months]
+        for month_key, future in futures:
+            event_dicts, ok, month_log, records = future.result()
+            sys.stdout.write(month_log)
+            sys.stdout.flush()
+            telemetria.merge_worker_records(records)
+            rendered[month_key] = (as_event_records(event_dicts), ok)
+    return rendered
+
+
+# --- Manifest di build incrementale ---
+# .cache/build_manifest.json registra, per ogni mese, l'hash dei file sorgente e del
+# generatore e la lista di eventi de-duplicati risultante. I mesi con input invariati
+# non vengono ne' ricaricati ne' ri-serializzati: i loro eventi passano direttamente
+# all'aggregato. Lo stesso vale per l'aggregato (mesi + partite dai feed).
+def _sha256_file(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 16), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def generator_fingerprint(script_dir):
+    h = hashlib.sha256()
+    for name in GENERATOR_SOURCE_FILES:
+        h.update(name.encode('utf-8'))
+        h.update(_sha256_file(script_dir / name).encode('ascii'))
+    return h.hexdigest()
+
+
+def _build_key(*parts):
+    return hashlib.sha256(json.dumps(parts, sort_keys=True, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+def load_build_manifest(path):
+    try:
+        manifest = json.loads(path.read_text(encoding='utf-8'))
+        if isinstance(manifest, dict):
+            return manifest
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        log(f"  WARN: manifest di build illeggibile ({e}); rigenero tutto.")
+    return {}
+
+
+def save_build_manifest(path, manifest):
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix('.tmp')
+        tmp_path.write_text(json.dumps(manifest, ensure_ascii=False), encoding='utf-8')
+        os.replace(tmp_path, path)
+    except Exception as e:
+        log(f"  WARN: impossibile salvare il manifest di build {path}: {e}")
+
+
+def plan_monthly_builds(files_by_month, script_dir, output_dir, manifest, fingerprint, force=False):
+    """Ritorna (mesi_da_rigenerare, {mese: chiave_input}). Un mese e' riusabile se la
+    chiave (generatore + hash dei file) coincide col manifest e il suo output esiste."""
+    month_keys = {}
+    to_build = set()
+    cached_months = manifest.get('months', {})
+    for month_key, paths in files_by_month.items():
+        inputs = {str(p.relative_to(script_dir)): _sha256_file(p) for p in paths}
+        month_keys[month_key] = _build_key(fingerprint, inputs)
+        cached = cached_months.get(month_key)
+        if force or not cached or cached.get('key') != month_keys[month_key]:
+            to_build.add(month_key)
+        elif cached.get('events') and not (output_dir / f"eventi_{month_key}.ics").exists():
+            to_build.add(month_key)
+    return to_build, month_keys
+
+
 # --- Script Principale ---
-def main():
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Genera i calendari ICS mensili, l'aggregato e Lampugnano.")
+    parser.add_argument('--force', action='store_true',
+                        help="ignora il manifest di build e rigenera tutti i mesi e l'aggregato")
+    parser.add_argument('--jobs', type=int, default=1, metavar='N',
+                        help="processi per la generazione dei mesi (Fase 1c); 0 = tutti i core (default: 1)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
     script_dir = Path(__file__).resolve().parent
+    telemetria.start_run(argv)
+    status = 'errore'
+    try:
+        generate(args, script_dir)
+        status = 'ok'
+    except SystemExit as e:
+        status = 'ok' if not e.code else f'uscita {e.code}'
+        raise
+    finally:
+        telemetria.finish_run(script_dir / OUTPUT_ICS_FOLDER_NAME / telemetria.RUN_REPORT_FILENAME, status)
+
+
+def generate(args, script_dir):
     data_source_dir = script_dir / DATA_SOURCE_FOLDER_NAME
     output_dir = script_dir / OUTPUT_ICS_FOLDER_NAME
     if not data_source_dir.is_dir():
         log(f"ERRORE FATALE: La cartella dei dati sorgente '{data_source_dir}' non è stata trovata.")
         sys.exit(1)
     output_dir.mkdir(parents=True, exist_ok=True)
+    views = compile_views(CALENDAR_VIEWS)
     all_events_for_aggregation = []
 
-    # Raggruppo per mese (YYYY_MM): manuali da dati_grezzi/*.py + AI-discovered da discovered/*.json.
-    # I "discovered" sono eventi gia' revisionati e mergiati via PR (vedi discover_eventi.py).
-    events_by_month: dict[str, list] = {}
+    with telemetria.phase('1a/1b'):
+        manifest_path = script_dir / CACHE_FOLDER_NAME / BUILD_MANIFEST_FILENAME
+        manifest = load_build_manifest(manifest_path)
+        fingerprint = generator_fingerprint(script_dir)
+        discovered_dir = script_dir / DISCOVERED_FOLDER_NAME
+        files_by_month = list_source_files_by_month(data_source_dir, discovered_dir)
+        months_to_build, month_keys = plan_monthly_builds(
+            files_by_month, script_dir, output_dir, manifest, fingerprint, force=args.force)
+        log(f"  Manifest di build: {len(months_to_build)}/{len(files_by_month)} mesi da rigenerare"
+            f"{' (--force)' if args.force else ''}.")
 
-    log(f"--- Fase 1a: Eventi manuali da '{data_source_dir}' ---")
-    monthly_files = sorted(data_source_dir.glob("eventi_*.py"))
-    if not monthly_files:
-        log(f"  WARN: nessun file mensile in {data_source_dir}.")
-    for data_file_path in monthly_files:
-        log(f"  Processando file dati: {data_file_path.name}")
-        raw_events_monthly = load_event_list_from_file(data_file_path)
-        if not raw_events_monthly:
-            log(f"    Nessun evento caricato da {data_file_path.name}. Skip.")
-            continue
-        month_key = data_file_path.stem.replace("eventi_", "")  # 2026_06
-        events_by_month.setdefault(month_key, []).extend(raw_events_monthly)
-        log(f"    Caricati {len(raw_events_monthly)} eventi manuali per {month_key}.")
+        # Tutte le sorgenti passano dall'archivio SQLite: si reingeriscono solo i file cambiati,
+        # i mesi da rigenerare vengono letti con una query indicizzata per mese.
+        store_path = script_dir / CACHE_FOLDER_NAME / EVENT_STORE_FILENAME
+        log(f"--- Fase 1a/1b: Archivio eventi manuali + discovered ({store_path.name}) ---")
+        store = open_event_store(store_path)
+        inserted, updated, deleted = sync_file_sources(store, files_by_month, script_dir, SOURCE_TYPE_BY_SUFFIX)
+        log(f"  Archivio allineato: {inserted} righe inserite, {updated} aggiornate, {deleted} cancellate.")
+        telemetria.count('source_files', sum(len(paths) for paths in files_by_month.values()))
+        telemetria.count('store_rows_inserted', inserted)
+        telemetria.count('store_rows_updated', updated)
+        telemetria.count('store_rows_deleted', deleted)
+        manifest_months = {}
 
-    discovered_dir = script_dir / DISCOVERED_FOLDER_NAME
-    log(f"--- Fase 1b: Eventi AI-discovered da '{discovered_dir}' ---")
-    if discovered_dir.is_dir():
-        for json_file in sorted(discovered_dir.glob("eventi_*.json")):
-            try:
-                doc = json.loads(json_file.read_text(encoding="utf-8"))
-                json_events = doc.get("events", [])
-                month_key = json_file.stem.replace("eventi_", "")  # 2026_06
-                for ev in json_events:
-                    ev["source_type"] = "discovered"
-                    events_by_month.setdefault(month_key, []).append(ev)
-                log(f"  Caricati {len(json_events)} eventi discovered per {month_key} ({json_file.name}).")
-            except Exception as e:
-                log(f"  WARN: impossibile leggere {json_file.name}: {e}")
-    else:
-        log(f"  (Cartella {discovered_dir} non presente; skip.)")
+    with telemetria.phase('1c'):
+        log(f"--- Fase 1c: Generazione ICS mensili (manuali + discovered) ---")
+        rendered = render_months(
+            [(month_key, list(iter_month_events(store, month_key)))
+             for month_key in sorted(files_by_month.keys()) if month_key in months_to_build],
+            output_dir, jobs=args.jobs)
+        for month_key in sorted(files_by_month.keys()):
+            if month_key not in months_to_build:
+                cached_events = as_event_records(manifest['months'][month_key]['events'])
+                log(f"  Mese {month_key}: input invariati, riuso {len(cached_events)} eventi dal manifest.")
+                all_events_for_aggregation.extend(cached_events)
+                manifest_months[month_key] = manifest['months'][month_key]
+                telemetria.count('months_reused')
+                continue
+            processed_monthly_events, ok = rendered[month_key]
+            all_events_for_aggregation.extend(processed_monthly_events)
+            telemetria.count('months_rebuilt')
+            if ok:
+                manifest_months[month_key] = {'key': month_keys[month_key], 'events': records_to_dicts(processed_monthly_events)}
+            # altrimenti il mese resta fuori dal manifest: da rigenerare al prossimo run
 
-    log(f"--- Fase 1c: Generazione ICS mensili (manuali + discovered) ---")
-    for month_key in sorted(events_by_month.keys()):
-        events = events_by_month[month_key]
-        log(f"  Mese {month_key}: {len(events)} eventi totali (pre-dedup).")
-        processed_monthly_event_dicts = apply_deduplication_and_merge(events)
-        all_events_for_aggregation.extend(processed_monthly_event_dicts)
+        manifest = {'generator': fingerprint, 'months': manifest_months, 'aggregate': manifest.get('aggregate', {})}
+        save_build_manifest(manifest_path, manifest)
 
-        display_name_monthly = f'Eventi San Siro - {month_key}'
-        monthly_calendar_obj = create_calendar_from_event_dicts(processed_monthly_event_dicts, display_name_monthly)
+    with telemetria.phase('2'):
+        log(f"--- Fase 2: Processamento Calendari Partite da URL ---")
+        # Stagione calcistica italiana: 1 luglio -> 30 giugno. Includiamo le ultime
+        # SEASONS_LOOKBACK stagioni (corrente + N-1 precedenti) come archivio rolling.
+        # Es. SEASONS_LOOKBACK=2 con oggi=2026-05 -> include dal 1/7/2024 (stagione 24-25 + 25-26).
+        # Quando inizia la stagione 26-27 (1 luglio 2026), la 24-25 esce automaticamente.
+        SEASONS_LOOKBACK = 2
+        now_local = datetime.now(TARGET_TIMEZONE_OBJ)
+        current_season_start_year = now_local.year if now_local.month >= 7 else now_local.year - 1
+        start_year = current_season_start_year - (SEASONS_LOOKBACK - 1)
+        data_riferimento_feed = TARGET_TIMEZONE_OBJ.localize(datetime(start_year, 7, 1))
+        log(f"  Includo partite dal {data_riferimento_feed.date()} (ultime {SEASONS_LOOKBACK} stagioni).")
 
-        if len(monthly_calendar_obj.walk('VEVENT')) > 0:
-            output_ics_file_path = output_dir / f"eventi_{month_key}.ics"
-            try:
-                with open(output_ics_file_path, 'wb') as f: f.write(monthly_calendar_obj.to_ical())
-                log(f"    Calendario mensile salvato in: {output_ics_file_path}")
-            except Exception as e:
-                log(f"    ERRORE nello scrivere il file ICS mensile {output_ics_file_path}: {e}")
-
-    log(f"--- Fase 2: Processamento Calendari Partite da URL ---")
-    # Stagione calcistica italiana: 1 luglio -> 30 giugno. Includiamo le ultime
-    # SEASONS_LOOKBACK stagioni (corrente + N-1 precedenti) come archivio rolling.
-    # Es. SEASONS_LOOKBACK=2 con oggi=2026-05 -> include dal 1/7/2024 (stagione 24-25 + 25-26).
-    # Quando inizia la stagione 26-27 (1 luglio 2026), la 24-25 esce automaticamente.
-    SEASONS_LOOKBACK = 2
-    now_local = datetime.now(TARGET_TIMEZONE_OBJ)
-    current_season_start_year = now_local.year if now_local.month >= 7 else now_local.year - 1
-    start_year = current_season_start_year - (SEASONS_LOOKBACK - 1)
-    data_riferimento_feed = TARGET_TIMEZONE_OBJ.localize(datetime(start_year, 7, 1))
-    log(f"  Includo partite dal {data_riferimento_feed.date()} (ultime {SEASONS_LOOKBACK} stagioni).")
-
-    feed_failures = 0
-    for team_key, url in CALENDAR_URLS.items():
-        club_name_for_feed = "AC Milan" if team_key.lower() == "milan" else team_key.capitalize()
-        if team_key.lower() == "inter": club_name_for_feed = "Inter"
-
-        log(f"  Scaricando calendario per: {club_name_for_feed} da {url}")
-        calendar_data_from_url = get_calendar_from_url(url)
-        if not calendar_data_from_url:
-            feed_failures += 1
-            continue
-
-        team_events_added_count = 0
-        for component in calendar_data_from_url.walk('VEVENT'):
-            summary_text = str(component.get('summary', ''))
-            location_text = str(component.get('location', ''))
-            dtstart_prop = component.get('dtstart')
-            if not dtstart_prop: continue
-            
-            dtstart_event_obj_orig = dtstart_prop.dt
-            dtstart_event_obj_aware = make_timezone_aware(dtstart_event_obj_orig, TARGET_TIMEZONE_OBJ)
-            if not dtstart_event_obj_aware: continue
-
-            # Filtro Data per i feed
-            # Se usi il filtro stagione per test:
-            # if not (data_riferimento_feed_inizio_stagione <= dtstart_event_obj_aware <= data_riferimento_feed_fine_stagione):
-            #     continue
-            # Filtro per produzione (eventi futuri o recenti):
-            if dtstart_event_obj_aware < data_riferimento_feed: # Usa questo per la produzione
-                 continue
-
-            is_home_match_candidate = False
-            summary_parts = [p.strip() for p in re.split(r'\s+vs\s+|\s+-\s+', summary_text, 1)]
-            if len(summary_parts) > 0 and club_name_for_feed.lower() in summary_parts[0].lower():
-                remaining_summary_part = re.sub(re.escape(club_name_for_feed), '', summary_parts[0], flags=re.IGNORECASE).strip()
-                if not re.search(r'[a-zA-Z0-9]', remaining_summary_part):
-                    is_home_match_candidate = True
-
-            # Detection casa:
-            # 1. club primo nel summary (es. "AC Milan - Cagliari" -> casa Milan): la
-            #    convention osservata su ics.fixtur.es e' "home - away".
-            # 2. se il feed popola LOCATION, deve essere una location nota (sanity check).
-            #    Oggi ics.fixtur.es lascia LOCATION vuota su TUTTI gli eventi: in quel
-            #    caso ci basiamo solo sul summary (era il comportamento storico).
-            #    Se in futuro il feed iniziasse a popolare LOCATION con qualcosa di
-            #    diverso da San Siro per le partite casalinghe, il match e' un warning.
-            is_truly_relevant_match = False
-            if is_home_match_candidate:
-                if location_text:
-                    normalized_feed_location = normalize_location_for_signature(location_text)
-                    if normalized_feed_location in LOCATION_ALIASES:
-                        is_truly_relevant_match = True
-                    else:
-                        log(f"    SKIP feed match con location estranea: '{summary_text}' loc='{location_text}'")
-                else:
-                    # Location assente: ci fidiamo del summary (case attuale di ics.fixtur.es)
-                    is_truly_relevant_match = True
-            
-            if is_truly_relevant_match:
-                event_dict = ical_event_component_to_dict(component)
-                if event_dict.get('dtstart_str'):
-                    all_events_for_aggregation.append(event_dict)
-                    team_events_added_count += 1
-                    log(f"    + casa: {dtstart_event_obj_aware.date()} {summary_text}")
-        log(f"    Totale {team_events_added_count} partite casalinghe aggiunte da {club_name_for_feed}.")
-
-    # Safety net: se TUTTI i feed sono falliti, non sovrascrivere l'aggregato (rischio calendario vuoto)
-    if feed_failures == len(CALENDAR_URLS):
-        log(f"ERRORE FATALE: tutti i {feed_failures} feed sono falliti. ABORT senza scrivere l'aggregato.")
-        sys.exit(1)
+        feed_cache_dir = script_dir / CACHE_FOLDER_NAME / "feed"
+        feed_failures = 0
+        feed_hashes = {}
+        for team_key, home_events in load_all_feeds_home_events(CALENDAR_URLS, data_riferimento_feed, feed_cache_dir):
+            if home_events is None:
+                feed_failures += 1
+                telemetria.count('feed_failures')
+                continue
+            feed_hashes[team_key] = _build_key(home_events)
+            ingest_source(store, CALENDAR_URLS[team_key], 'feed', home_events)
+            all_events_for_aggregation.extend(as_event_records(home_events))
+        deleted = prune_feed_sources(store, CALENDAR_URLS.values())
+        if deleted:
+            log(f"  Archivio: rimosse {deleted} righe di feed non piu' in CALENDAR_URLS.")
 
-    log(f"--- Fase 3: Creazione Calendario Aggregato Finale ---")
-    log(f"  Eventi totali prima della de-duplicazione: {len(all_events_for_aggregation)}")
-    final_unique_event_dicts = apply_deduplication_and_merge(all_events_for_aggregation)
-    aggregated_calendar_obj = create_calendar_from_event_dicts(final_unique_event_dicts, 'Eventi San Siro (Aggregato)')
-
-    aggregated_ics_file_path = output_dir / AGGREGATED_ICS_FILENAME
-    ok_agg = write_calendar_with_validation(aggregated_calendar_obj, aggregated_ics_file_path, 'aggregato')
-    if not ok_agg:
-        log("ABORT: validazione aggregato fallita.")
-        sys.exit(1)
+        # Safety net: se TUTTI i feed sono falliti, non sovrascrivere l'aggregato (rischio calendario vuoto)
+        if feed_failures == len(CALENDAR_URLS):
+            log(f"ERRORE FATALE: tutti i {feed_failures} feed sono falliti. ABORT senza scrivere l'aggregato.")
+            sys.exit(1)
 
-    # Mantengo per compatibilità l'URL pubblico storico /eventi_san_siro_merged.ics
-    # come copia esatta dell'aggregato (chi era già iscritto via webcal continua a funzionare).
-    root_merged_path = script_dir / "eventi_san_siro_merged.ics"
-    try:
-        shutil.copyfile(aggregated_ics_file_path, root_merged_path)
-        log(f"  OK [compat] copia in {root_merged_path}")
-    except Exception as e:
-        log(f"  WARN: impossibile aggiornare {root_merged_path}: {e}")
+    with telemetria.phase('3'):
+        log(f"--- Fase 3: Creazione Calendario Aggregato Finale ---")
+        log(f"  Eventi totali prima della de-duplicazione: {len(all_events_for_aggregation)}")
+        telemetria.count('aggregate_events_in', len(all_events_for_aggregation))
+        aggregate_key = _build_key(fingerprint, {m: e['key'] for m, e in manifest_months.items()}, feed_hashes)
+        cached_aggregate = manifest.get('aggregate', {})
+        if not args.force and cached_aggregate.get('key') == aggregate_key:
+            final_unique_events = as_event_records(cached_aggregate['events'])
+            log(f"  Mesi e feed invariati: riuso {len(final_unique_events)} eventi de-duplicati dal manifest.")
+        else:
+            final_unique_events = deduplicate_events(all_events_for_aggregation, label='aggregato')
+        telemetria.count('aggregate_events_out', len(final_unique_events))
 
-    # --- Fase 4: Calendario Lampugnano (sottoinsieme filtrato per Ippodromo SNAI La Maura) ---
-    log("--- Fase 4: Generazione calendario Lampugnano (Ippodromo SNAI La Maura) ---")
-    lampugnano_events = [
-        e for e in final_unique_event_dicts
-        if normalize_location_for_signature(e.get('location_name', '')) == LAMPUGNANO_CANONICAL_LOCATION
-    ]
-    lampugnano_path = output_dir / "eventi_lampugnano.ics"
-    if lampugnano_events:
-        lamp_cal = create_calendar_from_event_dicts(lampugnano_events, 'Eventi Ippodromo La Maura (Lampugnano)')
-        # Validazione più permissiva per Lampugnano: pochi eventi nominali; non applico la soglia min globale
-        try:
-            with open(lampugnano_path, 'wb') as f:
-                f.write(lamp_cal.to_ical())
-            log(f"  OK [lampugnano] salvato in {lampugnano_path} ({len(lampugnano_events)} eventi).")
-            # Copia in root per compat con URL pubblico storico
-            shutil.copyfile(lampugnano_path, script_dir / "eventi_lampugnano.ics")
-            log(f"  OK [compat] copia in {script_dir / 'eventi_lampugnano.ics'}")
-        except Exception as e:
-            log(f"  ERRORE in scrittura Lampugnano: {e}")
-    else:
-        log("  Nessun evento Lampugnano per questo run; non sovrascrivo l'output esistente.")
+    with telemetria.phase('4'):
+        log(f"--- Fase 4: Viste pubblicate ({', '.join(CALENDAR_VIEWS)}) ---")
+        routed = route_events(final_unique_events, views)
+        # Prima le viste required: se una fallisce non si pubblica nient'altro.
+        for name, view in sorted(CALENDAR_VIEWS.items(), key=lambda item: not item[1].get('required')):
+            telemetria.count(f'view_{name}_events', len(routed[name]))
+            if not publish_view(name, view, routed[name], output_dir, script_dir) and view.get('required'):
+                log(f"ABORT: validazione della vista '{name}' fallita.")
+                sys.exit(1)
+        manifest['aggregate'] = {'key': aggregate_key, 'events': records_to_dicts(final_unique_events)}
+        save_build_manifest(manifest_path, manifest)
+        inserted, updated, deleted = replace_canonical_events(store, final_unique_events, event_uid)
+        log(f"  Archivio, eventi canonici: {inserted} inseriti, {updated} aggiornati, {deleted} cancellati.")
+        store.close()
 
     log("Processamento completato.")
 
@@ -0,0 +1,228 @@
+"""Indice per intervalli di tempo degli eventi de-duplicati: "cosa c'e' all'ora T",
+"cosa si sovrappone a [da, a)", "i prossimi N eventi", senza scorrere l'aggregato.
+
+    python intervalli.py at 2026-06-10T20:00 [--venue stadio-san-siro]
+    python intervalli.py range 2026-06-10T17:00 2026-06-10T23:00
+    python intervalli.py next [--from 2026-06-10T12:00] [-n 5] [--json]
+
+Gli eventi sono ordinati per inizio (secondi POSIX) in un vettore con bisect; per le
+sovrapposizioni basta guardare indietro di una durata massima, tenuta bassa separando
+gli eventi lunghi (piu' di un giorno, pochi) che si controllano a parte. Ogni query costa
+O(log n + risultati) anche su archivi di piu' stagioni. Gli eventi senza fine durano
+DEFAULT_EVENT_DURATION, come in discover_eventi.py.
+
+Le date naive (o solo data) sono ora locale Europe/Rome. Gli eventi si caricano dalla
+tabella canonical_events dell'archivio (o dal manifest di build): esegui prima il
+generatore.
+"""
+
+from __future__ import annotations
+
+import argparse
+import bisect
+import json
+import sqlite3
+import sys
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+import genera_calendari_mensili as gcm
+from archivio import EVENT_STORE_FILENAME, derived_columns_current, iter_canonical_events
+from evento import TARGET_TIMEZONE_OBJ, as_event_records, make_timezone_aware
+from normalizzazione import VENUES
+
+DEFAULT_EVENT_DURATION = timedelta(hours=2, minutes=30)
+LONG_EVENT_THRESHOLD_S = 24 * 3600
+DEFAULT_NEXT_N = 5
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+
+
+def log(msg):
+    print(f"[{datetime.now().isoformat(timespec='seconds')}] {msg}", flush=True)
+
+
+def load_canonical_events(script_dir):
+    """Eventi de-duplicati dall'archivio (canonical_events), o dal manifest di build se
+    l'archivio non c'e'. Ritorna (record, sorgente) o ([], None)."""
+    store_path = script_dir / gcm.CACHE_FOLDER_NAME / EVENT_STORE_FILENAME
+    if store_path.exists():
+        try:
+            conn = sqlite3.connect(f"file:{store_path}?mode=ro", uri=True)
+            conn.row_factory = sqlite3.Row
+            try:
+                if not derived_columns_current(conn):
+                    # venue_id dei record e' ricalcolato da EventRecord, ma la de-duplica
+                    # salvata e' quella della normalizzazione precedente
+                    log(f"  WARN: archivio {store_path.name} calcolato con un'altra normalizzazione o un altro "
+                        "registro venue: riesegui genera_calendari_mensili.py.")
+                records = list(iter_canonical_events(conn))
+            finally:
+                conn.close()
+            if records:
+                return records, store_path
+        except sqlite3.Error as e:
+            log(f"  WARN: archivio {store_path} illeggibile ({e}); provo il manifest.")
+    manifest_path = script_dir / gcm.CACHE_FOLDER_NAME / gcm.BUILD_MANIFEST_FILENAME
+    events = gcm.load_build_manifest(manifest_path).get("aggregate", {}).get("events")
+    if events:
+        return as_event_records(events), manifest_path
+    return [], None
+
+
+def _timestamp(when):
+    """datetime/date (naive = Europe/Rome) -> secondi POSIX."""
+    aware = make_timezone_aware(when)
+    if aware is None:
+        raise ValueError(f"data/ora non valida: {when!r}")
+    return aware.timestamp()
+
+
+def event_bounds(rec):
+    """(inizio, fine) in secondi POSIX; senza dtend (o con fine prima dell'inizio) la
+    durata e' DEFAULT_EVENT_DURATION."""
+    start = rec.dtstart.timestamp()
+    end = rec.dtend.timestamp() if rec.dtend else None
+    if end is None or end <= start:
+        end = start + DEFAULT_EVENT_DURATION.total_seconds()
+    return start, end
+
+
+class IntervalIndex:
+    """Indice statico (ricostruirlo se gli eventi cambiano). I metodi accettano `venue`
+    (un venue_id o una lista): il sotto-indice per quelle venue e' creato alla prima
+    query e riusato. I risultati sono ordinati per inizio."""
+
+    def __init__(self, records):
+        entries = sorted(
+            (event_bounds(rec) + (rec,) for rec in as_event_records(records) if rec.dtstart),
+            key=lambda e: (e[0], e[1], e[2].get('summary') or ''))
+        self.records = [e[2] for e in entries]
+        self.starts = [e[0] for e in entries]
+        self.ends = [e[1] for e in entries]
+        short = [i for i, e in enumerate(entries) if e[1] - e[0] <= LONG_EVENT_THRESHOLD_S]
+        self._short_pos = short
+        self._short_starts = [self.starts[i] for i in short]
+        self._max_short = max((self.ends[i] - self.starts[i] for i in short), default=0)
+        self._long_pos = [i for i, e in enumerate(entries) if e[1] - e[0] > LONG_EVENT_THRESHOLD_S]
+        self._long_starts = [self.starts[i] for i in self._long_pos]
+        self._by_venue = {}
+
+    def __len__(self):
+        return len(self.records)
+
+    def _for_venue(self, venue):
+        if venue is None:
+            return self
+        key = frozenset([venue] if isinstance(venue, str) else venue)
+        unknown = key - VENUES.keys()
+        if unknown:
+            raise ValueError(f"venue sconosciute: {', '.join(sorted(unknown))} (ammesse: {', '.join(VENUES)})")
+        index = self._by_venue.get(key)
+        if index is None:
+            index = self._by_venue[key] = IntervalIndex([rec for rec in self.records if rec.venue_id in key])
+        return index
+
+    def _overlapping_ts(self, start, end):
+        """Eventi con fine > start e inizio < end (inizio <= end per un istante, start == end)."""
+        cut = bisect.bisect_right if start == end else bisect.bisect_left
+        lo = bisect.bisect_left(self._short_starts, start - self._max_short)
+        hits = [i for i in self._short_pos[lo:cut(self._short_starts, end)] if self.ends[i] > start]
+        if self._long_pos:
+            hits.extend(i for i in self._long_pos[:cut(self._long_starts, end)] if self.ends[i] > start)
+            hits.sort()
+        return [self.records[i] for i in hits]
+
+    def overlapping(self, start, end, venue=None):
+        """Eventi in corso in qualche momento di [start, end)."""
+        start_ts, end_ts = _timestamp(start), _timestamp(end)
+        if end_ts < start_ts:
+            raise ValueError("la fine dell'intervallo precede l'inizio")
+        return self._for_venue(venue)._overlapping_ts(start_ts, end_ts)
+
+    def at(self, when, venue=None):
+        """Eventi in corso all'istante `when` (inizio <= when < fine)."""
+        ts = _timestamp(when)
+        return self._for_venue(venue)._overlapping_ts(ts, ts)
+
+    def next(self, when, n=DEFAULT_NEXT_N, venue=None):
+        """I primi `n` eventi che iniziano da `when` in poi."""
+        index = self._for_venue(venue)
+        lo = bisect.bisect_left(index.starts, _timestamp(when))
+        return index.records[lo:lo + n]
+
+    def busy(self, start, end, venue=None):
+        """True se almeno un evento si sovrappone a [start, end)."""
+        return bool(self.overlapping(start, end, venue))
+
+
+def load_index(script_dir=SCRIPT_DIR):
+    records, source = load_canonical_events(script_dir)
+    return IntervalIndex(records), source
+
+
+def _parse_when(value):
+    try:
+        return datetime.fromisoformat(value) if "T" in value or " " in value else date.fromisoformat(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"data/ora ISO non valida: {value!r} (es. 2026-06-10T20:00)")
+
+
+def _event_row(rec):
+    return {
+        'summary': rec.get('summary'),
+        'dtstart': rec.get('dtstart_str'),
+        'dtend': rec.get('dtend_str'),
+        'location': rec.get('location_name'),
+        'venue': rec.venue_id,
+        'source_type': rec.get('source_type'),
+        'uid': gcm.event_uid(rec),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Eventi in corso / in un intervallo / prossimi, dall'archivio.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_at = sub.add_parser("at", help="eventi in corso a un'ora")
+    p_at.add_argument("when", type=_parse_when)
+    p_range = sub.add_parser("range", help="eventi che si sovrappongono a [da, a)")
+    p_range.add_argument("start", type=_parse_when)
+    p_range.add_argument("end", type=_parse_when)
+    p_next = sub.add_parser("next", help="prossimi eventi")
+    p_next.add_argument("--from", dest="when", type=_parse_when, default=None, help="default: adesso")
+    p_next.add_argument("-n", type=int, default=DEFAULT_NEXT_N)
+    for p in (p_at, p_range, p_next):
+        p.add_argument("--venue", action="append", choices=list(VENUES), help="ripetibile")
+        p.add_argument("--json", action="store_true", help="output JSON")
+    args = parser.parse_args(argv)
+
+    index, source = load_index()
+    if source is None:
+        log("ERRORE: nessun evento in archivio ne' nel manifest: esegui prima genera_calendari_mensili.py.")
+        return 1
+    t0 = time.perf_counter()
+    try:
+        if args.command == "at":
+            events = index.at(args.when, venue=args.venue)
+        elif args.command == "range":
+            events = index.overlapping(args.start, args.end, venue=args.venue)
+        else:
+            events = index.next(args.when or datetime.now(TARGET_TIMEZONE_OBJ), n=args.n, venue=args.venue)
+    except ValueError as e:
+        parser.error(str(e))
+    elapsed_us = (time.perf_counter() - t0) * 1e6
+
+    if args.json:
+        print(json.dumps([_event_row(rec) for rec in events], ensure_ascii=False, indent=1))
+    else:
+        for rec in events:
+            row = _event_row(rec)
+            where = f"  @ {row['location']}" if row['location'] else ""
+            print(f"{row['dtstart']} -> {row['dtend'] or '?'}  {row['summary']}{where}")
+        log(f"  {len(events)} eventi su {len(index)} ({source.name}), query in {elapsed_us:.0f} us.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
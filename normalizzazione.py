@@ -0,0 +1,213 @@
+"""Normalizzazione di summary e location per le firme di de-duplicazione.
+
+Condiviso da genera_calendari_mensili.py (dedup, UID stabili, filtro feed) e da
+discover_eventi.py (dedup pre-PR contro dati_grezzi/ e discovered/): le due pipeline
+devono riconoscere lo stesso evento nello stesso modo.
+
+Le regex sono compilate una volta sola e i risultati memoizzati per stringa grezza
+(LRU limitata): nella dedup lo stesso summary/location viene normalizzato piu' volte
+per evento (firme, confronto location sui match deboli, UID).
+"""
+
+from __future__ import annotations
+
+import re
+from datetime import datetime
+from functools import lru_cache
+
+UNKNOWN_LOCATION = "unknown_location"
+NORMALIZE_CACHE_SIZE = 1 << 16
+
+# Registro delle venue. Ogni venue ha un ID stabile (usato da viste e query), il nome
+# canonico normalizzato (entra nelle firme e quindi negli UID: NON cambiarlo), nome e
+# indirizzo da mostrare, gli alias riconosciuti nel testo libero (minuscolo) e la capienza
+# indicativa per i grandi eventi (peso della venue nel report di traffico, traffico.py).
+# Per aggiungere una venue basta una voce qui: resolver, filtro feed e discovery la
+# riconoscono automaticamente. Se un testo cita piu' venue vince la prima del registro
+# (l'ordine conta), quindi gli alias devono essere specifici: parole generiche come
+# "ippodromo" o "lampugnano" spostano eventi tra venue e cambiano firme e UID (la
+# discovery le accetta a parte, vedi DISCOVERY_VENUE_KEYWORDS in discover_eventi.py).
+VENUES = {
+    "la-maura": {
+        "canonical": "ippodromo snai la maura",
+        "name": "Ippodromo SNAI La Maura",
+        "address": "Via Lampugnano 95, 20151 Milano MI, Italy",
+        "aliases": ["ippodromo la maura", "la maura", "via lampugnano 95"],
+        "capacity": 80000,
+    },
+    "ippodromo-san-siro": {
+        "canonical": "ippodromo snai san siro",
+        "name": "Ippodromo SNAI San Siro",
+        "address": "Piazzale dello Sport 16, 20151 Milano MI, Italy",
+        "aliases": ["ippodromo san siro", "piazzale dello sport 16", "piazzale dello sport"],
+        "capacity": 50000,
+    },
+    "stadio-san-siro": {
+        "canonical": "stadio san siro",
+        "name": "Stadio San Siro (Giuseppe Meazza)",
+        "address": "Piazzale Angelo Moratti, 20151 Milano MI, Italy",
+        "aliases": ["stadio giuseppe meazza", "san siro", "piazzale angelo moratti"],
+        "capacity": 75817,
+    },
+}
+
+# Vista storica {nome canonico: alias}, usata dal generatore per "location nota?"
+LOCATION_ALIASES = {venue["canonical"]: list(venue["aliases"]) for venue in VENUES.values()}
+CANONICAL_TO_VENUE_ID = {venue["canonical"]: venue_id for venue_id, venue in VENUES.items()}
+
+
+def _trie_regex(words):
+    """Un'unica regex a trie per tutte le parole: a ogni posizione del testo si segue un
+    solo ramo (i figli di un nodo hanno primi caratteri distinti), quindi il costo del
+    match non cresce col numero di alias. I '?' greedy preferiscono l'alias piu' lungo."""
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[''] = {}
+
+    def build(node):
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if '' in node:
+            return f'(?:{body})?'
+        return body
+
+    return re.compile(build(trie))
+
+
+_VENUE_RANK = {venue_id: rank for rank, venue_id in enumerate(VENUES)}
+_VENUE_BY_ALIAS = {}
+for _venue_id, _venue in VENUES.items():
+    for _alias in [_venue["canonical"], *_venue["aliases"]]:
+        _VENUE_BY_ALIAS.setdefault(_alias, _venue_id)
+# Il trie trova a ogni posizione solo l'alias piu' lungo: un alias contenuto in quello di
+# una venue successiva non verrebbe visto e la "prima venue del registro" cambierebbe.
+for _alias, _venue_id in _VENUE_BY_ALIAS.items():
+    for _other, _other_id in _VENUE_BY_ALIAS.items():
+        if _VENUE_RANK[_venue_id] < _VENUE_RANK[_other_id] and _alias in _other:
+            raise ValueError(f"alias '{_alias}' ({_venue_id}) contenuto in '{_other}' ({_other_id}): "
+                             f"sposta {_venue_id} dopo {_other_id} nel registro VENUES")
+# Lookahead: un match (vuoto) per ogni posizione, anche dentro un alias gia' trovato
+_VENUE_ALIAS_RE = re.compile(f'(?=({_trie_regex(_VENUE_BY_ALIAS).pattern}))')
+
+
+def resolve_venue(text) -> str | None:
+    """ID della venue citata in un testo libero (location, indirizzo, PlaceEventDescr...),
+    None se nessuna. In una sola scansione; se compaiono alias di piu' venue vince la prima
+    nel registro VENUES, come nella vecchia scansione alias per alias."""
+    if not text: return None
+    return _resolve_venue(str(text))
+
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def _resolve_venue(text: str) -> str | None:
+    best = None
+    for match in _VENUE_ALIAS_RE.finditer(text.lower()):
+        venue_id = _VENUE_BY_ALIAS[match.group(1)]
+        if best is None or _VENUE_RANK[venue_id] < _VENUE_RANK[best]:
+            best = venue_id
+    return best
+
+
+_SUMMARY_COMPETITION_SUFFIX_RE = re.compile(r'\s*\[(cl|el|cop|serie a|campionato)\]\s*$', re.IGNORECASE)
+_SUMMARY_NOISE_WORDS_RE = re.compile(
+    r'\b(live|world tour|concerto|evento|show|i-days milano|stadi \d{4}|partita)\b', re.IGNORECASE)
+_SUMMARY_DATA_N_RE = re.compile(r'\(data \d+(?: - ipotizzata)?\)', re.IGNORECASE)
+_SUMMARY_PUNCT_RE = re.compile(r'[^\w\s-]')
+_WHITESPACE_RE = re.compile(r'\s+')
+_SUMMARY_SCORE_RE = re.compile(r'\s*\(\d+-\d+\)\s*$')
+_SUMMARY_SIDES_RE = re.compile(r'\s+vs\s+|\s+-\s+')
+_LOCATION_PUNCT_RE = re.compile(r'[^\w\s,-]')
+
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def _normalize_summary(summary: str) -> str:
+    s = summary.lower().strip()
+    s = _SUMMARY_COMPETITION_SUFFIX_RE.sub('', s)
+    s = _SUMMARY_NOISE_WORDS_RE.sub('', s)
+    s = _SUMMARY_DATA_N_RE.sub('', s)
+    s = _SUMMARY_PUNCT_RE.sub('', s)
+    s = _WHITESPACE_RE.sub(' ', s).strip()
+    s = _SUMMARY_SCORE_RE.sub('', s).strip()
+    parts = sorted([p.strip() for p in _SUMMARY_SIDES_RE.split(s) if p.strip()])
+    return " vs ".join(parts)
+
+
+def normalize_summary_for_signature(summary) -> str:
+    if not summary: return ""
+    return _normalize_summary(str(summary))
+
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def _normalize_location(location_name: str) -> str:
+    loc_lower = location_name.lower().strip()
+    venue_id = _resolve_venue(loc_lower)
+    if venue_id: return VENUES[venue_id]["canonical"]
+    loc_lower = _LOCATION_PUNCT_RE.sub('', loc_lower)
+    loc_lower = _WHITESPACE_RE.sub(' ', loc_lower).strip()
+    return loc_lower if loc_lower else UNKNOWN_LOCATION
+
+
+def normalize_location_for_signature(location_name) -> str:
+    if not location_name: return ""
+    return _normalize_location(str(location_name))
+
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def event_date_for_signature(dtstart_str) -> str:
+    """'YYYY-MM-DDTHH:MM:SS' -> 'YYYY-MM-DD'; '' se assente o non valida."""
+    if not dtstart_str: return ""
+    try:
+        return datetime.strptime(dtstart_str, '%Y-%m-%dT%H:%M:%S').date().isoformat()
+    except (TypeError, ValueError):
+        return ""
+
+
+def create_event_signatures(event_data_dict):
+    """Crea sia una firma debole (summary+data) sia una forte (summary+data+location)."""
+    norm_summary = normalize_summary_for_signature(event_data_dict.get('summary'))
+    event_date_str = event_date_for_signature(event_data_dict.get('dtstart_str'))
+
+    weak_signature = (norm_summary, event_date_str)
+
+    raw_location = event_data_dict.get('location_name', event_data_dict.get('location', ''))
+    norm_loc_specific = normalize_location_for_signature(raw_location) # Restituisce 'unknown_location' se vuota
+
+    strong_signature = (norm_summary, event_date_str, norm_loc_specific)
+    return weak_signature, strong_signature
+
+
+def create_event_signatures_batch(event_dicts):
+    """create_event_signatures su una lista intera: [(weak, strong), ...] nello stesso ordine.
+    I lookup sono legati a variabili locali e le stringhe ripetute (stesso artista, stessa
+    location, stessa data) passano dalla cache una volta sola."""
+    norm_summary = normalize_summary_for_signature
+    norm_location = normalize_location_for_signature
+    event_date = event_date_for_signature
+    out = []
+    for ev in event_dicts:
+        s = norm_summary(ev.get('summary'))
+        d = event_date(ev.get('dtstart_str'))
+        loc = norm_location(ev.get('location_name', ev.get('location', '')))
+        out.append(((s, d), (s, d, loc)))
+    return out
+
+
+def normalize_cache_info() -> dict:
+    """Statistiche delle cache LRU (hit/miss), utili per i benchmark e i log."""
+    return {
+        'summary': _normalize_summary.cache_info()._asdict(),
+        'location': _normalize_location.cache_info()._asdict(),
+        'date': event_date_for_signature.cache_info()._asdict(),
+        'venue': _resolve_venue.cache_info()._asdict(),
+    }
+
+
+def normalize_cache_clear() -> None:
+    """Svuota le cache LRU (benchmark a freddo)."""
+    for fn in (_normalize_summary, _normalize_location, event_date_for_signature, _resolve_venue):
+        fn.cache_clear()
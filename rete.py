@@ -0,0 +1,117 @@
+"""Richieste HTTP entro una scadenza assoluta (time.monotonic()).
+
+I pool di thread del generatore (feed delle squadre) e della discovery (pagine,
+calendari .ics, modello) hanno un budget di tempo, ma un thread appeso su una
+richiesta non si puo' interrompere e l'interprete lo aspetta comunque all'uscita.
+Quindi ogni richiesta deve finire da sola entro la scadenza:
+
+- timeout di connessione e lettura = min(timeout richiesto, tempo rimasto);
+- corpo letto in streaming, col timeout del socket che scende col tempo rimasto: un
+  server che risponde un byte alla volta non tiene la richiesta aperta oltre;
+- retry fatti qui e non dall'adapter di urllib3 (che non conosce la scadenza): stessi
+  stati e stesso backoff del vecchio Retry(total=3, backoff_factor=2), ma un tentativo
+  parte solo se l'attesa finisce prima della scadenza.
+
+Le sessioni vanno montate con retry_session() (adapter senza retry propri).
+"""
+
+from __future__ import annotations
+
+import time
+
+import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+
+RETRY_ATTEMPTS = 4  # 1 + 3 retry
+RETRY_BACKOFF_S = 2  # attese di 0, 4, 8 s tra i tentativi, come urllib3 con backoff_factor=2
+RETRY_STATUSES = frozenset((500, 502, 503, 504))
+READ_CHUNK_BYTES = 1 << 16
+
+
+class DeadlineExceeded(requests.exceptions.Timeout):
+    """Scadenza raggiunta prima di completare la richiesta."""
+
+
+def retry_session(pool_maxsize: int) -> requests.Session:
+    """Session con pool dimensionato per i worker e senza retry dell'adapter."""
+    session = requests.Session()
+    adapter = HTTPAdapter(max_retries=0, pool_maxsize=pool_maxsize)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def time_left(deadline: float | None) -> float:
+    return float('inf') if deadline is None else deadline - time.monotonic()
+
+
+def _backoff(attempt: int) -> float:
+    return 0.0 if attempt <= 1 else RETRY_BACKOFF_S * 2 ** (attempt - 1)
+
+
+def _read_body(response, deadline, timeout):
+    """Corpo della risposta (decompresso) con la scadenza controllata a ogni lettura: il
+    timeout del socket scende col tempo rimasto e read1 ritorna appena arriva qualcosa,
+    quindi anche un server che manda un byte alla volta si ferma alla scadenza."""
+    raw = response.raw
+    sock = getattr(getattr(raw, 'connection', None), 'sock', None)
+    read = getattr(raw, 'read1', None) or raw.read  # urllib3 1.x: niente read1
+    chunks = []
+    try:
+        while True:
+            left = time_left(deadline)
+            if left <= 0:
+                raise DeadlineExceeded(f"scadenza raggiunta durante la lettura di {response.url}")
+            if sock is not None:
+                sock.settimeout(min(timeout, left))
+            chunk = read(READ_CHUNK_BYTES, decode_content=True)
+            if not chunk:
+                return b''.join(chunks)
+            chunks.append(chunk)
+    except urllib3.exceptions.ReadTimeoutError as e:
+        raise requests.exceptions.ReadTimeout(e) from e
+    except (urllib3.exceptions.ProtocolError, urllib3.exceptions.DecodeError, OSError) as e:
+        raise requests.exceptions.ConnectionError(e) from e
+
+
+def _send(session, method, url, deadline, timeout, kwargs):
+    left = time_left(deadline)
+    if left <= 0:
+        raise DeadlineExceeded(f"scadenza raggiunta prima di contattare {url}")
+    response = session.request(method, url, timeout=min(timeout, left), stream=True, **kwargs)
+    try:
+        # Quello che farebbe Response.content, ma con la scadenza
+        response._content = _read_body(response, deadline, timeout)
+    finally:
+        response.close()
+    return response
+
+
+def request(session: requests.Session, method: str, url: str, deadline: float | None,
+            timeout: float, **kwargs) -> requests.Response:
+    """session.request() che termina entro `deadline` (None: nessuna scadenza).
+    Le GET sono ritentate su errori di connessione/lettura e sugli stati RETRY_STATUSES
+    finche' restano tentativi e tempo per l'attesa; poi l'ultima risposta 5xx torna al
+    chiamante (raise_for_status) e l'ultimo errore viene rilanciato. Solleva
+    DeadlineExceeded (un Timeout di requests) se la scadenza arriva prima della
+    risposta completa."""
+    attempts = RETRY_ATTEMPTS if method.upper() == 'GET' else 1
+    for attempt in range(1, attempts + 1):
+        try:
+            response = _send(session, method, url, deadline, timeout, kwargs)
+        except DeadlineExceeded:
+            raise
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+            if attempt == attempts or time_left(deadline) <= _backoff(attempt):
+                raise
+        else:
+            if (attempt == attempts or response.status_code not in RETRY_STATUSES
+                    or time_left(deadline) <= _backoff(attempt)):
+                return response
+        time.sleep(_backoff(attempt))
+
+
+def get(session: requests.Session, url: str, deadline: float | None, timeout: float,
+        **kwargs) -> requests.Response:
+    return request(session, 'GET', url, deadline, timeout, **kwargs)
@@ -0,0 +1,206 @@
+"""Espansione pigra delle ricorrenze dei VEVENT (RRULE, RDATE, EXDATE, RECURRENCE-ID).
+
+I feed ICS possono descrivere una serie (es. le giornate di corse settimanali
+all'ippodromo) con un solo VEVENT e una RRULE. expand_vevents() trasforma la lista dei
+VEVENT in un generatore di occorrenze, limitate alla finestra [inizio, fine): ogni
+occorrenza e' prodotta solo quando chi consuma (il filtro delle partite casalinghe, poi
+la dedup) la chiede, quindi una serie senza fine non viene mai materializzata.
+
+- Le ricorrenze sono calcolate in ora locale del DTSTART (dateutil.rrule su datetime
+  naive, poi localizzate), quindi una serie alle 21:00 resta alle 21:00 dopo il cambio
+  d'ora; UNTIL/RDATE/EXDATE in UTC sono portati nella stessa ora locale.
+- Un VEVENT con RECURRENCE-ID sostituisce l'occorrenza corrispondente della sua serie
+  (stesso UID) e passa come evento a se'; con STATUS:CANCELLED la cancella e basta.
+- Un'occorrenza e' una vista leggera sul master (Occurrence): DTSTART/DTEND/UID
+  propri, tutto il resto letto dal componente originale senza copiarlo.
+- Una regola che dateutil non sa leggere lascia passare il master com'e' (solo la prima
+  occorrenza, il comportamento di prima) con un WARN.
+
+Si applica solo ai feed: i .ics di calendari_custom/ non sono letti dal generatore
+(le sorgenti locali sono dati_grezzi/ e discovered/) e non contengono serie.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+import pytz
+from dateutil.rrule import rruleset, rrulestr
+from icalendar.prop import vRecur
+
+from evento import TARGET_TIMEZONE_OBJ
+
+RECURRENCE_PROPERTIES = ('RRULE', 'RDATE')
+
+
+def log(msg):
+    print(f"[{datetime.now().isoformat(timespec='seconds')}] {msg}", flush=True)
+
+
+def is_recurring(component):
+    return any(component.get(name) is not None for name in RECURRENCE_PROPERTIES)
+
+
+class _DateValue:
+    """Come vDDDTypes per chi legge solo `.dt`, senza il costo dei suoi parametri."""
+
+    __slots__ = ('dt',)
+
+    def __init__(self, dt):
+        self.dt = dt
+
+
+class Occurrence:
+    """Un'occorrenza di una serie: si legge come il componente icalendar (get)."""
+
+    __slots__ = ('master', 'props')
+
+    def __init__(self, master, dtstart, dtend, uid):
+        self.master = master
+        start = _DateValue(dtstart)
+        self.props = {
+            'DTSTART': start,
+            'DTEND': _DateValue(dtend) if dtend is not None else None,
+            'UID': uid,
+            'RECURRENCE-ID': start,
+            'DURATION': None, 'RRULE': None, 'RDATE': None, 'EXDATE': None,
+        }
+
+    def get(self, name, default=None):
+        key = name.upper()
+        if key in self.props:
+            value = self.props[key]
+            return default if value is None else value
+        return self.master.get(name, default)
+
+    def __contains__(self, name):
+        return self.get(name) is not None
+
+
+def _wall_clock(tzinfo):
+    """(aware -> naive locale, naive locale -> aware) per il fuso del DTSTART.
+    Senza fuso (ora "floating") si usa Europe/Rome, come nel resto della pipeline."""
+    if tzinfo is None:
+        tzinfo = TARGET_TIMEZONE_OBJ
+    zone = getattr(tzinfo, 'zone', None)
+    if zone is not None:  # pytz: l'offset dipende dalla data, serve localize()
+        tz = pytz.timezone(zone)
+        return (lambda dt: dt.astimezone(tz).replace(tzinfo=None)), tz.localize
+    return (lambda dt: dt.astimezone(tzinfo).replace(tzinfo=None)), (lambda dt: dt.replace(tzinfo=tzinfo))
+
+
+def _as_naive(value, to_naive, all_day):
+    if isinstance(value, datetime):
+        value = to_naive(value) if value.tzinfo is not None else value
+        return datetime.combine(value.date(), datetime.min.time()) if all_day else value
+    return datetime.combine(value, datetime.min.time())
+
+
+def _property_values(component, name):
+    """Le date di RDATE/EXDATE (una proprieta' puo' comparire piu' volte, ognuna con piu' valori)."""
+    props = component.get(name)
+    if props is None:
+        return []
+    if not isinstance(props, list):
+        props = [props]
+    return [entry.dt for prop in props for entry in getattr(prop, 'dts', [prop])]
+
+
+def _occurrence_starts(component, to_naive, all_day, naive_start):
+    """rruleset in ora locale naive per il master (RRULE/RDATE meno EXDATE)."""
+    rules = component.get('RRULE')
+    if rules is not None and not isinstance(rules, list):
+        rules = [rules]
+    rset = rruleset()
+    for rule in rules or []:
+        rule = vRecur(rule)
+        until = rule.get('UNTIL')
+        if until:
+            rule['UNTIL'] = [_as_naive(until[0], to_naive, all_day)]
+        rset.rrule(rrulestr(rule.to_ical().decode(), dtstart=naive_start))
+    for value in _property_values(component, 'RDATE'):
+        rset.rdate(_as_naive(value, to_naive, all_day))
+    for value in _property_values(component, 'EXDATE'):
+        rset.exdate(_as_naive(value, to_naive, all_day))
+    if not rules:  # solo RDATE: il DTSTART e' comunque la prima occorrenza
+        rset.rdate(naive_start)
+    return rset
+
+
+def _duration(component, dtstart):
+    dtend_prop = component.get('DTEND')
+    if dtend_prop is not None:
+        return dtend_prop.dt - dtstart
+    duration_prop = component.get('DURATION')
+    return duration_prop.dt if duration_prop is not None else None
+
+
+def iter_series(component, window_start, window_end, overridden=frozenset()):
+    """Occorrenze del master `component` con inizio in [window_start, window_end) (aware),
+    tranne quelle in `overridden` (inizi originali, datetime naive in ora locale)."""
+    dtstart = component.get('DTSTART').dt
+    all_day = not isinstance(dtstart, datetime)
+    to_naive, localize = _wall_clock(None if all_day else dtstart.tzinfo)
+    naive_start = _as_naive(dtstart, to_naive, all_day)
+    duration = _duration(component, dtstart)
+    uid = str(component.get('UID', ''))
+    lo, hi = to_naive(window_start), to_naive(window_end)
+    for naive in _occurrence_starts(component, to_naive, all_day, naive_start).xafter(lo, inc=True):
+        if naive >= hi:
+            return
+        if naive in overridden:
+            continue
+        end = naive + duration if duration is not None else None
+        if all_day:
+            start, end = naive.date(), end and end.date()
+        elif dtstart.tzinfo is None:
+            start = naive
+        else:
+            start, end = localize(naive), end and localize(end)
+        yield Occurrence(component, start, end, f"{uid}#{naive:%Y%m%dT%H%M%S}")
+
+
+def expand_vevents(components, window_start, window_end):
+    """Generatore di VEVENT con le serie espanse in [window_start, window_end).
+    Gli eventi non ricorrenti passano invariati (anche fuori finestra: il filtro resta
+    a chi consuma), nell'ordine originale; le serie si espandono al loro posto."""
+    components = list(components)
+    overrides = {}
+    for component in components:
+        rid = component.get('RECURRENCE-ID')
+        if rid is not None:
+            overrides.setdefault(str(component.get('UID', '')), []).append(rid.dt)
+    for component in components:
+        rid = component.get('RECURRENCE-ID')
+        if rid is not None:
+            if str(component.get('STATUS', '')).upper() != 'CANCELLED':
+                yield component
+            continue
+        if not is_recurring(component) or component.get('DTSTART') is None:
+            yield component
+            continue
+        dtstart = component.get('DTSTART').dt
+        all_day = not isinstance(dtstart, datetime)
+        to_naive, _localize = _wall_clock(None if all_day else dtstart.tzinfo)
+        overridden = frozenset(_as_naive(value, to_naive, all_day)
+                               for value in overrides.get(str(component.get('UID', '')), ()))
+        series = iter_series(component, window_start, window_end, overridden)
+        try:
+            first = next(series, None)  # regole e date si leggono alla prima occorrenza
+        except (ValueError, TypeError) as e:
+            log(f"    WARN: ricorrenza non valida in '{component.get('SUMMARY', '')}' ({e}): uso solo il DTSTART.")
+            yield component
+            continue
+        if first is not None:
+            yield first
+            yield from series
+
+
+def recurrence_window(window_start, seasons):
+    """[window_start, window_start + `seasons` anni): la finestra delle stagioni dei feed."""
+    try:
+        window_end = window_start.replace(year=window_start.year + seasons)
+    except ValueError:  # 29 febbraio
+        window_end = window_start + timedelta(days=365 * seasons)
+    return window_start, window_end
+
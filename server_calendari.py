@@ -0,0 +1,374 @@
+"""Server HTTP locale dei calendari generati (solo libreria standard).
+
+    python server_calendari.py [--host 127.0.0.1] [--port 8080]
+
+- GET /<file>.ics: ogni ICS di calendari_output/ (aggregato, mensili, viste), con ETag
+  forte (sha256), risposte 304 a If-None-Match e corpo gzip precompresso se il client
+  accetta gzip.
+- GET /eventi.ics?venue=la-maura&from=2026-06-01&to=2026-07-01&type=match&team=Inter:
+  vista calcolata al volo dall'indice in memoria degli eventi de-duplicati (tabella
+  canonical_events dell'archivio, o aggregato del manifest di build), senza riparsare
+  gli ICS. venue/type/team accettano piu' valori separati da virgola; from/to sono date
+  di inizio evento (to escluso); type e' match | event o un source_type. Le risposte
+  sono tenute in una cache LRU per query normalizzata.
+- GET /: elenco JSON dei calendari e dei parametri.
+
+File e indice vengono ricaricati quando cambiano (controllo al massimo una volta al
+secondo), quindi il server puo' restare acceso tra due run del generatore.
+"""
+
+from __future__ import annotations
+
+import argparse
+import bisect
+import gzip
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+import genera_calendari_mensili as gcm
+from archivio import EVENT_STORE_FILENAME
+from intervalli import load_canonical_events
+from normalizzazione import VENUES, normalize_summary_for_signature
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8080
+QUERY_PATH = "/eventi.ics"
+QUERY_PARAMS = ("venue", "from", "to", "type", "team")
+# match: partite dei feed piu' eventi manuali il cui summary nomina un club dei feed;
+# event: tutto il resto. type accetta anche un source_type esatto (ics_feed, discovered, ...).
+EVENT_TYPES = ("match", "event")
+RESPONSE_CACHE_SIZE = 256
+RELOAD_CHECK_INTERVAL_S = 1.0
+CACHE_CONTROL = "public, max-age=300"
+ICS_CONTENT_TYPE = "text/calendar; charset=utf-8"
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+CLUB_SIGNATURES = frozenset(
+    normalize_summary_for_signature(gcm.club_name_for_team(team_key)) for team_key in gcm.CALENDAR_URLS)
+
+
+def log(msg):
+    print(f"[{datetime.now().isoformat(timespec='seconds')}] {msg}", flush=True)
+
+
+class QueryError(ValueError):
+    pass
+
+
+def make_response(body, compress=True):
+    """(etag, body, etag gzip, body gzip) per un corpo. Il gzip e' deterministico (mtime=0);
+    le due rappresentazioni hanno ETag forti distinti."""
+    etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+    if not compress:
+        return etag, body, None, None
+    gz_body = gzip.compress(body, compresslevel=6, mtime=0)
+    return etag, body, f'{etag[:-1]}-gz"', gz_body
+
+
+def accepts_gzip(accept_encoding):
+    """True se Accept-Encoding accetta gzip con q > 0, per nome (o x-gzip) o tramite '*'.
+    Una codifica con q=0 e' rifiutata esplicitamente (RFC 9110, 12.5.3)."""
+    q_by_coding = {}
+    for item in accept_encoding.split(","):
+        coding, *params = item.split(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        q_by_coding[coding] = q
+    for coding in ("gzip", "x-gzip", "*"):
+        if coding in q_by_coding:
+            return q_by_coding[coding] > 0
+    return False
+
+
+def etag_matches(if_none_match, etag):
+    """Confronto debole di If-None-Match (RFC 9110, 13.1.2): un prefisso W/ non conta,
+    come quello che i proxy aggiungono quando ricomprimono."""
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(token.strip().removeprefix("W/") == opaque for token in if_none_match.split(","))
+
+
+def event_kind(rec):
+    if rec.get("source_type") == "ics_feed":
+        return "match"
+    return "match" if CLUB_SIGNATURES & set(rec.strong_signature[0].split(" vs ")) else "event"
+
+
+class EventIndex:
+    """Eventi ordinati per (dtstart, summary) con, per ogni venue, le posizioni nel vettore
+    globale: from/to diventano due bisect, venue/type/team si filtrano solo sulla fetta."""
+
+    def __init__(self, records):
+        self.records = gcm.serializable_events(records)
+        self.days = [rec.strong_signature[1] for rec in self.records]
+        self.kinds = [event_kind(rec) for rec in self.records]
+        self.by_venue = {}
+        for i, rec in enumerate(self.records):
+            self.by_venue.setdefault(rec.venue_id, []).append(i)
+
+    def _positions(self, venues, day_from, day_to):
+        lo = bisect.bisect_left(self.days, day_from) if day_from else 0
+        hi = bisect.bisect_left(self.days, day_to) if day_to else len(self.days)
+        if venues is None:
+            return range(lo, hi)
+        out = []
+        for venue_id in venues:
+            positions = self.by_venue.get(venue_id, [])
+            out.extend(positions[bisect.bisect_left(positions, lo):bisect.bisect_left(positions, hi)])
+        return sorted(out)
+
+    def query(self, venues=None, day_from=None, day_to=None, kinds=None, source_types=None, teams=None):
+        kinds, source_types = kinds or set(), source_types or set()
+        result = []
+        for i in self._positions(venues, day_from, day_to):
+            rec = self.records[i]
+            if (kinds or source_types) and self.kinds[i] not in kinds and rec.get("source_type") not in source_types:
+                continue
+            if teams and teams.isdisjoint(rec.strong_signature[0].split(" vs ")):
+                continue
+            result.append(rec)
+        return result
+
+
+def parse_query(query_string):
+    """Query string -> (chiave normalizzata, argomenti di EventIndex.query). QueryError se invalida."""
+    params = parse_qs(query_string, keep_blank_values=False)
+    unknown = set(params) - set(QUERY_PARAMS)
+    if unknown:
+        raise QueryError(f"parametri sconosciuti: {', '.join(sorted(unknown))} (ammessi: {', '.join(QUERY_PARAMS)})")
+
+    def values(name):
+        return sorted({v.strip() for raw in params.get(name, []) for v in raw.split(",") if v.strip()}) or None
+
+    def day(name):
+        raw = values(name)
+        if raw is None:
+            return None
+        try:
+            return date.fromisoformat(raw[-1]).isoformat()
+        except ValueError:
+            raise QueryError(f"{name}: data YYYY-MM-DD non valida: {raw[-1]!r}")
+
+    venues = values("venue")
+    if venues and not set(venues) <= VENUES.keys():
+        raise QueryError(f"venue sconosciute: {', '.join(sorted(set(venues) - VENUES.keys()))} "
+                         f"(ammesse: {', '.join(VENUES)})")
+    types = values("type")
+    teams = values("team")
+    args = {
+        "venues": venues,
+        "day_from": day("from"),
+        "day_to": day("to"),
+        "kinds": {t for t in types or () if t in EVENT_TYPES},
+        "source_types": {t for t in types or () if t not in EVENT_TYPES},
+        # "milan" -> "AC Milan" come nei summary dei feed; gli altri nomi come sono
+        "teams": frozenset(
+            normalize_summary_for_signature(gcm.club_name_for_team(t) if t.lower() in gcm.CALENDAR_URLS else t)
+            for t in teams) if teams else None,
+    }
+    key = json.dumps([venues, args["day_from"], args["day_to"], types, teams])
+    return key, args
+
+
+def query_title(args):
+    parts = []
+    if args["venues"]:
+        parts.append(", ".join(VENUES[v]["name"] for v in args["venues"]))
+    if args["day_from"] or args["day_to"]:
+        parts.append(f"{args['day_from'] or '...'} - {args['day_to'] or '...'}")
+    return "Eventi San Siro" + (f" ({'; '.join(parts)})" if parts else "")
+
+
+class CalendarServer:
+    """Stato condiviso dai thread del server: ICS statici, indice e cache delle query."""
+
+    def __init__(self, script_dir, output_dir):
+        self.script_dir = script_dir
+        self.output_dir = output_dir
+        self.lock = threading.Lock()
+        self.files = {}
+        self.index = EventIndex([])
+        self.index_source = None
+        self.responses = OrderedDict()
+        self.signature = None
+        self.next_check = 0.0
+        self.reload(force=True)
+
+    def _current_signature(self):
+        paths = sorted(self.output_dir.glob("*.ics"))
+        paths.append(self.script_dir / gcm.CACHE_FOLDER_NAME / EVENT_STORE_FILENAME)
+        paths.append(self.script_dir / gcm.CACHE_FOLDER_NAME / gcm.BUILD_MANIFEST_FILENAME)
+        signature = []
+        for path in paths:
+            try:
+                st = path.stat()
+                signature.append((path.name, st.st_mtime_ns, st.st_size))
+            except FileNotFoundError:
+                pass
+        return tuple(signature)
+
+    def reload(self, force=False):
+        now = time.monotonic()
+        if not force and now < self.next_check:
+            return
+        with self.lock:
+            if not force and now < self.next_check:
+                return
+            self.next_check = now + RELOAD_CHECK_INTERVAL_S
+            signature = self._current_signature()
+            if signature == self.signature:
+                return
+            files = {}
+            for path in sorted(self.output_dir.glob("*.ics")):
+                files[f"/{path.name}"] = make_response(path.read_bytes())
+            records, source = load_canonical_events(self.script_dir)
+            self.files = files
+            self.index = EventIndex(records)
+            self.index_source = source
+            self.responses = OrderedDict()
+            self.signature = signature
+            log(f"  Caricati {len(files)} ICS e {len(self.index.records)} eventi de-duplicati"
+                f"{f' da {source.name}' if source else ' (nessun archivio: esegui prima il generatore)'}.")
+
+    def query_response(self, query_string):
+        key, args = parse_query(query_string)
+        with self.lock:
+            response = self.responses.get(key)
+            if response is not None:
+                self.responses.move_to_end(key)
+                return response
+            index = self.index
+        events = index.query(**args)
+        body = b"".join(gcm.iter_ics_chunks(events, query_title(args)))
+        response = make_response(body)
+        with self.lock:
+            self.responses[key] = response
+            if len(self.responses) > RESPONSE_CACHE_SIZE:
+                self.responses.popitem(last=False)
+        return response
+
+    def listing(self):
+        body = json.dumps({
+            "calendari": sorted(self.files),
+            "query": {"path": QUERY_PATH, "parametri": list(QUERY_PARAMS),
+                      "venue": list(VENUES), "type": list(EVENT_TYPES)},
+            "eventi_indicizzati": len(self.index.records),
+        }, ensure_ascii=False, indent=1).encode("utf-8")
+        return make_response(body, compress=False)
+
+
+class CalendarRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive: niente handshake TCP per ogni richiesta
+    disable_nagle_algorithm = True  # header e corpo sono due write: senza, ~40 ms di ACK ritardato
+    server_version = "calendari"
+    verbose = False
+
+    def do_GET(self):
+        self._respond(head=False)
+
+    def do_HEAD(self):
+        self._respond(head=True)
+
+    def _respond(self, head):
+        state = self.server.state
+        state.reload()
+        url = urlsplit(self.path)
+        content_type = ICS_CONTENT_TYPE
+        try:
+            if url.path == QUERY_PATH:
+                response = state.query_response(url.query)
+            elif url.path in state.files and not url.query:
+                response = state.files[url.path]
+            elif url.path == "/":
+                response = state.listing()
+                content_type = "application/json; charset=utf-8"
+            else:
+                return self._error(HTTPStatus.NOT_FOUND, f"{url.path} non trovato", head)
+        except QueryError as e:
+            return self._error(HTTPStatus.BAD_REQUEST, str(e), head)
+
+        etag, body, gz_etag, gz_body = response
+        if gz_body is not None and accepts_gzip(self.headers.get("Accept-Encoding", "")):
+            etag, body, encoding = gz_etag, gz_body, "gzip"
+        else:
+            encoding = None
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match and etag_matches(if_none_match, etag):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self._common_headers(etag)
+            self.end_headers()
+            return
+        self.send_response(HTTPStatus.OK)
+        self._common_headers(etag)
+        self.send_header("Content-Type", content_type)
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if not head:
+            self.wfile.write(body)
+
+    def _common_headers(self, etag):
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", CACHE_CONTROL)
+        self.send_header("Vary", "Accept-Encoding")
+
+    def _error(self, status, message, head):
+        body = (message + "\n").encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/plain; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if not head:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.verbose:
+            super().log_message(format, *args)
+
+
+def make_server(host, port, script_dir=SCRIPT_DIR, output_dir=None, verbose=False):
+    server = ThreadingHTTPServer((host, port), CalendarRequestHandler)
+    server.daemon_threads = True
+    server.state = CalendarServer(script_dir, output_dir or script_dir / gcm.OUTPUT_ICS_FOLDER_NAME)
+    CalendarRequestHandler.verbose = verbose
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Server HTTP locale dei calendari generati.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--output-dir", type=Path, help=f"cartella degli ICS (default: {gcm.OUTPUT_ICS_FOLDER_NAME}/)")
+    parser.add_argument("--verbose", action="store_true", help="una riga di log per richiesta")
+    args = parser.parse_args(argv)
+    server = make_server(args.host, args.port, output_dir=args.output_dir, verbose=args.verbose)
+    log(f"In ascolto su http://{args.host}:{server.server_address[1]}/ (Ctrl+C per uscire)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+"""Lettura dei file sorgente degli eventi, con cache dei risultati.
+
+Formati riconosciuti:
+- dati_grezzi/eventi_YYYY_MM.toml: eventi manuali, una tabella [[events]] per evento.
+  E' un formato dati (niente codice eseguito) e conserva i commenti di chi lo cura.
+- dati_grezzi/eventi_YYYY_MM.py: formato storico (`event_list = [...]`), letto con
+  ast.literal_eval: il file non viene mai eseguito. Convertibile in TOML con
+  `python sorgenti.py converti`.
+- discovered/eventi_YYYY_MM.json: documento con la lista "events" (vedi SCHEMA.json).
+
+load_event_sources() tiene in .cache/ gli eventi gia' letti, indicizzati per file con
+mtime, dimensione e sha256: un file con mtime e dimensione invariati non viene
+neanche riletto, uno con mtime cambiato ma stesso hash (es. checkout git) non viene
+riparsato. Solo i file cambiati davvero passano dal parser.
+"""
+
+from __future__ import annotations
+
+import argparse
+import ast
+import hashlib
+import io
+import json
+import os
+import re
+import sys
+import tokenize
+import tomllib
+from datetime import datetime
+from pathlib import Path
+
+SOURCE_CACHE_VERSION = 1
+SOURCE_CACHE_FILENAME = "sorgenti.json"
+EVENT_SOURCE_SUFFIXES = (".toml", ".py", ".json")
+LEGACY_LIST_NAME = "event_list"
+
+
+def log(msg):
+    print(f"[{datetime.now().isoformat(timespec='seconds')}] {msg}", flush=True)
+
+
+# --- Parser per formato ---
+def _events_from_doc(doc, path):
+    events = doc.get("events", []) if isinstance(doc, dict) else None
+    if not isinstance(events, list) or not all(isinstance(ev, dict) for ev in events):
+        raise ValueError(f"{path.name}: 'events' deve essere una lista di tabelle/oggetti")
+    return events
+
+
+def _read_toml(path, data):
+    return _events_from_doc(tomllib.loads(data.decode("utf-8")), path)
+
+
+def _read_json(path, data):
+    return _events_from_doc(json.loads(data.decode("utf-8")), path)
+
+
+def _legacy_event_list_node(tree, path):
+    """Il nodo della lista `event_list = [...]`; il modulo non deve contenere altro."""
+    node = None
+    for stmt in tree.body:
+        if (isinstance(stmt, ast.Assign) and len(stmt.targets) == 1
+                and isinstance(stmt.targets[0], ast.Name) and stmt.targets[0].id == LEGACY_LIST_NAME):
+            node = stmt.value
+        else:
+            raise ValueError(f"{path.name}:{stmt.lineno}: solo `{LEGACY_LIST_NAME} = [...]` e' ammesso")
+    if node is None:
+        raise ValueError(f"{path.name}: `{LEGACY_LIST_NAME}` non trovata")
+    return node
+
+
+def _read_legacy_py(path, data):
+    node = _legacy_event_list_node(ast.parse(data, filename=str(path)), path)
+    events = ast.literal_eval(node)
+    if not isinstance(events, list) or not all(isinstance(ev, dict) for ev in events):
+        raise ValueError(f"{path.name}: `{LEGACY_LIST_NAME}` deve essere una lista di dizionari")
+    return events
+
+
+_READERS = {".toml": _read_toml, ".py": _read_legacy_py, ".json": _read_json}
+
+
+def read_event_source(path):
+    """Eventi (lista di dict) di un file sorgente, senza cache. Solleva ValueError & co."""
+    path = Path(path)
+    return _READERS[path.suffix](path, path.read_bytes())
+
+
+# --- Cache ---
+def load_source_cache(cache_path):
+    if cache_path is None:
+        return {}
+    try:
+        cache = json.loads(cache_path.read_text(encoding="utf-8"))
+        if cache.get("version") == SOURCE_CACHE_VERSION:
+            return cache
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        log(f"  WARN: cache sorgenti illeggibile ({e}); rileggo tutti i file.")
+    return {}
+
+
+def save_source_cache(cache_path, cache):
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(cache, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp_path, cache_path)
+    except Exception as e:
+        log(f"  WARN: impossibile salvare la cache sorgenti {cache_path}: {e}")
+
+
+def load_event_sources(paths, cache_path=None):
+    """{path: lista di dict, o None se il file non e' leggibile} per i file richiesti.
+    Le liste restituite sono nuove a ogni chiamata (i dict dentro possono essere condivisi
+    con la cache in memoria: copiarli prima di modificarli)."""
+    cache = load_source_cache(cache_path)
+    entries = cache.get("files", {})
+    out = {}
+    dirty = False
+    for path in paths:
+        key = Path(path).resolve().as_posix()
+        try:
+            st = os.stat(path)
+        except OSError as e:
+            log(f"  WARN: impossibile leggere {path}: {e}")
+            out[path] = None
+            continue
+        entry = entries.get(key)
+        if entry and entry["mtime_ns"] == st.st_mtime_ns and entry["size"] == st.st_size:
+            out[path] = list(entry["events"])
+            continue
+        data = Path(path).read_bytes()
+        digest = hashlib.sha256(data).hexdigest()
+        if not (entry and entry["sha256"] == digest):
+            try:
+                events = _READERS[Path(path).suffix](Path(path), data)
+            except Exception as e:
+                log(f"  WARN: impossibile leggere {Path(path).name}: {e}")
+                out[path] = None
+                continue
+            entry = {"events": events, "sha256": digest}
+        entries[key] = {**entry, "mtime_ns": st.st_mtime_ns, "size": st.st_size}
+        out[path] = list(entry["events"])
+        dirty = True
+    if cache_path is not None and dirty:
+        save_source_cache(cache_path, {"version": SOURCE_CACHE_VERSION, "files": entries})
+    return out
+
+
+def list_event_source_files(directory, pattern="eventi_*"):
+    """File sorgente di una cartella, ordinati. Per lo stesso nome vince il TOML sul .py
+    storico (con un WARN: il .py va rimosso dopo la conversione)."""
+    by_stem = {}
+    for path in sorted(Path(directory).glob(pattern)):
+        if path.suffix not in EVENT_SOURCE_SUFFIXES:
+            continue
+        current = by_stem.get(path.stem)
+        if current is None or EVENT_SOURCE_SUFFIXES.index(path.suffix) < EVENT_SOURCE_SUFFIXES.index(current.suffix):
+            if current is not None:
+                log(f"  WARN: {current.name} ignorato, esiste {path.name}.")
+            by_stem[path.stem] = path
+        else:
+            log(f"  WARN: {path.name} ignorato, esiste {current.name}.")
+    return [by_stem[stem] for stem in sorted(by_stem)]
+
+
+# --- Conversione .py storico -> TOML ---
+_TOML_BARE_KEY_RE = re.compile(r'[A-Za-z0-9_-]+')
+
+
+def _toml_key(key):
+    return key if _TOML_BARE_KEY_RE.fullmatch(key) else _toml_value(key)
+
+
+def _toml_value(value):
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return repr(value)
+    if isinstance(value, str):
+        # Le sequenze di escape JSON sono valide anche nelle stringhe base TOML; DEL no.
+        return json.dumps(value, ensure_ascii=False).replace("\x7f", "\\u007F")
+    raise ValueError(f"valore non rappresentabile in TOML: {value!r}")
+
+
+def convert_legacy_py_to_toml(path):
+    """Testo TOML equivalente a un dati_grezzi/*.py storico, commenti inclusi (in coda
+    alla riga del campo a cui si riferiscono, o come righe a se')."""
+    path = Path(path)
+    source = path.read_text(encoding="utf-8")
+    list_node = _legacy_event_list_node(ast.parse(source, filename=str(path)), path)
+    if not isinstance(list_node, ast.List) or not all(isinstance(el, ast.Dict) for el in list_node.elts):
+        raise ValueError(f"{path.name}: `{LEGACY_LIST_NAME}` deve essere una lista letterale di dizionari")
+
+    # Commenti: inline (dopo codice sulla stessa riga) o a riga intera
+    comments = []
+    for tok in tokenize.generate_tokens(io.StringIO(source).readline):
+        if tok.type == tokenize.COMMENT:
+            full_line = not tok.line[:tok.start[1]].strip()
+            comments.append((tok.start[0], tok.string, full_line))
+
+    inline_for_line = {}
+    anchors = []  # (prima riga, ultima riga) di ogni campo, per attaccarci i commenti inline
+    for d in list_node.elts:
+        anchors.append((d.lineno, d.lineno))
+        for k, v in zip(d.keys, d.values):
+            anchors.append((k.lineno, v.end_lineno))
+    standalone = []
+    for line, text, full_line in comments:
+        anchor = next((a for a in anchors if a[0] <= line <= a[1]), None) if not full_line else None
+        if anchor is None:
+            standalone.append((line, text))
+        else:
+            inline_for_line.setdefault(anchor, []).append(text)
+
+    out = []
+
+    def flush_standalone(before_line):
+        while standalone and standalone[0][0] < before_line:
+            _line, text = standalone.pop(0)
+            if _line == 1 and text.strip() == f"# dati_grezzi/{path.name}":
+                text = f"# dati_grezzi/{path.with_suffix('.toml').name}"
+            out.append(text)
+
+    for d in list_node.elts:
+        flush_standalone(d.lineno)
+        if out and out[-1] != "":
+            out.append("")
+        header = "[[events]]"
+        for text in inline_for_line.get((d.lineno, d.lineno), []):
+            header += f"  {text}"
+        out.append(header)
+        for k, v in zip(d.keys, d.values):
+            flush_standalone(k.lineno)
+            if not isinstance(k, ast.Constant) or not isinstance(k.value, str):
+                raise ValueError(f"{path.name}:{k.lineno}: chiave non stringa")
+            line = f"{_toml_key(k.value)} = {_toml_value(ast.literal_eval(v))}"
+            for text in inline_for_line.get((k.lineno, v.end_lineno), []):
+                line += f"  {text}"
+            out.append(line)
+        flush_standalone(d.end_lineno + 1)
+    if standalone:
+        out.append("")
+        flush_standalone(float("inf"))
+    return "\n".join(out).rstrip("\n") + "\n"
+
+
+def convert_files(py_paths, remove_py=False):
+    """Converte i .py in .toml accanto, verificando che il TOML riletto dia gli stessi eventi."""
+    failures = 0
+    for py_path in py_paths:
+        toml_path = py_path.with_suffix(".toml")
+        try:
+            text = convert_legacy_py_to_toml(py_path)
+            if tomllib.loads(text).get("events", []) != read_event_source(py_path):
+                raise ValueError("il TOML generato non corrisponde agli eventi del .py")
+        except Exception as e:
+            log(f"ERRORE: {py_path.name} non convertito: {e}")
+            failures += 1
+            continue
+        toml_path.write_text(text, encoding="utf-8")
+        log(f"  {py_path.name} -> {toml_path.name}")
+        if remove_py:
+            py_path.unlink()
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sorgenti degli eventi (dati_grezzi, discovered).")
+    sub = parser.add_subparsers(dest="comando", required=True)
+    conv = sub.add_parser("converti", help="converte dati_grezzi/*.py storici in .toml")
+    conv.add_argument("files", nargs="*", type=Path,
+                      help="file .py da convertire (default: tutti i dati_grezzi/eventi_*.py)")
+    conv.add_argument("--rimuovi-py", action="store_true", help="cancella i .py convertiti con successo")
+    args = parser.parse_args(argv)
+
+    py_paths = args.files or sorted((Path(__file__).resolve().parent / "dati_grezzi").glob("eventi_*.py"))
+    sys.exit(1 if convert_files(py_paths, remove_py=args.rimuovi_py) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""Telemetria del generatore: durate per fase e per feed, contatori, statistiche di
+de-duplicazione, picco di memoria (RSS) e report JSON accanto agli output
+(calendari_output/run_report.json, non committato).
+
+Lo stato e' un solo report di modulo, aperto da start_run() e scritto da finish_run().
+Senza un run attivo le funzioni di registrazione non fanno niente: benchmark e
+controlli del workflow possono chiamare le funzioni del generatore senza report.
+Le registrazioni sono protette da un lock (i feed si scaricano in un thread pool).
+
+Profiling opzionale, senza toccare il codice, con la variabile d'ambiente
+CALENDARI_PROFILE:
+- cprofile:    run_profile.prof accanto al report (pstats/snakeviz) e le funzioni piu'
+               costose nel log (solo thread principale: i download dei feed no);
+- tracemalloc: le righe con piu' memoria allocata e il picco Python nel report.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows: niente getrusage, il picco RSS resta None
+    resource = None
+
+RUN_REPORT_FILENAME = "run_report.json"
+PROFILE_FILENAME = "run_profile.prof"
+PROFILE_ENV_VAR = "CALENDARI_PROFILE"
+PROFILE_TOP_N = 25
+
+_lock = threading.Lock()
+_report = None
+_profiler = None
+_started = None
+
+
+def log(msg):
+    print(f"[{datetime.now().isoformat(timespec='seconds')}] {msg}", flush=True)
+
+
+def peak_rss_bytes():
+    """Picco di memoria residente del processo finora, None se non disponibile."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024  # Linux: KiB
+
+
+def start_run(argv=None):
+    """Apre il report del run e, se richiesto da CALENDARI_PROFILE, avvia il profiler."""
+    global _report, _profiler, _started
+    _started = time.perf_counter()
+    _report = {
+        'started_at': datetime.now().isoformat(timespec='seconds'),
+        'argv': list(sys.argv[1:] if argv is None else argv),
+        'python': sys.version.split()[0],
+        'phases': {},
+        'feeds': {},
+        'dedup': [],
+        'counters': {},
+    }
+    mode = os.environ.get(PROFILE_ENV_VAR, "").strip().lower()
+    if mode == "cprofile":
+        import cProfile
+        _profiler = cProfile.Profile()
+        _profiler.enable()
+    elif mode == "tracemalloc":
+        import tracemalloc
+        tracemalloc.start()
+    elif mode:
+        log(f"  WARN: {PROFILE_ENV_VAR}={mode} non riconosciuto (cprofile | tracemalloc); profiling disattivato.")
+        mode = ""
+    _report['profile'] = mode or None
+
+
+@contextmanager
+def phase(name):
+    """Misura una fase: durata e picco RSS alla fine. Ripetibile (le durate si sommano)."""
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        if _report is not None:
+            with _lock:
+                entry = _report['phases'].setdefault(name, {'seconds': 0.0})
+                entry['seconds'] = round(entry['seconds'] + time.perf_counter() - t0, 4)
+                entry['peak_rss_bytes'] = peak_rss_bytes()
+
+
+def count(name, n=1):
+    if _report is not None:
+        with _lock:
+            _report['counters'][name] = _report['counters'].get(name, 0) + n
+
+
+def record_feed(url, **fields):
+    """Aggiunge/aggiorna i campi del feed `url` (esito, byte scaricati, durata, ...)."""
+    if _report is not None:
+        with _lock:
+            _report['feeds'].setdefault(url, {}).update(fields)
+
+
+def record_dedup(label, events_in, events_out, weak_merges, strong_merges):
+    """Una chiamata alla de-duplicazione: eventi in/out, fusioni deboli (feed senza location
+    assorbiti) e forti (stessa firma forte)."""
+    if _report is not None:
+        with _lock:
+            _report['dedup'].append({
+                'label': label, 'events_in': events_in, 'events_out': events_out,
+                'weak_merges': weak_merges, 'strong_merges': strong_merges,
+            })
+
+
+def start_worker():
+    """Report minimo in un processo worker (niente profiler ne' file): quello che vi si
+    registra torna al processo principale con take_worker_records/merge_worker_records."""
+    global _report, _profiler
+    if _profiler is not None:  # ereditato con fork: il profilo e' solo del processo principale
+        _profiler.disable()
+        _profiler = None
+    _report = {'phases': {}, 'feeds': {}, 'dedup': [], 'counters': {}}
+
+
+def take_worker_records():
+    global _report
+    report, _report = _report, None
+    return {'dedup': report['dedup'], 'counters': report['counters']} if report else {}
+
+
+def merge_worker_records(records):
+    if _report is not None and records:
+        with _lock:
+            _report['dedup'].extend(records.get('dedup', []))
+            for name, n in records.get('counters', {}).items():
+                _report['counters'][name] = _report['counters'].get(name, 0) + n
+
+
+def finish_run(report_path, status):
+    """Chiude profiler e report e scrive il JSON in `report_path`. Non solleva mai:
+    la telemetria non deve far fallire un run andato a buon fine."""
+    global _report, _profiler
+    if _report is None:
+        return
+    report, _report = _report, None
+    report['status'] = status
+    report['seconds'] = round(time.perf_counter() - _started, 4)
+    report['peak_rss_bytes'] = peak_rss_bytes()
+    report_path = Path(report_path)
+    try:
+        report_path.parent.mkdir(parents=True, exist_ok=True)
+        if _profiler is not None:
+            _profiler.disable()
+            profile_path = report_path.with_name(PROFILE_FILENAME)
+            _profiler.dump_stats(profile_path)
+            report['profile_file'] = profile_path.name
+            _log_profile_top(profile_path)
+            _profiler = None
+        elif report['profile'] == "tracemalloc":
+            import tracemalloc
+            snapshot = tracemalloc.take_snapshot()
+            report['tracemalloc_peak_bytes'] = tracemalloc.get_traced_memory()[1]
+            report['tracemalloc_top'] = [
+                {'where': str(stat.traceback[0]), 'bytes': stat.size, 'blocks': stat.count}
+                for stat in snapshot.statistics('lineno')[:PROFILE_TOP_N]
+            ]
+            tracemalloc.stop()
+        tmp_path = report_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(report, ensure_ascii=False, indent=1), encoding="utf-8")
+        os.replace(tmp_path, report_path)
+        log(f"  Report del run in {report_path} ({report['seconds']:.1f} s, stato: {status}).")
+    except Exception as e:
+        log(f"  WARN: impossibile scrivere il report del run {report_path}: {e}")
+
+
+def _log_profile_top(profile_path):
+    import io
+    import pstats
+    out = io.StringIO()
+    pstats.Stats(str(profile_path), stream=out).sort_stats("cumulative").print_stats(PROFILE_TOP_N)
+    log(f"  Profilo cProfile ({PROFILE_TOP_N} funzioni per tempo cumulativo):\n{out.getvalue()}")
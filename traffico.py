@@ -0,0 +1,231 @@
+"""Report di impatto sul traffico: matrice giorni x ore x venue del carico atteso e
+calendario "busy score" con un evento tutto-il-giorno per ogni giornata con eventi.
+
+    python traffico.py [--pre-hours 2] [--post-hours 1] [--output-dir calendari_output]
+
+Ogni evento de-duplicato (aggregato della Fase 3, tabella canonical_events
+dell'archivio) occupa la sua venue da `inizio - pre` a `fine + post` con peso pari alla
+capienza della venue (registro VENUES). Il carico di una cella (giorno, ora, venue) e'
+la capienza moltiplicata per la frazione dell'ora occupata: "persone attese nell'ora",
+in media. Le partite dei feed non hanno location: si giocano in casa, quindi a San Siro.
+
+Il calcolo e' vettoriale in NumPy, senza cicli per evento: ogni intervallo diventa
+quattro pesi su un vettore di differenze seconde (np.bincount), due cumsum danno
+l'integrale del carico sulla griglia oraria e una differenza le ore. Dieci anni di
+storia sono ~90k celle per venue. Le ore sono locali (Europe/Rome) da calendario: nei
+giorni del cambio d'ora la griglia resta di 24 ore.
+
+Output in calendari_output/ (scritti solo se cambiati, come gli ICS):
+- traffico_san_siro.ics    busy score per giorno, per i client (committato dal workflow)
+- traffico_carico.npy      matrice float32 (giorni, 24, venue)
+- traffico_carico.json     origine, forma, ordine delle venue e buffer della matrice
+- traffico_carico.csv      solo le ore con carico: data, ora, una colonna per venue, totale
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+
+import genera_calendari_mensili as gcm
+from intervalli import DEFAULT_EVENT_DURATION, load_canonical_events
+from normalizzazione import VENUES
+
+PRE_EVENT_BUFFER = timedelta(hours=2)
+POST_EVENT_BUFFER = timedelta(hours=1)
+FEED_VENUE_ID = "stadio-san-siro"  # stadio di casa di Inter e Milan
+# Score 100 = uno stadio pieno nell'ora di picco
+BUSY_REFERENCE_LOAD = VENUES["stadio-san-siro"]["capacity"]
+BUSY_LEVELS = ((25, "basso"), (60, "medio"), (100, "alto"))  # oltre: "molto alto"
+BUSY_MIN_SCORE = 1
+
+BUSY_ICS_FILENAME = "traffico_san_siro.ics"
+BUSY_CALENDAR_NAME = "Traffico San Siro (previsione)"
+LOAD_MATRIX_FILENAME = "traffico_carico.npy"
+LOAD_META_FILENAME = "traffico_carico.json"
+LOAD_CSV_FILENAME = "traffico_carico.csv"
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+
+
+def log(msg):
+    print(f"[{datetime.now().isoformat(timespec='seconds')}] {msg}", flush=True)
+
+
+def event_arrays(records, venue_ids):
+    """(inizi, fini, indice venue) come array NumPy: datetime64[m] locali e int.
+    Senza venue riconosciuta restano fuori, tranne le partite dei feed (FEED_VENUE_ID)."""
+    column = {venue_id: i for i, venue_id in enumerate(venue_ids)}
+    starts, ends, venues = [], [], []
+    for rec in records:
+        venue_id = rec.venue_id or (FEED_VENUE_ID if rec.get("source_type") == "ics_feed" else None)
+        if not rec.dtstart or venue_id not in column:
+            continue
+        starts.append(rec.get("dtstart_str"))
+        ends.append(rec.get("dtend_str") if rec.dtend else "NaT")
+        venues.append(column[venue_id])
+    starts = np.array(starts, dtype="datetime64[s]").astype("datetime64[m]")
+    ends = np.array(ends, dtype="datetime64[s]").astype("datetime64[m]")
+    default_end = starts + np.timedelta64(int(DEFAULT_EVENT_DURATION.total_seconds() // 60), "m")
+    ends = np.where(np.isnat(ends) | (ends <= starts), default_end, ends)
+    return starts, ends, np.array(venues, dtype=np.int64)
+
+
+def load_matrix(starts, ends, venues, weights, pre=PRE_EVENT_BUFFER, post=POST_EVENT_BUFFER):
+    """Matrice (giorni, 24, venue) del carico e primo giorno (datetime64[D]).
+
+    Per un intervallo [s, e) in ore con peso w, G(k) = w * clip(k - s, 0, e - s) e' il
+    carico accumulato fino all'ora k; la sua differenza seconda sulla griglia intera e'
+    non nulla solo in floor(s)+1 e floor(s)+2 (idem per e, col segno meno), quindi basta
+    un bincount di 4 pesi per evento e due cumsum per avere G su tutte le ore."""
+    n_venues = len(weights)
+    if len(starts) == 0:
+        return np.zeros((0, 24, n_venues), dtype=np.float32), None
+    lo = starts - np.timedelta64(int(pre.total_seconds() // 60), "m")
+    hi = ends + np.timedelta64(int(post.total_seconds() // 60), "m")
+    origin = lo.min().astype("datetime64[D]")
+    n_days = int((hi.max() - origin.astype("datetime64[m]")) // np.timedelta64(1, "D")) + 1
+    n_hours = n_days * 24
+    s = (lo - origin) / np.timedelta64(1, "h")
+    e = (hi - origin) / np.timedelta64(1, "h")
+    w = np.asarray(weights, dtype=np.float64)[venues]
+
+    width = n_hours + 3
+    s_floor, e_floor = np.floor(s), np.floor(e)
+    s_frac, e_frac = s - s_floor, e - e_floor
+    base = venues * width
+    s_idx, e_idx = base + s_floor.astype(np.int64), base + e_floor.astype(np.int64)
+    idx = np.concatenate((s_idx + 1, s_idx + 2, e_idx + 1, e_idx + 2))
+    vals = np.concatenate((w * (1 - s_frac), w * s_frac, -w * (1 - e_frac), -w * e_frac))
+    second_diff = np.bincount(idx, weights=vals, minlength=n_venues * width).reshape(n_venues, width)
+    accumulated = np.cumsum(np.cumsum(second_diff, axis=1), axis=1)
+    hourly = np.diff(accumulated, axis=1)[:, :n_hours]
+    hourly[hourly < 1e-6] = 0.0  # residui di arrotondamento delle cumsum
+    return hourly.T.reshape(n_days, 24, n_venues).astype(np.float32), origin
+
+
+def busy_scores(matrix):
+    """Per giorno: score (100 = BUSY_REFERENCE_LOAD nell'ora di picco), ora di picco e carico di picco."""
+    total = matrix.sum(axis=2)
+    peak_hour = total.argmax(axis=1)
+    peak = total.max(axis=1)
+    score = np.rint(100 * peak / BUSY_REFERENCE_LOAD).astype(np.int64)
+    return score, peak_hour, peak
+
+
+def busy_level(score):
+    for threshold, label in BUSY_LEVELS:
+        if score < threshold:
+            return label
+    return "molto alto"
+
+
+def iter_busy_ics_chunks(days, events_by_day):
+    """ICS con un VEVENT tutto-il-giorno per giornata: days = [(data, score, ora, picco)]."""
+    header = [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        f"PRODID:{gcm._ics_text(f'-//Generated Calendar ({gcm.TARGET_TIMEZONE_STR})//calendari.danielecarletti//')}",
+        f"X-WR-CALNAME:{gcm._ics_text(BUSY_CALENDAR_NAME)}",
+        f"X-WR-TIMEZONE:{gcm._ics_text(gcm.TARGET_TIMEZONE_STR)}",
+    ]
+    yield ("\r\n".join(gcm._ics_fold(line) for line in header) + "\r\n").encode("utf-8")
+    for day, score, peak_hour, peak in days:
+        description = [f"Picco stimato: ~{int(round(peak, -2)):,} persone tra le {peak_hour:02d} e le {(peak_hour + 1) % 24:02d}."
+                       .replace(",", ".")]
+        description.extend(events_by_day.get(day, []))
+        lines = [
+            "BEGIN:VEVENT",
+            f"SUMMARY:{gcm._ics_text(f'Traffico San Siro: {busy_level(score)} ({score})')}",
+            f"DTSTART;VALUE=DATE:{day:%Y%m%d}",
+            f"DTEND;VALUE=DATE:{day + timedelta(days=1):%Y%m%d}",
+            f"DTSTAMP:{day:%Y%m%d}T000000Z",
+            f"UID:traffico-{day:%Y%m%d}@calendari.danielecarletti",
+            f"DESCRIPTION:{gcm._ics_text(chr(10).join(description))}",
+            "TRANSP:TRANSPARENT",
+            "END:VEVENT",
+        ]
+        yield ("\r\n".join(gcm._ics_fold(line) for line in lines) + "\r\n").encode("utf-8")
+    yield b"END:VCALENDAR\r\n"
+
+
+def events_by_day(records):
+    """{data: ["HH:MM summary @ venue", ...]} per le descrizioni del calendario."""
+    by_day = {}
+    for rec in gcm.serializable_events(records):
+        venue_id = rec.venue_id or (FEED_VENUE_ID if rec.get("source_type") == "ics_feed" else None)
+        if venue_id not in VENUES:
+            continue
+        by_day.setdefault(rec.dtstart.date(), []).append(
+            f"{rec.dtstart:%H:%M} {rec.get('summary', '')} @ {VENUES[venue_id]['name']}")
+    return by_day
+
+
+def write_report(matrix, origin, venue_ids, records, output_dir, pre, post):
+    """Scrive ICS, .npy, metadati e CSV (solo se cambiati). Ritorna i giorni nel calendario."""
+    output_dir.mkdir(parents=True, exist_ok=True)
+    score, peak_hour, peak = busy_scores(matrix)
+    busy_idx = np.flatnonzero(score >= BUSY_MIN_SCORE)
+    origin_date = origin.astype(datetime) if origin is not None else None
+    by_day = events_by_day(records)
+    # solo i giorni con eventi: il deflusso dopo mezzanotte resta nella matrice, non nel calendario
+    days = [(day, int(score[i]), int(peak_hour[i]), float(peak[i]))
+            for i in busy_idx if (day := origin_date + timedelta(days=int(i))) in by_day]
+    gcm.write_if_changed(output_dir / BUSY_ICS_FILENAME, b"".join(iter_busy_ics_chunks(days, by_day)))
+
+    buf = io.BytesIO()
+    np.save(buf, matrix)
+    gcm.write_if_changed(output_dir / LOAD_MATRIX_FILENAME, buf.getvalue())
+    meta = {
+        "origin": origin_date.isoformat() if origin_date else None,
+        "shape": list(matrix.shape),
+        "axes": ["giorno", "ora", "venue"],
+        "venues": venue_ids,
+        "capacity": [VENUES[v]["capacity"] for v in venue_ids],
+        "pre_event_hours": pre.total_seconds() / 3600,
+        "post_event_hours": post.total_seconds() / 3600,
+        "timezone": gcm.TARGET_TIMEZONE_STR,
+    }
+    gcm.write_if_changed(output_dir / LOAD_META_FILENAME, json.dumps(meta, indent=1).encode("utf-8"))
+
+    day_idx, hour_idx = np.nonzero(matrix.sum(axis=2) >= 0.5)
+    rounded = np.rint(matrix[day_idx, hour_idx]).astype(np.int64)
+    out = io.StringIO()
+    out.write(",".join(["data", "ora", *venue_ids, "totale"]) + "\n")
+    for d, h, row in zip(day_idx.tolist(), hour_idx.tolist(), rounded.tolist()):
+        out.write(f"{origin_date + timedelta(days=d):%Y-%m-%d},{h:02d},{','.join(map(str, row))},{sum(row)}\n")
+    gcm.write_if_changed(output_dir / LOAD_CSV_FILENAME, out.getvalue().encode("utf-8"))
+    return days
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report di traffico: carico per giorno/ora/venue e busy score ICS.")
+    parser.add_argument("--pre-hours", type=float, default=PRE_EVENT_BUFFER.total_seconds() / 3600,
+                        help="ore di afflusso prima dell'inizio")
+    parser.add_argument("--post-hours", type=float, default=POST_EVENT_BUFFER.total_seconds() / 3600,
+                        help="ore di deflusso dopo la fine")
+    parser.add_argument("--output-dir", type=Path, default=SCRIPT_DIR / gcm.OUTPUT_ICS_FOLDER_NAME)
+    args = parser.parse_args(argv)
+    pre, post = timedelta(hours=args.pre_hours), timedelta(hours=args.post_hours)
+
+    records, source = load_canonical_events(SCRIPT_DIR)
+    if source is None:
+        log("ERRORE: nessun evento in archivio ne' nel manifest: esegui prima genera_calendari_mensili.py.")
+        return 1
+    venue_ids = list(VENUES)
+    starts, ends, venues = event_arrays(records, venue_ids)
+    matrix, origin = load_matrix(starts, ends, venues, [VENUES[v]["capacity"] for v in venue_ids], pre, post)
+    days = write_report(matrix, origin, venue_ids, records, args.output_dir, pre, post)
+    log(f"  Report traffico: {len(starts)} eventi su {len(records)} ({source.name}), matrice {matrix.shape}, "
+        f"{len(days)} giornate nel calendario {BUSY_ICS_FILENAME}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
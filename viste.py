@@ -0,0 +1,104 @@
+"""Viste dei calendari: sottoinsiemi nominati dell'aggregato de-duplicato.
+
+Le viste sono dichiarate in configurazione (CALENDAR_VIEWS in
+genera_calendari_mensili.py), ognuna con un filtro di predicati in AND:
+
+  venue        venue_id (o lista) del registro VENUES di normalizzazione.py
+  team         squadra (o lista) tra i lati del summary ("Inter - Roma")
+  source_type  'manual_from_file' | 'discovered' | 'ics_feed' (o lista)
+  from / to    date 'YYYY-MM-DD' di inizio evento, `to` escluso
+
+Un filtro vuoto prende tutti gli eventi. route_events() smista gli eventi in tutte le
+viste con una sola passata, usando venue, firma e data gia' calcolate nell'EventRecord:
+le viste candidate per ogni coppia (venue_id, source_type) sono calcolate una volta per
+coppia distinta, quindi un evento costa solo le viste che lo possono contenere.
+"""
+
+from __future__ import annotations
+
+from datetime import date
+from typing import NamedTuple
+
+from normalizzazione import VENUES, normalize_summary_for_signature
+
+FILTER_KEYS = ("venue", "team", "source_type", "from", "to")
+
+
+class CompiledView(NamedTuple):
+    name: str
+    venues: frozenset | None
+    source_types: frozenset | None
+    teams: frozenset | None
+    date_from: str | None
+    date_to: str | None
+
+
+def _as_set(value):
+    if value is None:
+        return None
+    return frozenset([value] if isinstance(value, str) else value)
+
+
+def _iso_date(name, key, value):
+    if value is None:
+        return None
+    try:
+        return date.fromisoformat(value).isoformat()
+    except (TypeError, ValueError):
+        raise ValueError(f"vista '{name}': '{key}' deve essere una data YYYY-MM-DD, non {value!r}")
+
+
+def compile_views(views):
+    """Valida la configurazione {nome: {'filter': {...}, ...}} e la compila, nello stesso
+    ordine. Solleva ValueError su chiavi o venue sconosciute."""
+    compiled = []
+    for name, view in views.items():
+        flt = view.get("filter", {})
+        unknown = set(flt) - set(FILTER_KEYS)
+        if unknown:
+            raise ValueError(f"vista '{name}': filtri sconosciuti {sorted(unknown)} (ammessi: {', '.join(FILTER_KEYS)})")
+        venues = _as_set(flt.get("venue"))
+        if venues and not venues <= VENUES.keys():
+            raise ValueError(f"vista '{name}': venue sconosciute {sorted(venues - VENUES.keys())}")
+        teams = _as_set(flt.get("team"))
+        compiled.append(CompiledView(
+            name=name,
+            venues=venues,
+            source_types=_as_set(flt.get("source_type")),
+            # stessa normalizzazione della firma: i lati del summary sono gia' nell'EventRecord
+            teams=frozenset(normalize_summary_for_signature(t) for t in teams) if teams else None,
+            date_from=_iso_date(name, "from", flt.get("from")),
+            date_to=_iso_date(name, "to", flt.get("to")),
+        ))
+    return compiled
+
+
+def route_events(records, compiled_views):
+    """{nome vista: [record]} in una passata; ogni lista mantiene l'ordine di `records`."""
+    routed = {view.name: [] for view in compiled_views}
+    candidates_by_key = {}
+    for rec in records:
+        key = (rec.venue_id, rec.get("source_type"))
+        candidates = candidates_by_key.get(key)
+        if candidates is None:
+            candidates = candidates_by_key[key] = [
+                view for view in compiled_views
+                if (view.venues is None or key[0] in view.venues)
+                and (view.source_types is None or key[1] in view.source_types)
+            ]
+        if not candidates:
+            continue
+        summary_sig, day, _location = rec.strong_signature
+        sides = None
+        for view in candidates:
+            if view.date_from and day < view.date_from:
+                continue
+            if view.date_to and day >= view.date_to:
+                continue
+            if view.teams:
+                if sides is None:
+                    sides = set(summary_sig.split(" vs "))
+                if view.teams.isdisjoint(sides):
+                    continue
+            routed[view.name].append(rec)
+    return routed